@@ -23,8 +23,10 @@ import time
 import random
 import schedule
 import threading
+import json
+import socketserver
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Sequence
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -35,19 +37,61 @@ spec = importlib.util.spec_from_file_location('enhanced_blog_generator', 'enhanc
 enhanced_blog_generator = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(enhanced_blog_generator)
 EnhancedTennisBlogGenerator = enhanced_blog_generator.EnhancedTennisBlogGenerator
+recover_partial_posts = enhanced_blog_generator.recover_partial_posts
+DEFAULT_SECTION_TIME_LIMIT = enhanced_blog_generator.DEFAULT_SECTION_TIME_LIMIT
+
+from calibration import calibrate
+from post_document import OUTPUT_FORMATS
+from post_layout import LAYOUTS, DEFAULT_LAYOUT
+
+# Default Unix socket used by the --serve daemon and blog-client.py
+DEFAULT_SOCKET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blog-generator.sock")
+
+# Time slot aliases accepted by --immediate, --publish and the daemon
+TIME_SLOTS = {
+    "morning": "morning",
+    "9am": "morning",
+    "afternoon": "afternoon",
+    "12pm": "afternoon",
+    "3pm": "afternoon",
+    "evening": "evening",
+    "5pm": "evening",
+    "7pm": "evening"
+}
+
+# Themes published for each time slot (matches website-blog-generator.py)
+PUBLISH_THEMES = {
+    "morning": ["top_10_spin_rackets", "top_10_control_rackets", "tennis_technique_guide"],
+    "afternoon": ["individual_racket_review", "improve_utr_fast", "equipment_comparison"],
+    "evening": ["player_success_story", "tennis_training_tips", "tennis_technique_guide"]
+}
 
 class AdvancedBlogScheduler:
-    def __init__(self, log_file: str = "advanced_blog_scheduler.log"):
+    def __init__(self, log_file: str = "advanced_blog_scheduler.log",
+                 section_time_limit: Optional[float] = DEFAULT_SECTION_TIME_LIMIT,
+                 section_token_limit: Optional[int] = None,
+                 output_formats: Sequence[str] = ('txt',), output_layout: str = DEFAULT_LAYOUT):
         """
         Initialize the advanced blog scheduler.
         
         Args:
             log_file (str): Path to log file
+            section_time_limit (float): Seconds each generated section may take (None for no limit)
+            section_token_limit (int): Tokens each generated section may use (None for no limit)
+            output_formats (Sequence[str]): Formats each post is saved in ('txt', 'html', 'json')
+            output_layout (str): Directory layout of saved posts ('flat', 'date', 'date_slot')
         """
         self.log_file = log_file
+        self.output_formats = tuple(output_formats)
+        self.output_layout = output_layout
+        self.section_time_limit = section_time_limit
+        self.section_token_limit = section_token_limit
         self.setup_logging()
         self.generator = None
+        self.publisher = None
         self.running = False
+        self.server = None
+        self.job_lock = threading.Lock()
         
     def setup_logging(self):
         """Setup logging configuration."""
@@ -61,16 +105,103 @@ class AdvancedBlogScheduler:
         )
         self.logger = logging.getLogger(__name__)
         
-    def initialize_generator(self):
-        """Initialize the blog generator."""
+    def initialize_generator(self, force: bool = False):
+        """
+        Initialize the blog generator.
+        
+        The generator (and the GPT4All model and racket data it holds) is kept
+        across jobs, so only the first post of a run pays for loading them.
+        
+        Args:
+            force (bool): Build a new generator even if one already exists
+        """
+        if self.generator is not None and not force:
+            return True
+            
         try:
-            self.generator = EnhancedTennisBlogGenerator()
+            # Load the model in the background while the racket data downloads
+            self.generator = EnhancedTennisBlogGenerator(preload_model=True, background_refresh=True)
+            self.apply_section_limits(self.generator)
+            self.generator.output_formats = self.output_formats
+            self.generator.output_layout = self.output_layout
             self.logger.info("Enhanced blog generator initialized successfully")
+            
+            # Keep whatever an interrupted run had streamed so far
+            for filepath in recover_partial_posts(self.generator):
+                self.logger.warning(f"Recovered interrupted post: {filepath}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize blog generator: {e}")
             return False
     
+    def apply_section_limits(self, generator):
+        """Give a generator the scheduler's per-section latency budget."""
+        generator.section_time_limit = self.section_time_limit
+        generator.section_token_limit = self.section_token_limit
+    
+    def reload_generator(self, reload_rackets: bool = True):
+        """
+        Reload the GPT4All model and, optionally, the racket data.
+        
+        Args:
+            reload_rackets (bool): Also check the racket database for changes
+        """
+        if self.generator is None:
+            return self.initialize_generator()
+            
+        try:
+            self.logger.info("Reloading GPT4All model...")
+            self.generator.model_holder.reload()
+            if reload_rackets:
+                self.logger.info("Reloading racket data...")
+                self.generator.rackets = self.generator.load_rackets_from_sheets(refresh=True)
+            self.logger.info("Blog generator reloaded successfully")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to reload blog generator: {e}")
+            return False
+    
+    def refresh_racket_data(self):
+        """Pick up the latest racket snapshot; a stale one is refreshed in the background."""
+        for generator in (self.generator, self.publisher):
+            if generator is not None:
+                generator.rackets = generator.load_rackets_from_sheets()
+        return True
+    
+    def check_generator_health(self):
+        """Check the warm model still answers and reload it if it does not."""
+        if self.generator is None:
+            return self.initialize_generator()
+            
+        holder = self.generator.model_holder
+        if holder.model is None and holder.last_error is None:
+            # Template-based generation, nothing to check
+            return True
+            
+        if holder.health_check():
+            self.logger.info("Blog generator health check passed")
+            return True
+            
+        self.logger.warning("Blog generator health check failed, reloading model")
+        return self.reload_generator(reload_rackets=False)
+    
+    def calibrate_model(self, thread_counts: List[int] = None, batch_sizes: List[int] = None):
+        """Benchmark thread counts and batch sizes and store the best for this host."""
+        if not self.initialize_generator():
+            return False
+            
+        try:
+            result = calibrate(self.generator, thread_counts, batch_sizes)
+            best = result['best']
+            self.logger.info(
+                f"Calibrated {self.generator.model_name}: {best['n_threads']} threads, batch size {best['n_batch']} "
+                f"(prompt {best['prompt_tokens_per_second']} tok/s, generation {best['generation_tokens_per_second']} tok/s)"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Calibration failed: {e}")
+            return False
+    
     def generate_morning_post(self):
         """Generate morning blog post (9am)."""
         self.logger.info("Generating morning blog post (9am)...")
@@ -88,11 +219,10 @@ class AdvancedBlogScheduler:
             ]
             
             theme = random.choice(morning_themes)
-            content = self.generator.generate_blog_post(theme)
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"morning_blog_{timestamp}.txt"
-            filepath = self.generator.save_post(content, filename)
+            filepath = self.generator.generate_streamed_post(theme, filename)
             
             self.logger.info(f"Morning post generated successfully: {filepath}")
             return True
@@ -117,11 +247,10 @@ class AdvancedBlogScheduler:
             ]
             
             theme = random.choice(afternoon_themes)
-            content = self.generator.generate_blog_post(theme)
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"afternoon_blog_{timestamp}.txt"
-            filepath = self.generator.save_post(content, filename)
+            filepath = self.generator.generate_streamed_post(theme, filename)
             
             self.logger.info(f"Afternoon post generated successfully: {filepath}")
             return True
@@ -146,11 +275,10 @@ class AdvancedBlogScheduler:
             ]
             
             theme = random.choice(evening_themes)
-            content = self.generator.generate_blog_post(theme)
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"evening_blog_{timestamp}.txt"
-            filepath = self.generator.save_post(content, filename)
+            filepath = self.generator.generate_streamed_post(theme, filename)
             
             self.logger.info(f"Evening post generated successfully: {filepath}")
             return True
@@ -190,6 +318,10 @@ class AdvancedBlogScheduler:
         schedule.every().sunday.at("15:00").do(self.generate_afternoon_post)
         schedule.every().sunday.at("19:00").do(self.generate_evening_post)
         
+        # Keep the warm model healthy between slots
+        schedule.every(6).hours.do(self.check_generator_health)
+        schedule.every().hour.do(self.refresh_racket_data)
+        
         self.logger.info("Schedule setup completed:")
         self.logger.info("Weekdays: 9am, 5pm")
         self.logger.info("Weekends: 9am, 12pm, 3pm, 7pm")
@@ -199,6 +331,9 @@ class AdvancedBlogScheduler:
         self.running = True
         self.logger.info("Advanced blog scheduler started")
         
+        # Load the model and racket data once, up front
+        self.initialize_generator()
+        
         while self.running:
             try:
                 schedule.run_pending()
@@ -219,35 +354,173 @@ class AdvancedBlogScheduler:
         """Generate a post immediately for testing."""
         self.logger.info(f"Generating immediate post for {time_slot}")
         
-        if time_slot == "morning" or time_slot == "9am":
+        slot = TIME_SLOTS.get(time_slot)
+        if slot == "morning":
             return self.generate_morning_post()
-        elif time_slot == "afternoon" or time_slot in ["12pm", "3pm"]:
+        elif slot == "afternoon":
             return self.generate_afternoon_post()
-        elif time_slot == "evening" or time_slot in ["5pm", "7pm"]:
+        elif slot == "evening":
             return self.generate_evening_post()
         else:
             self.logger.error(f"Unknown time slot: {time_slot}")
             return False
     
+    def initialize_publisher(self):
+        """Initialize the website publisher, sharing the already loaded model."""
+        if self.publisher is not None:
+            return True
+            
+        try:
+            script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'website-blog-generator.py')
+            spec = importlib.util.spec_from_file_location('website_blog_generator', script_path)
+            website_blog_generator = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(website_blog_generator)
+            self.publisher = website_blog_generator.WebsiteBlogGenerator(background_refresh=True)
+            self.apply_section_limits(self.publisher)
+            self.logger.info("Website blog publisher initialized successfully")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to initialize website publisher: {e}")
+            return False
+    
+    def publish_immediate_post(self, time_slot: str):
+        """Generate a post for the time slot and publish it to the website."""
+        slot = TIME_SLOTS.get(time_slot)
+        if slot is None:
+            self.logger.error(f"Unknown time slot: {time_slot}")
+            return False
+            
+        self.logger.info(f"Generating and publishing {slot} post...")
+        
+        if not self.initialize_publisher():
+            return False
+            
+        theme = random.choice(PUBLISH_THEMES[slot])
+        return self.publisher.generate_and_publish(theme)
+    
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle a single daemon request.
+        
+        Args:
+            request (Dict): Request with an 'action' and optional 'slot'
+            
+        Returns:
+            Dict: Response sent back to the client
+        """
+        action = request.get('action')
+        slot = request.get('slot', '')
+        
+        if action == 'ping':
+            return {'ok': True}
+        
+        if action == 'status':
+            holder = self.generator.model_holder if self.generator else None
+            return {
+                'ok': True,
+                'generator_loaded': self.generator is not None,
+                'publisher_loaded': self.publisher is not None,
+                'model': holder.status() if holder else None,
+                'response_cache': self.generator.response_cache.stats() if self.generator else None,
+                'racket_snapshot': self.generator.racket_store.status() if self.generator else None,
+                'racket_fragments': self.generator.fragments.stats() if self.generator else None
+            }
+        
+        if action == 'stop':
+            threading.Thread(target=self.stop_server, daemon=True).start()
+            return {'ok': True}
+        
+        jobs = {
+            'generate': lambda: self.generate_immediate_post(slot),
+            'publish': lambda: self.publish_immediate_post(slot),
+            'reload': lambda: self.reload_generator(),
+            'health': lambda: self.check_generator_health()
+        }
+        
+        job = jobs.get(action)
+        if job is None:
+            return {'ok': False, 'error': f"Unknown action: {action}"}
+        
+        if action in ('generate', 'publish') and slot not in TIME_SLOTS:
+            return {'ok': False, 'error': f"Unknown time slot: {slot}"}
+        
+        def run_job():
+            # One job at a time: the model is shared by every request
+            with self.job_lock:
+                return job()
+        
+        if not request.get('wait', True):
+            threading.Thread(target=run_job, daemon=True).start()
+            return {'ok': True, 'queued': True}
+        
+        return {'ok': bool(run_job())}
+    
+    def serve(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        """
+        Run as a daemon that keeps the model and racket data resident and
+        takes requests over a Unix socket (see blog-client.py).
+        
+        Args:
+            socket_path (str): Path of the Unix socket to listen on
+        """
+        scheduler = self
+        
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline().decode('utf-8'))
+                    response = scheduler.handle_request(request)
+                except Exception as e:
+                    scheduler.logger.error(f"Daemon request failed: {e}")
+                    response = {'ok': False, 'error': str(e)}
+                self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+        
+        if os.path.exists(socket_path):
+            # Remove a stale socket left behind by a crashed daemon
+            os.unlink(socket_path)
+        
+        # Load everything up front so requests only pay for generation
+        self.initialize_generator()
+        
+        self.server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+        self.logger.info(f"Blog generator daemon listening on {socket_path}")
+        
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            self.logger.info("Daemon stopped by user")
+        finally:
+            self.server.server_close()
+            self.server = None
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.logger.info("Blog generator daemon stopped")
+    
+    def stop_server(self):
+        """Stop the daemon started with serve()."""
+        if self.server is not None:
+            self.logger.info("Daemon stop requested")
+            self.server.shutdown()
+    
     def create_cron_scripts(self):
         """Create cron job scripts for different time slots."""
         scripts = {
             "morning": """#!/bin/bash
 # AcePlan Morning Blog Post Generator (9am)
 cd /Users/VR/AcePlan/tennis-racket-finder
-python3 advanced-scheduler.py --immediate morning
+python3 blog-client.py generate morning
 echo "$(date): Morning blog post generation completed" >> cron.log
 """,
             "afternoon": """#!/bin/bash
 # AcePlan Afternoon Blog Post Generator (12pm/3pm)
 cd /Users/VR/AcePlan/tennis-racket-finder
-python3 advanced-scheduler.py --immediate afternoon
+python3 blog-client.py generate afternoon
 echo "$(date): Afternoon blog post generation completed" >> cron.log
 """,
             "evening": """#!/bin/bash
 # AcePlan Evening Blog Post Generator (5pm/7pm)
 cd /Users/VR/AcePlan/tennis-racket-finder
-python3 advanced-scheduler.py --immediate evening
+python3 blog-client.py generate evening
 echo "$(date): Evening blog post generation completed" >> cron.log
 """
         }
@@ -294,7 +567,10 @@ Examples:
   python advanced-scheduler.py --immediate morning        # Generate morning post now
   python advanced-scheduler.py --immediate afternoon      # Generate afternoon post now
   python advanced-scheduler.py --immediate evening        # Generate evening post now
+  python advanced-scheduler.py --publish morning          # Generate and publish morning post now
+  python advanced-scheduler.py --serve                    # Run the warm-model daemon
   python advanced-scheduler.py --setup-cron               # Create cron scripts
+  python advanced-scheduler.py --calibrate                # Find the fastest GPT4All threads/batch size
         """
     )
     
@@ -306,10 +582,77 @@ Examples:
     
     parser.add_argument(
         "--immediate",
-        choices=["morning", "afternoon", "evening", "9am", "12pm", "3pm", "5pm", "7pm"],
+        choices=list(TIME_SLOTS),
         help="Generate a post immediately for the specified time slot"
     )
     
+    parser.add_argument(
+        "--publish",
+        choices=list(TIME_SLOTS),
+        help="Generate and publish a post to the website for the specified time slot"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a daemon that keeps the model loaded and serves blog-client.py"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help="Unix socket path for --serve"
+    )
+    
+    parser.add_argument(
+        "--section-timeout",
+        type=float,
+        default=DEFAULT_SECTION_TIME_LIMIT,
+        help=f"Seconds each generated section may take before falling back (0 = no limit, default: {DEFAULT_SECTION_TIME_LIMIT:.0f})"
+    )
+    
+    parser.add_argument(
+        "--section-max-tokens",
+        type=int,
+        default=0,
+        help="Tokens each generated section may use before falling back (0 = no limit)"
+    )
+    
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="Benchmark GPT4All thread counts and batch sizes and save the best for this host"
+    )
+    
+    parser.add_argument(
+        "--calibrate-threads",
+        type=int,
+        nargs="+",
+        help="Thread counts to try with --calibrate (default: powers of two up to the core count)"
+    )
+    
+    parser.add_argument(
+        "--calibrate-batch-sizes",
+        type=int,
+        nargs="+",
+        help="Batch sizes to try with --calibrate (default: 8 32 128 512)"
+    )
+    
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=OUTPUT_FORMATS,
+        default=["txt"],
+        help="Formats to save each post in; html and json are rendered in the same pass (default: txt)"
+    )
+    
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default=DEFAULT_LAYOUT,
+        help="Directory layout of saved posts: flat, date (YYYY/MM/DD) or date_slot (YYYY/MM/DD/<slot>)"
+    )
+    
     parser.add_argument(
         "--setup-cron",
         action="store_true",
@@ -325,17 +668,35 @@ Examples:
     args = parser.parse_args()
     
     # Create scheduler instance
-    scheduler = AdvancedBlogScheduler(log_file=args.log_file)
+    scheduler = AdvancedBlogScheduler(
+        log_file=args.log_file,
+        section_time_limit=args.section_timeout or None,
+        section_token_limit=args.section_max_tokens or None,
+        output_formats=args.formats,
+        output_layout=args.layout
+    )
     
     # Handle different commands
     if args.setup_cron:
         scheduler.create_cron_scripts()
         return
     
+    if args.calibrate:
+        success = scheduler.calibrate_model(args.calibrate_threads, args.calibrate_batch_sizes)
+        sys.exit(0 if success else 1)
+    
     if args.immediate:
         success = scheduler.generate_immediate_post(args.immediate)
         sys.exit(0 if success else 1)
     
+    if args.publish:
+        success = scheduler.publish_immediate_post(args.publish)
+        sys.exit(0 if success else 1)
+    
+    if args.serve:
+        scheduler.serve(args.socket)
+        return
+    
     if args.start:
         scheduler.setup_schedule()
         scheduler.run_scheduler()
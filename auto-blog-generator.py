@@ -19,13 +19,45 @@ Website: https://aceplan.me
 """
 
 import os
+import sys
+import argparse
 import json
 import random
 import datetime
-from typing import List, Dict, Any
+import hashlib
+import itertools
+from typing import List, Dict, Any, Tuple
 import requests
 import time
 
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from post_templates import Template, PostBuffer
+from post_writer import get_post_writer, save_post_files
+from post_manifest import get_post_manifest
+from post_layout import DEFAULT_LAYOUT
+from post_dedup import DEDUP_ATTEMPTS, DuplicatePostError, get_content_store
+from variant_space import VariantSpace, CombinedSpace, JsonlSink, variant_order
+
+# Layout of a post, compiled once
+POST_HEADER = Template("{title}\n{title_rule}\n\n{introduction}\n\n")
+POST_PARAGRAPH = Template("{paragraph}\n\n")
+POST_FOOTER = Template(
+    "{subheading[heading]}\n{heading_rule}\n{subheading[content]}\n\n"
+    "{conclusion}\n\n"
+    "---\n"
+    "Keywords: {topic[keywords]|join}\n"
+    "Category: {topic[category]|title}\n"
+    "Generated: {generated}\n"
+    "Website: https://aceplan.me\n"
+    "Racket Database: 100+ tennis rackets with detailed specifications\n"
+)
+
+# Title prefixes used for SEO ("Ultimate" and "Complete" appear in both)
+POWER_WORDS = ["Ultimate", "Complete", "Essential", "Pro", "Expert", "Advanced"]
+TITLE_NUMBERS = ["5", "7", "10", "Ultimate", "Complete"]
+
 class TennisBlogGenerator:
     def __init__(self, output_dir: str = "generated_posts"):
         """
@@ -35,6 +67,18 @@ class TennisBlogGenerator:
             output_dir (str): Directory to save generated posts
         """
         self.output_dir = output_dir
+        # Formats written by save_post: 'txt' (Markdown), 'html', 'json'
+        self.output_formats = ('txt',)
+        # Where posts go inside output_dir: 'flat', 'date' (YYYY/MM/DD) or 'date_slot'
+        self.output_layout = DEFAULT_LAYOUT
+        # Atomic, batched writes off the generating thread (shared by the process)
+        self.post_writer = get_post_writer()
+        self.last_write = None
+        # Index of saved posts; post_info describes the post being generated
+        self.manifest = get_post_manifest()
+        self.post_info: Dict[str, Any] = {}
+        # Hashes of every saved or published post body; exact duplicates are not saved
+        self.content_hashes = get_content_store()
         self.ensure_output_directory()
         
         # Tennis topics with SEO keywords
@@ -109,6 +153,19 @@ class TennisBlogGenerator:
             os.makedirs(self.output_dir)
             print(f"Created output directory: {self.output_dir}")
 
+    def title_options(self, base_title: str) -> List[str]:
+        """
+        All distinct titles generate_seo_title can produce for a base title.
+        
+        Args:
+            base_title (str): Base title to optimize
+            
+        Returns:
+            List[str]: The base title, then each prefixed variant
+        """
+        prefixes = dict.fromkeys(TITLE_NUMBERS + POWER_WORDS)
+        return [base_title] + [f"{prefix} {base_title}" for prefix in prefixes]
+
     def generate_seo_title(self, base_title: str) -> str:
         """
         Generate an SEO-optimized title.
@@ -119,46 +176,55 @@ class TennisBlogGenerator:
         Returns:
             str: SEO-optimized title
         """
-        # Add power words and numbers for better SEO
-        power_words = ["Ultimate", "Complete", "Essential", "Pro", "Expert", "Advanced"]
-        numbers = ["5", "7", "10", "Ultimate", "Complete"]
-        
-        # Sometimes add a number or power word
+        # Sometimes add a number or power word for better SEO
         if random.choice([True, False]):
-            prefix = random.choice(numbers + power_words)
+            prefix = random.choice(TITLE_NUMBERS + POWER_WORDS)
             return f"{prefix} {base_title}"
         
         return base_title
 
-    def generate_introduction(self, topic: Dict[str, Any]) -> str:
+    def introduction_options(self, topic: Dict[str, Any]) -> List[str]:
         """
-        Generate an engaging introduction paragraph.
+        Introduction paragraphs available for a topic.
         
         Args:
             topic (Dict): Topic information
             
         Returns:
-            str: Introduction paragraph
+            List[str]: Introduction paragraphs
         """
-        introductions = [
+        return [
             f"Tennis is a sport that combines physical skill, mental toughness, and strategic thinking. Whether you're just starting out or looking to improve your game, understanding the fundamentals is crucial for success on the court. In this comprehensive guide, we'll explore {topic['focus']} and how it can transform your tennis performance.",
             
             f"Are you ready to take your tennis game to the next level? {topic['focus'].title()} is one of the most important aspects of tennis that many players overlook. With the right knowledge and practice, you can significantly improve your performance and enjoy the game even more.",
             
             f"Mastering tennis requires dedication, practice, and the right guidance. When it comes to {topic['focus']}, having a solid foundation is essential for long-term success. This guide will provide you with expert insights and practical tips to help you excel on the court."
         ]
+
+    def generate_introduction(self, topic: Dict[str, Any]) -> str:
+        """
+        Generate an engaging introduction paragraph.
         
-        return random.choice(introductions)
+        Args:
+            topic (Dict): Topic information
+            
+        Returns:
+            str: Introduction paragraph
+        """
+        return random.choice(self.introduction_options(topic))
 
-    def generate_content_paragraphs(self, topic: Dict[str, Any]) -> List[str]:
+    def paragraph_options(self, topic: Dict[str, Any]) -> List[List[str]]:
         """
-        Generate 2-3 content paragraphs with useful information.
+        Content paragraphs available for a topic.
+        
+        Each paragraph slot is a list of its wordings; slots that name a
+        racket have one wording per racket choice.
         
         Args:
             topic (Dict): Topic information
             
         Returns:
-            List[str]: List of content paragraphs
+            List[List[str]]: Wordings per paragraph slot
         """
         paragraphs = []
         
@@ -175,7 +241,10 @@ class TennisBlogGenerator:
             paragraphs = [
                 f"Choosing the right tennis racket can significantly impact your game. With over 100 different rackets available in our comprehensive database at AcePlan (https://aceplan.me), finding the perfect match for your playing style is easier than ever. Consider factors like head size, weight, and string pattern when making your selection.",
                 
-                f"For beginners, we recommend starting with rackets like the {random.choice(self.sample_rackets[:3])} or {random.choice(self.sample_rackets[3:6])}. These rackets offer a good balance of power and control, making them ideal for developing your skills. Our database includes detailed specifications and reviews to help you make an informed decision.",
+                [
+                    f"For beginners, we recommend starting with rackets like the {first} or {second}. These rackets offer a good balance of power and control, making them ideal for developing your skills. Our database includes detailed specifications and reviews to help you make an informed decision."
+                    for first in self.sample_rackets[:3] for second in self.sample_rackets[3:6]
+                ],
                 
                 "String selection is equally important as racket choice. Natural gut provides the best feel and power but comes at a higher cost. Synthetic gut offers a good balance of performance and price, while polyester strings provide maximum durability and spin potential. The right string tension can also affect your game significantly."
             ]
@@ -198,28 +267,58 @@ class TennisBlogGenerator:
                 "Learn to read your opponent's game and adjust your strategy accordingly. If they're struggling with your backhand, keep hitting to that side. If they're moving well, try to keep them off balance with different shot selections and paces."
             ]
         
+        return [slot if isinstance(slot, list) else [slot] for slot in paragraphs]
+
+    def paragraph_sets(self, topic: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        """
+        Every distinct paragraph sequence generate_content_paragraphs can produce.
+        
+        Args:
+            topic (Dict): Topic information
+            
+        Returns:
+            List[Tuple[str, ...]]: Paragraph sequences (order and wording)
+        """
+        slots = self.paragraph_options(topic)
+        sets = []
+        for order in itertools.permutations(slots, min(3, len(slots))):
+            sets.extend(itertools.product(*order))
+        return sets
+
+    def generate_content_paragraphs(self, topic: Dict[str, Any]) -> List[str]:
+        """
+        Generate 2-3 content paragraphs with useful information.
+        
+        Args:
+            topic (Dict): Topic information
+            
+        Returns:
+            List[str]: List of content paragraphs
+        """
+        slots = self.paragraph_options(topic)
         # Return 2-3 random paragraphs
-        return random.sample(paragraphs, min(3, len(paragraphs)))
+        return [random.choice(slot) for slot in random.sample(slots, min(3, len(slots)))]
 
-    def generate_subheading_content(self, topic: Dict[str, Any]) -> Dict[str, str]:
+    def subheading_options(self, topic: Dict[str, Any]) -> List[Dict[str, str]]:
         """
-        Generate subheading and its content.
+        Subheading sections available for a topic.
         
         Args:
             topic (Dict): Topic information
             
         Returns:
-            Dict[str, str]: Subheading and its content
+            List[Dict[str, str]]: Subheadings and their content
         """
         subheadings = {
             'technique': {
                 'heading': 'Practice Drills for Improvement',
                 'content': 'Consistent practice is key to improving your tennis technique. Start with wall practice to improve consistency and timing. Hit against a wall focusing on maintaining proper form. Shadow swinging without a ball helps develop muscle memory. Use a ball machine if available to practice specific shots repeatedly. Remember, quality practice is more important than quantity.'
             },
-            'equipment': {
-                'heading': 'Expert Recommendations from AcePlan',
-                'content': f'At AcePlan (https://aceplan.me), we\'ve analyzed over 100 tennis rackets to help you find the perfect match. Our database includes detailed specifications, reviews, and recommendations based on your skill level and playing style. Whether you\'re looking for power, control, or versatility, our comprehensive guide will help you make the right choice. Popular options include the {random.choice(self.sample_rackets)} for its excellent balance of features.'
-            },
+            'equipment': [
+                {'heading': 'Expert Recommendations from AcePlan',
+                 'content': f'At AcePlan (https://aceplan.me), we\'ve analyzed over 100 tennis rackets to help you find the perfect match. Our database includes detailed specifications, reviews, and recommendations based on your skill level and playing style. Whether you\'re looking for power, control, or versatility, our comprehensive guide will help you make the right choice. Popular options include the {racket} for its excellent balance of features.'}
+                for racket in self.sample_rackets
+            ],
             'fitness': {
                 'heading': 'Tennis-Specific Training Exercises',
                 'content': 'Incorporate tennis-specific exercises into your fitness routine. Medicine ball throws help develop power and core strength. Resistance band exercises improve shoulder stability and prevent injuries. Balance board training enhances your stability on the court. Jump rope improves footwork and cardiovascular endurance. Always warm up properly before playing and cool down afterward to prevent injuries.'
@@ -230,30 +329,53 @@ class TennisBlogGenerator:
             }
         }
         
-        return subheadings.get(topic['category'], {
+        options = subheadings.get(topic['category'], {
             'heading': 'Key Takeaways',
             'content': 'Focus on the fundamentals, practice consistently, and don\'t be afraid to seek professional instruction. Tennis is a sport that rewards dedication and proper technique. With the right approach and resources like AcePlan (https://aceplan.me), you can significantly improve your game and enjoy tennis even more.'
         })
+        return options if isinstance(options, list) else [options]
 
-    def generate_conclusion(self, topic: Dict[str, Any]) -> str:
+    def generate_subheading_content(self, topic: Dict[str, Any]) -> Dict[str, str]:
         """
-        Generate a compelling conclusion paragraph.
+        Generate subheading and its content.
         
         Args:
             topic (Dict): Topic information
             
         Returns:
-            str: Conclusion paragraph
+            Dict[str, str]: Subheading and its content
+        """
+        return random.choice(self.subheading_options(topic))
+
+    def conclusion_options(self, topic: Dict[str, Any]) -> List[str]:
         """
-        conclusions = [
+        Conclusion paragraphs available for a topic.
+        
+        Args:
+            topic (Dict): Topic information
+            
+        Returns:
+            List[str]: Conclusion paragraphs
+        """
+        return [
             f"Mastering {topic['focus']} takes time and dedication, but the rewards are worth the effort. Remember to practice consistently, focus on proper technique, and don't hesitate to seek guidance from experienced players or coaches. With resources like AcePlan (https://aceplan.me) and our comprehensive 100-racket database, you have everything you need to improve your game and reach your tennis goals.",
             
             f"Improving your tennis game is a journey that requires patience and persistence. By focusing on {topic['focus']} and implementing the tips and techniques discussed in this guide, you'll see significant improvements in your performance. Visit AcePlan (https://aceplan.me) to explore our extensive racket database and find the perfect equipment to complement your improved skills.",
             
             f"Tennis is a sport that offers endless opportunities for growth and improvement. Whether you're working on {topic['focus']} or any other aspect of your game, remember that every great player started as a beginner. Use the resources available at AcePlan (https://aceplan.me) to guide your journey, and most importantly, enjoy the process of becoming a better tennis player."
         ]
+
+    def generate_conclusion(self, topic: Dict[str, Any]) -> str:
+        """
+        Generate a compelling conclusion paragraph.
         
-        return random.choice(conclusions)
+        Args:
+            topic (Dict): Topic information
+            
+        Returns:
+            str: Conclusion paragraph
+        """
+        return random.choice(self.conclusion_options(topic))
 
     def generate_blog_post(self, topic: Dict[str, Any] = None) -> str:
         """
@@ -267,6 +389,7 @@ class TennisBlogGenerator:
         """
         if topic is None:
             topic = random.choice(self.topics)
+        self.post_info = {'theme': topic['category'], 'racket_ids': []}
         
         # Generate SEO-optimized title
         title = self.generate_seo_title(topic['title'])
@@ -278,37 +401,50 @@ class TennisBlogGenerator:
         conclusion = self.generate_conclusion(topic)
         
         # Combine all sections
-        post_content = f"{title}\n"
-        post_content += "=" * len(title) + "\n\n"
-        
-        post_content += f"{introduction}\n\n"
-        
-        for paragraph in content_paragraphs:
-            post_content += f"{paragraph}\n\n"
-        
-        post_content += f"{subheading_content['heading']}\n"
-        post_content += "-" * len(subheading_content['heading']) + "\n"
-        post_content += f"{subheading_content['content']}\n\n"
-        
-        post_content += f"{conclusion}\n\n"
+        post = PostBuffer()
+        post.render(POST_HEADER, title=title, title_rule="=" * len(title), introduction=introduction)
+        post.render_each(POST_PARAGRAPH, 'paragraph', content_paragraphs)
+        post.render(
+            POST_FOOTER,
+            subheading=subheading_content,
+            heading_rule="-" * len(subheading_content['heading']),
+            conclusion=conclusion,
+            topic=topic,
+            generated=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+        
+        return post.getvalue()
+
+    def generate_unique_post(self, topic: Dict[str, Any] = None) -> str:
+        """
+        Generate a post whose body was not saved or published before.
         
-        # Add SEO footer
-        post_content += "---\n"
-        post_content += f"Keywords: {', '.join(topic['keywords'])}\n"
-        post_content += f"Category: {topic['category'].title()}\n"
-        post_content += f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        post_content += "Website: https://aceplan.me\n"
-        post_content += "Racket Database: 100+ tennis rackets with detailed specifications\n"
+        Exact duplicates (same body under any title) are regenerated up to
+        DEDUP_ATTEMPTS times; if every attempt is a duplicate, save_post
+        rejects the last one with DuplicatePostError.
         
-        return post_content
+        Args:
+            topic (Dict): Topic information (optional, random if not given)
+            
+        Returns:
+            str: Blog post content
+        """
+        self.content_hashes.index_posts(self.output_dir)
+        for attempt in range(1, DEDUP_ATTEMPTS + 1):
+            content = self.generate_blog_post(topic)
+            if not self.content_hashes.contains(content):
+                break
+            print(f"Generated post duplicates an earlier post (attempt {attempt}/{DEDUP_ATTEMPTS})")
+        return content
 
-    def save_post(self, content: str, filename: str = None) -> str:
+    def save_post(self, content: str, filename: str = None, post_info: Dict[str, Any] = None) -> str:
         """
         Save the blog post to a file.
         
         Args:
             content (str): Blog post content
             filename (str): Custom filename (optional)
+            post_info (Dict): Theme and racket ids of the post (default: the last post generated)
             
         Returns:
             str: Path to saved file
@@ -317,12 +453,12 @@ class TennisBlogGenerator:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"tennis_blog_post_{timestamp}.txt"
         
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"Blog post saved: {filepath}")
+        # Atomic background write; self.last_write resolves once the post is on disk
+        filepath, self.last_write = save_post_files(
+            self.post_writer, content, filename, self.output_dir, self.output_layout, self.output_formats,
+            post_info if post_info is not None else self.post_info, type(self).__name__,
+            self.manifest, self.content_hashes
+        )
         return filepath
 
     def generate_daily_post(self) -> str:
@@ -338,7 +474,7 @@ class TennisBlogGenerator:
         topic = random.choice(self.topics)
         
         # Generate the post
-        content = self.generate_blog_post(topic)
+        content = self.generate_unique_post(topic)
         
         # Create filename with date
         date_str = datetime.datetime.now().strftime("%Y%m%d")
@@ -364,26 +500,160 @@ class TennisBlogGenerator:
         # Generate 7 posts (one for each day of the week)
         for i in range(7):
             topic = self.topics[i % len(self.topics)]  # Cycle through topics
-            content = self.generate_blog_post(topic)
+            content = self.generate_unique_post(topic)
             
             # Create filename with date
             date = datetime.datetime.now() + datetime.timedelta(days=i)
             date_str = date.strftime("%Y%m%d")
             filename = f"weekly_tennis_post_{date_str}.txt"
             
-            filepath = self.save_post(content, filename)
+            try:
+                filepath = self.save_post(content, filename)
+            except DuplicatePostError as e:
+                print(f"Skipping: {e}")
+                continue
             filepaths.append(filepath)
-            
-            # Small delay between posts
-            time.sleep(1)
         
         print(f"Weekly batch generated successfully: {len(filepaths)} posts")
         return filepaths
 
+    def variant_space(self, topic: Dict[str, Any], generated: str) -> VariantSpace:
+        """
+        Every distinct post generate_blog_post can produce for a topic.
+        
+        Axes are pre-rendered blocks: header (title x introduction),
+        paragraphs (order x wording) and footer (subheading x conclusion),
+        so a variant is three string concatenations away.
+        
+        Args:
+            topic (Dict): Topic information
+            generated (str): Timestamp written in the footer
+            
+        Returns:
+            VariantSpace: Axes of (title, text) headers, paragraph blocks and footers
+        """
+        headers = [
+            (title, POST_HEADER.render(title=title, title_rule="=" * len(title), introduction=introduction))
+            for title in self.title_options(topic['title'])
+            for introduction in self.introduction_options(topic)
+        ]
+        paragraphs = [POST_PARAGRAPH.render_each('paragraph', paragraph_set) for paragraph_set in self.paragraph_sets(topic)]
+        footers = [
+            POST_FOOTER.render(
+                subheading=subheading,
+                heading_rule="-" * len(subheading['heading']),
+                conclusion=conclusion,
+                topic=topic,
+                generated=generated
+            )
+            for subheading in self.subheading_options(topic)
+            for conclusion in self.conclusion_options(topic)
+        ]
+        return VariantSpace([headers, paragraphs, footers])
+
+    def generate_bulk(self, output_path: str, count: int = None, seed: int = None, start: int = 0,
+                      shard_size: int = 0, verify: bool = True, generated: str = None) -> Dict[str, Any]:
+        """
+        Stream template-only posts to a JSONL sink, with no repeated variant.
+        
+        Every topic's combination space is concatenated into one range of
+        variant numbers. Without a seed the range is enumerated in order;
+        with a seed it is walked in a seeded permutation order, so the same
+        seed (and start/count window) always yields the same posts and
+        disjoint windows never overlap.
+        
+        Args:
+            output_path (str): JSONL file (or shard name stem when sharding)
+            count (int): Number of posts (default: the whole space)
+            seed (int): Permutation seed (optional)
+            start (int): Position in the order to start from
+            shard_size (int): Posts per shard file (0 = a single file)
+            verify (bool): Hash every post to confirm no two are identical
+            generated (str): Timestamp written in each post (default: now)
+            
+        Returns:
+            Dict: Report with the space size, posts written, unique count and throughput
+        """
+        if generated is None:
+            generated = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        started = time.perf_counter()
+        spaces = [self.variant_space(topic, generated) for topic in self.topics]
+        combined = CombinedSpace(spaces)
+        seen = set() if verify else None
+        duplicates = 0
+        
+        print(f"Variant space: {len(combined)} posts across {len(spaces)} topics")
+        with JsonlSink(output_path, shard_size) as sink:
+            for number in variant_order(len(combined), seed, start, count):
+                position, local = combined.locate(number)
+                (title, header), paragraphs, footer = spaces[position].choices(local)
+                content = header + paragraphs + footer
+                if seen is not None:
+                    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+                    if digest in seen:
+                        duplicates += 1
+                    seen.add(digest)
+                topic = self.topics[position]
+                sink.write({
+                    'id': f"variant-{number}",
+                    'variant': number,
+                    'topic': topic['title'],
+                    'category': topic['category'],
+                    'title': title,
+                    'content': content
+                })
+        
+        elapsed = time.perf_counter() - started
+        report = {
+            'space': len(combined),
+            'written': sink.records,
+            # Distinct positions of a permutation are distinct variants by construction
+            'unique_variants': sink.records,
+            'verified': verify,
+            'duplicate_texts': duplicates if verify else None,
+            'seed': seed,
+            'start': start,
+            'paths': sink.paths,
+            'seconds': round(elapsed, 3),
+            'posts_per_second': round(sink.records / elapsed) if elapsed > 0 else None
+        }
+        
+        print(f"Bulk run complete: {report['written']} posts ({report['posts_per_second']}/s) -> {', '.join(sink.paths)}")
+        if verify:
+            print(f"Uniqueness: {report['written'] - duplicates}/{report['written']} distinct posts, {duplicates} duplicates")
+        else:
+            print(f"Uniqueness: {report['written']} distinct variants (text not verified)")
+        return report
+
 def main():
     """
     Main function to run the blog post generator.
     """
+    parser = argparse.ArgumentParser(description="AcePlan Tennis Blog Post Generator")
+    parser.add_argument('--bulk', type=int, nargs='?', const=-1, metavar='COUNT',
+                        help='Stream COUNT template-only posts to JSONL (no COUNT: the whole variant space)')
+    parser.add_argument('--seed', type=int, help='Permutation seed for --bulk (default: enumerate in order)')
+    parser.add_argument('--start', type=int, default=0, help='Position in the variant order to start from')
+    parser.add_argument('--output', default=os.path.join('generated_posts', 'bulk_posts.jsonl'),
+                        help='JSONL output file for --bulk')
+    parser.add_argument('--shard-size', type=int, default=0, help='Posts per JSONL shard (0 = one file)')
+    parser.add_argument('--no-verify', action='store_true', help='Skip hashing posts to verify uniqueness')
+    args = parser.parse_args()
+    
+    if args.bulk is not None:
+        generator = TennisBlogGenerator()
+        report = generator.generate_bulk(
+            args.output,
+            count=None if args.bulk < 0 else args.bulk,
+            seed=args.seed,
+            start=args.start,
+            shard_size=args.shard_size,
+            verify=not args.no_verify
+        )
+        print(json.dumps(report, indent=2))
+        return
+    
     print("AcePlan Tennis Blog Post Generator")
     print("==================================")
     print("Website: https://aceplan.me")
@@ -405,7 +675,7 @@ def main():
         
         if choice == '1':
             topic = random.choice(generator.topics)
-            content = generator.generate_blog_post(topic)
+            content = generator.generate_unique_post(topic)
             generator.save_post(content)
             
         elif choice == '2':
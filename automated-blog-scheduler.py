@@ -28,23 +28,41 @@ import argparse
 import logging
 import datetime
 import time
-from pathlib import Path
 from typing import Optional
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from gpt4all_blog_generator import TennisBlogGenerator
+# Import the GPT4All blog generator module (the file name is not importable directly)
+import importlib.util
+spec = importlib.util.spec_from_file_location(
+    'gpt4all_blog_generator',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gpt4all-blog-generator.py')
+)
+gpt4all_blog_generator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gpt4all_blog_generator)
+TennisBlogGenerator = gpt4all_blog_generator.TennisBlogGenerator
+
+from post_manifest import get_post_manifest
+from post_layout import LAYOUTS, DEFAULT_LAYOUT, companion_paths, migrate_layout, remove_empty_shards
+from post_archive import PostArchive, ARCHIVE_DIR_NAME
 
 class BlogScheduler:
-    def __init__(self, log_file: str = "blog_generator.log"):
+    def __init__(self, log_file: str = "blog_generator.log", workers: int = 1, single_pass: bool = False,
+                 output_layout: str = DEFAULT_LAYOUT):
         """
         Initialize the blog scheduler.
         
         Args:
             log_file (str): Path to log file
+            workers (int): Worker processes for batch generation (0 = auto)
+            single_pass (bool): Generate all sections of a post with one model call
+            output_layout (str): Directory layout of saved posts ('flat', 'date', 'date_slot')
         """
         self.log_file = log_file
+        self.workers = workers
+        self.single_pass = single_pass
+        self.output_layout = output_layout
         self.setup_logging()
         self.generator = None
         
@@ -63,7 +81,8 @@ class BlogScheduler:
     def initialize_generator(self):
         """Initialize the blog generator."""
         try:
-            self.generator = TennisBlogGenerator()
+            self.generator = TennisBlogGenerator(single_pass=self.single_pass)
+            self.generator.output_layout = self.output_layout
             self.logger.info("Blog generator initialized successfully")
             return True
         except Exception as e:
@@ -103,7 +122,7 @@ class BlogScheduler:
             return False
             
         try:
-            filepaths = self.generator.generate_batch_posts(7)
+            filepaths = self.generator.generate_batch_posts(7, workers=self.workers)
             self.logger.info(f"Weekly batch generated successfully: {len(filepaths)} posts")
             return True
         except Exception as e:
@@ -126,40 +145,109 @@ class BlogScheduler:
             return False
             
         try:
-            filepaths = self.generator.generate_batch_posts(count)
+            filepaths = self.generator.generate_batch_posts(count, workers=self.workers)
             self.logger.info(f"Custom batch generated successfully: {len(filepaths)} posts")
             return True
         except Exception as e:
             self.logger.error(f"Failed to generate custom batch: {e}")
             return False
     
-    def cleanup_old_posts(self, days_to_keep: int = 30):
+    def cleanup_old_posts(self, days_to_keep: int = 30, archive: bool = False):
         """
         Clean up old blog posts to save disk space.
         
+        Old posts are found with an indexed query on the post manifest;
+        posts saved before the manifest existed are added to it once.
+        
         Args:
             days_to_keep (int): Number of days to keep posts
+            archive (bool): Move old posts into compressed monthly archives instead of deleting them
         """
         self.logger.info(f"Cleaning up posts older than {days_to_keep} days...")
         
-        output_dir = Path(self.generator.output_dir if self.generator else "generated_posts")
-        if not output_dir.exists():
+        output_dir = self.generator.output_dir if self.generator else "generated_posts"
+        if not os.path.isdir(output_dir):
             return
+        
+        manifest = get_post_manifest()
+        if not manifest.is_indexed(output_dir):
+            added = manifest.index_directory(output_dir)
+            self.logger.info(f"Added {added} existing posts to the post manifest")
             
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_to_keep)
-        deleted_count = 0
+        cutoff = time.time() - days_to_keep * 86400
+        old_posts = manifest.posts(until=cutoff, under=output_dir, archived=False, newest_first=False)
+        
+        if archive:
+            archived = self.post_archive(output_dir).archive(old_posts)
+            for path in archived:
+                remove_empty_shards(path, output_dir)
+            self.logger.info(f"Cleanup completed: {len(archived)} old posts archived")
+            return
         
-        for file_path in output_dir.glob("*.txt"):
+        deleted = []
+        for post in old_posts:
             try:
-                file_time = datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                if file_time < cutoff_date:
-                    file_path.unlink()
-                    deleted_count += 1
-                    self.logger.info(f"Deleted old post: {file_path.name}")
+                os.unlink(post['path'])
+                self.logger.info(f"Deleted old post: {os.path.basename(post['path'])}")
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                self.logger.warning(f"Failed to delete {file_path.name}: {e}")
+                self.logger.warning(f"Failed to delete {os.path.basename(post['path'])}: {e}")
+                continue
+            # The .html/.json exports go with the post; nothing tracks them once its row is removed
+            for companion in companion_paths(post['path']):
+                try:
+                    os.unlink(companion)
+                except OSError as e:
+                    self.logger.warning(f"Failed to delete {os.path.basename(companion)}: {e}")
+            remove_empty_shards(post['path'], output_dir)
+            deleted.append(post['path'])
+        
+        manifest.remove(deleted)
+        self.logger.info(f"Cleanup completed: {len(deleted)} old posts deleted")
+
+    def post_archive(self, output_dir: str = None) -> PostArchive:
+        """Monthly archives of old posts, kept in <output_dir>/archive."""
+        output_dir = output_dir or (self.generator.output_dir if self.generator else "generated_posts")
+        return PostArchive(os.path.join(output_dir, ARCHIVE_DIR_NAME), get_post_manifest())
+
+    def migrate_layout(self, layout: str):
+        """
+        Move existing posts into a directory layout and update the post manifest.
+        
+        Args:
+            layout (str): Target layout ('flat', 'date', 'date_slot')
+        """
+        output_dir = self.generator.output_dir if self.generator else "generated_posts"
+        if not os.path.isdir(output_dir):
+            return
         
-        self.logger.info(f"Cleanup completed: {deleted_count} old posts deleted")
+        self.logger.info(f"Migrating {output_dir} to the '{layout}' layout...")
+        moved = migrate_layout(output_dir, layout, manifest=get_post_manifest())
+        self.logger.info(f"Migration completed: {len(moved)} files moved")
+
+    def list_posts(self, days: int = 7, theme: str = None, slot: str = None, racket_id: str = None) -> list:
+        """
+        List posts saved in the last days from the post manifest.
+        
+        Args:
+            days (int): How many days back to look
+            theme (str): Only posts of this theme (optional)
+            slot (str): Only posts of this slot (optional)
+            racket_id (str): Only posts featuring this racket (optional)
+            
+        Returns:
+            list: Matching posts, newest first
+        """
+        since = time.time() - days * 86400
+        posts = get_post_manifest().posts(since=since, theme=theme, slot=slot, racket_id=racket_id)
+        for post in posts:
+            created = datetime.datetime.fromtimestamp(post['created_at']).strftime('%Y-%m-%d %H:%M')
+            rackets = f" [{', '.join(post['racket_ids'])}]" if post['racket_ids'] else ""
+            archived = " (archived)" if post['archive'] else ""
+            print(f"#{post['id']}  {created}  {post['theme'] or '-'}  {post['slot'] or '-'}  {os.path.basename(post['path'])}{rackets}{archived}")
+        print(f"{len(posts)} posts in the last {days} days")
+        return posts
 
 def create_cron_script():
     """Create a shell script for cron job setup."""
@@ -199,7 +287,12 @@ Examples:
   python automated-blog-scheduler.py --daily
   python automated-blog-scheduler.py --weekly
   python automated-blog-scheduler.py --count 10
+  python automated-blog-scheduler.py --count 60 --workers 0
   python automated-blog-scheduler.py --setup-cron
+  python automated-blog-scheduler.py --list 7 --theme equipment
+  python automated-blog-scheduler.py --migrate-layout date_slot
+  python automated-blog-scheduler.py --cleanup 30 --archive
+  python automated-blog-scheduler.py --read-archived 1234
         """
     )
     
@@ -221,6 +314,19 @@ Examples:
         help="Generate a custom number of blog posts"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for --weekly/--count (0 = size from RAM and cores)"
+    )
+    
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="Generate all sections of each post with one model call"
+    )
+    
     parser.add_argument(
         "--setup-cron",
         action="store_true",
@@ -234,6 +340,50 @@ Examples:
         help="Clean up posts older than specified days"
     )
     
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="With --cleanup, pack old posts into compressed monthly archives instead of deleting them"
+    )
+    
+    parser.add_argument(
+        "--read-archived",
+        type=int,
+        metavar="POST_ID",
+        help="Print an archived post by its id (as shown by --list)"
+    )
+    
+    parser.add_argument(
+        "--compact-archive",
+        metavar="YYYY-MM",
+        help="Merge the archive parts of a month into one archive"
+    )
+    
+    parser.add_argument(
+        "--list",
+        type=int,
+        metavar="DAYS",
+        help="List posts saved in the last DAYS days (filter with --theme, --slot, --racket)"
+    )
+    
+    parser.add_argument("--theme", help="Theme filter for --list")
+    parser.add_argument("--slot", help="Slot filter for --list (morning, afternoon, evening, daily, weekly)")
+    parser.add_argument("--racket", help="Racket id filter for --list")
+    
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default=DEFAULT_LAYOUT,
+        help="Directory layout of new posts: flat, date (YYYY/MM/DD) or date_slot (YYYY/MM/DD/<slot>)"
+    )
+    
+    parser.add_argument(
+        "--migrate-layout",
+        choices=LAYOUTS,
+        metavar="LAYOUT",
+        help="Move existing posts into LAYOUT (flat, date or date_slot)"
+    )
+    
     parser.add_argument(
         "--log-file",
         default="blog_generator.log",
@@ -243,7 +393,12 @@ Examples:
     args = parser.parse_args()
     
     # Create scheduler instance
-    scheduler = BlogScheduler(log_file=args.log_file)
+    if args.workers < 0:
+        print("Error: Workers must be 0 (auto) or a positive number")
+        sys.exit(1)
+    
+    scheduler = BlogScheduler(log_file=args.log_file, workers=args.workers, single_pass=args.single_pass,
+                              output_layout=args.layout)
     
     # Handle different commands
     if args.setup_cron:
@@ -251,7 +406,27 @@ Examples:
         return
     
     if args.cleanup:
-        scheduler.cleanup_old_posts(args.cleanup)
+        scheduler.cleanup_old_posts(args.cleanup, archive=args.archive)
+        return
+    
+    if args.read_archived is not None:
+        content = scheduler.post_archive().read(args.read_archived)
+        if content is None:
+            print(f"Error: Post {args.read_archived} is not archived")
+            sys.exit(1)
+        print(content)
+        return
+    
+    if args.compact_archive:
+        scheduler.post_archive().compact(args.compact_archive)
+        return
+    
+    if args.migrate_layout:
+        scheduler.migrate_layout(args.migrate_layout)
+        return
+    
+    if args.list is not None:
+        scheduler.list_posts(args.list, theme=args.theme, slot=args.slot, racket_id=args.racket)
         return
     
     if args.daily:
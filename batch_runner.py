@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+AcePlan Parallel Batch Runner
+=============================
+
+Spreads blog post generation across several processes, each holding its
+own GPT4All model.
+
+Features:
+- Worker count sized to available RAM and CPU cores
+- One model load per worker, reused for every post it generates
+- Deterministic per-post seeds and output order
+- Posts handed back as they finish (in seed order), so callers save them as
+  the batch runs instead of after it
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+from gpt4all_runtime import get_model_holder
+
+# Used when the model file is not on disk yet (orca-mini-3b q4_0 is ~1.9 GB)
+DEFAULT_MODEL_BYTES = 2 * 1024 * 1024 * 1024
+# Working memory per model on top of the weights (context, buffers)
+MODEL_OVERHEAD = 1.25
+# Fewer threads than this per model makes each generation too slow to be worth it
+MIN_THREADS_PER_WORKER = 4
+# Batch base seeds are drawn below this; retry passes use seeds above it
+BATCH_SEED_RANGE = 2 ** 32
+
+GPT4ALL_MODEL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gpt4all")
+
+def model_size_bytes(model_name: str) -> int:
+    """Return the size of the model file, or an estimate if it is not downloaded."""
+    try:
+        return os.path.getsize(os.path.join(GPT4ALL_MODEL_DIR, model_name))
+    except OSError:
+        return DEFAULT_MODEL_BYTES
+
+def available_memory_bytes() -> Optional[int]:
+    """Return available memory in bytes, or None if it cannot be determined."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def recommended_worker_count(model_name: str) -> int:
+    """
+    Pick a worker count that fits in RAM and leaves each model enough cores.
+
+    Args:
+        model_name (str): GPT4All model each worker loads
+
+    Returns:
+        int: Number of worker processes to use
+    """
+    cores = os.cpu_count() or 1
+    by_cores = max(1, cores // MIN_THREADS_PER_WORKER)
+
+    memory = available_memory_bytes()
+    if memory is None:
+        return by_cores
+
+    per_worker = model_size_bytes(model_name) * MODEL_OVERHEAD
+    by_memory = max(1, int(memory // per_worker))
+
+    return min(by_cores, by_memory)
+
+def threads_per_worker(workers: int) -> int:
+    """Split the CPU cores evenly between workers."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+# Generator instance owned by each worker process
+_worker_generator = None
+
+def _init_worker(script_path: str, class_name: str, generator_kwargs: Dict[str, Any], n_threads: int):
+    """Load the generator (and its model) once per worker process."""
+    global _worker_generator
+
+    model_name = generator_kwargs.get('model_name')
+    holder = get_model_holder(model_name) if model_name else get_model_holder()
+    holder.n_threads = n_threads
+
+    spec = importlib.util.spec_from_file_location(f"batch_worker_{class_name}", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _worker_generator = getattr(module, class_name)(**generator_kwargs)
+
+def _generate_post(seed: int) -> Tuple[str, Dict[str, Any]]:
+    """Generate one post with a fixed seed; returns its content and post_info."""
+    return _worker_generator.generate_seeded_post(seed)
+
+def generate_posts_parallel(script_path: str, class_name: str, seeds: List[int],
+                            workers: int, generator_kwargs: Dict[str, Any] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Generate one post per seed across a process pool.
+
+    Workers are started with the "spawn" method so no worker inherits a
+    half-initialized model from the parent. Each post is yielded as soon as
+    it and every post before it are done, so a crash late in a batch does
+    not lose the posts already generated.
+
+    Args:
+        script_path (str): Path of the generator script to load in each worker
+        class_name (str): Generator class defined in the script
+        seeds (List[int]): One seed per post
+        workers (int): Number of worker processes
+        generator_kwargs (Dict): Keyword arguments for the generator class
+
+    Returns:
+        Iterator[Tuple[str, Dict]]: (content, post_info) of each post, in the same order as seeds
+    """
+    generator_kwargs = generator_kwargs or {}
+    workers = max(1, min(workers, len(seeds)))
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(script_path, class_name, generator_kwargs, threads_per_worker(workers))
+    ) as executor:
+        yield from executor.map(_generate_post, seeds)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+AcePlan Blog Generator Client
+=============================
+
+Thin client for the blog generator daemon (python3 advanced-scheduler.py --serve).
+
+It only uses the standard library, so a cron job that calls it does not pay
+for importing GPT4All or loading the model. If the daemon is not running the
+client falls back to a one-off advanced-scheduler.py run.
+
+Usage:
+    python3 blog-client.py generate morning
+    python3 blog-client.py publish evening --no-wait
+    python3 blog-client.py status
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET_PATH = os.path.join(SCRIPT_DIR, "blog-generator.sock")
+SCHEDULER_SCRIPT = os.path.join(SCRIPT_DIR, "advanced-scheduler.py")
+
+TIME_SLOTS = ["morning", "afternoon", "evening", "9am", "12pm", "3pm", "5pm", "7pm"]
+
+def send_request(request: dict, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = None) -> dict:
+    """
+    Send one request to the daemon and return its response.
+
+    Args:
+        request (dict): Request with an 'action' and optional 'slot'
+        socket_path (str): Path of the daemon's Unix socket
+        timeout (float): Socket timeout in seconds (None waits for the job)
+
+    Returns:
+        dict: Response from the daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+
+    return json.loads(data.decode('utf-8'))
+
+def run_without_daemon(action: str, slot: str):
+    """Run the job in a fresh advanced-scheduler.py process."""
+    flag = "--publish" if action == "publish" else "--immediate"
+    print("Blog generator daemon not running, starting a one-off run...")
+    os.execv(sys.executable, [sys.executable, SCHEDULER_SCRIPT, flag, slot])
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description="AcePlan Blog Generator Client")
+
+    parser.add_argument(
+        "action",
+        choices=["generate", "publish", "reload", "health", "status", "ping", "stop"],
+        help="Request to send to the daemon"
+    )
+
+    parser.add_argument(
+        "slot",
+        nargs="?",
+        choices=TIME_SLOTS,
+        help="Time slot for generate/publish"
+    )
+
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Return as soon as the daemon has accepted the job"
+    )
+
+    parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Fail instead of starting a one-off run when the daemon is down"
+    )
+
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help="Unix socket path of the daemon"
+    )
+
+    args = parser.parse_args()
+
+    if args.action in ("generate", "publish") and args.slot is None:
+        parser.error(f"{args.action} requires a time slot")
+
+    request = {'action': args.action, 'wait': not args.no_wait}
+    if args.slot:
+        request['slot'] = args.slot
+
+    try:
+        response = send_request(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if args.action in ("generate", "publish") and not args.no_fallback:
+            run_without_daemon(args.action, args.slot)
+        print(f"Error: blog generator daemon is not running ({args.socket})")
+        sys.exit(1)
+
+    print(json.dumps(response))
+    sys.exit(0 if response.get('ok') else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+AcePlan GPT4All Calibration
+===========================
+
+Finds the CPU thread count and prompt batch size that make GPT4All fastest
+on this host, and stores them so the blog generators use them at load.
+
+Features:
+- Fixed benchmark prompts run through a generator's generate_with_gpt4all
+- Prompt-eval and generation tokens/sec measured per setting
+- Two-stage search (threads first, then batch size) to keep runs short on many-core hosts
+- Results stored per host and model in blog_cache/gpt4all_calibration.json
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import shutil
+import datetime
+import tempfile
+from typing import Dict, List, Optional, Any
+
+from gpt4all_runtime import StreamingPostWriter, estimate_tokens, save_calibration, CALIBRATION_FILE
+
+# Prompts shaped like the generators' own sections, short enough to run many times
+BENCHMARK_PROMPTS = [
+    """
+    Write a short analysis of the Babolat Pure Aero tennis racket.
+    Explain why it suits players who hit with heavy topspin, mentioning its weight,
+    head size and stiffness. Keep it under 80 words.
+    """,
+    """
+    Explain the split-step footwork drill for beginner tennis players.
+    Give three clear steps and one common mistake to avoid. Keep it under 80 words.
+    """,
+    """
+    Write a short, motivational story about a 15-year-old tennis player who improved
+    from UTR 4 to UTR 7 in one year through consistent match play. Keep it under 80 words.
+    """
+]
+
+BENCHMARK_MAX_TOKENS = 64
+
+# Batch size used while searching thread counts
+THREAD_SWEEP_BATCH = 128
+
+DEFAULT_BATCH_SIZES = [8, 32, 128, 512]
+
+def default_thread_counts() -> List[int]:
+    """Powers of two up to the core count, plus the core count and half of it."""
+    cores = os.cpu_count() or 1
+    counts = {cores, max(1, cores // 2)}
+    n = 1
+    while n < cores:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+def run_benchmark(generator, n_threads: int, n_batch: int,
+                  prompts: List[str] = BENCHMARK_PROMPTS,
+                  max_tokens: int = BENCHMARK_MAX_TOKENS) -> Optional[Dict[str, Any]]:
+    """
+    Time the benchmark prompts with one thread count and batch size.
+
+    Prompt-eval speed is taken from the time to first token, generation
+    speed from the tokens streamed after it.
+
+    Args:
+        generator: Blog generator whose generate_with_gpt4all is benchmarked
+        n_threads (int): CPU threads to use
+        n_batch (int): Prompt tokens evaluated per batch
+        prompts (List[str]): Benchmark prompts
+        max_tokens (int): Tokens generated per prompt
+
+    Returns:
+        Dict: Timings for the setting, or None if the model produced nothing
+    """
+    holder = generator.model_holder
+    holder.set_threads(n_threads)
+    holder.n_batch = n_batch
+
+    journal_dir = tempfile.mkdtemp(prefix="aceplan-calibration-")
+    writer = StreamingPostWriter(os.path.join(journal_dir, "benchmark.txt"))
+    generator.stream_writer = writer
+    try:
+        for prompt in prompts:
+            generator.generate_with_gpt4all(prompt, max_tokens=max_tokens)
+    finally:
+        generator.stream_writer = None
+        writer.finish()
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+    timed = [m for m in writer.metrics if m['ttft_seconds'] is not None and m['tokens']]
+    if len(timed) < len(prompts):
+        return None
+
+    prompt_tokens = sum(estimate_tokens(prompt) for prompt in prompts)
+    prompt_seconds = sum(m['ttft_seconds'] for m in timed)
+    generated_tokens = sum(m['tokens'] - 1 for m in timed)
+    generation_seconds = sum(m['seconds'] - m['ttft_seconds'] for m in timed)
+    total_seconds = sum(m['seconds'] for m in timed)
+
+    return {
+        'n_threads': n_threads,
+        'n_batch': n_batch,
+        'prompt_tokens_per_second': round(prompt_tokens / prompt_seconds, 2) if prompt_seconds else 0.0,
+        'generation_tokens_per_second': round(generated_tokens / generation_seconds, 2) if generation_seconds else 0.0,
+        'seconds': round(total_seconds, 3)
+    }
+
+def calibrate(generator, thread_counts: List[int] = None, batch_sizes: List[int] = None,
+              save: bool = True, path: str = CALIBRATION_FILE) -> Dict[str, Any]:
+    """
+    Find the fastest thread count and batch size for the generator's model.
+
+    Thread counts are compared at a fixed batch size first, by generation
+    tokens/sec, then batch sizes at the best thread count, by prompt-eval
+    tokens/sec (the batch size only affects prompt evaluation). Rates are
+    compared rather than total time because sampled output can stop early,
+    and a shorter answer is not a faster setting. The response cache and
+    section deadlines are switched off while benchmarking.
+
+    Args:
+        generator: Blog generator with a model_holder and generate_with_gpt4all
+        thread_counts (List[int]): Thread counts to try (default: powers of two up to the core count)
+        batch_sizes (List[int]): Batch sizes to try (default: 8, 32, 128, 512)
+        save (bool): Store the winner for this host
+        path (str): Calibration file
+
+    Returns:
+        Dict: The best settings with their timings and every measured result
+    """
+    holder = generator.model_holder
+    if holder.load() is None:
+        raise RuntimeError(f"GPT4All model not available: {holder.model_name}")
+
+    thread_counts = thread_counts or default_thread_counts()
+    batch_sizes = batch_sizes or DEFAULT_BATCH_SIZES
+
+    saved_state = (generator.response_cache, generator.section_time_limit, generator.section_token_limit,
+                   holder.model.model.thread_count(), holder.n_batch)
+    generator.response_cache = None
+    generator.section_time_limit = None
+    generator.section_token_limit = None
+
+    results = []
+
+    def measure(n_threads: int, n_batch: int) -> Optional[Dict[str, Any]]:
+        result = run_benchmark(generator, n_threads, n_batch)
+        if result is None:
+            print(f"  {n_threads:>3} threads, batch {n_batch:>4}: no output, skipped")
+            return None
+        print(f"  {n_threads:>3} threads, batch {n_batch:>4}: "
+              f"prompt {result['prompt_tokens_per_second']:.1f} tok/s, "
+              f"generation {result['generation_tokens_per_second']:.1f} tok/s, "
+              f"{result['seconds']:.2f}s")
+        results.append(result)
+        return result
+
+    try:
+        # Warm-up run so the first measured setting does not pay for page faults
+        run_benchmark(generator, thread_counts[-1], THREAD_SWEEP_BATCH, prompts=BENCHMARK_PROMPTS[:1])
+
+        print(f"Calibrating {holder.model_name}: thread counts {thread_counts}")
+        by_threads = [r for r in (measure(n, THREAD_SWEEP_BATCH) for n in thread_counts) if r]
+        if not by_threads:
+            raise RuntimeError("GPT4All produced no output during calibration")
+        best_threads = max(by_threads, key=lambda r: r['generation_tokens_per_second'])['n_threads']
+
+        print(f"Calibrating {holder.model_name}: batch sizes {batch_sizes} at {best_threads} threads")
+        for n_batch in batch_sizes:
+            if n_batch != THREAD_SWEEP_BATCH:
+                measure(best_threads, n_batch)
+    finally:
+        generator.response_cache, generator.section_time_limit, generator.section_token_limit = saved_state[:3]
+        holder.set_threads(saved_state[3])
+        holder.n_batch = saved_state[4]
+
+    best = max((r for r in results if r['n_threads'] == best_threads),
+               key=lambda r: r['prompt_tokens_per_second'])
+    settings = dict(best, cpu_count=os.cpu_count(), calibrated_at=datetime.datetime.now().isoformat())
+
+    print(f"Best settings: {best['n_threads']} threads, batch size {best['n_batch']}")
+    if save:
+        save_calibration(holder.model_name, settings, path)
+        holder.set_threads(best['n_threads'])
+        holder.n_batch = best['n_batch']
+        print(f"Saved calibration to {path}")
+
+    return {'best': settings, 'results': results}
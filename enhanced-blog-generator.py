@@ -19,53 +19,118 @@ Database: https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9UQ1Z
 """
 
 import os
+import sys
 import json
 import random
 import datetime
-import requests
-import csv
-import io
 from typing import List, Dict, Any, Optional
 import time
 from pathlib import Path
 
-# GPT4All imports
-try:
-    from gpt4all import GPT4All
-    GPT4ALL_AVAILABLE = True
-except ImportError:
-    GPT4ALL_AVAILABLE = False
-    print("Warning: GPT4All not installed. Install with: pip install gpt4all")
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# GPT4All model handling shared by all generators
+from gpt4all_runtime import get_model_holder, generate_text, per_post_chat_session, stream_post, recover_partial_posts, DeadlineExceeded, DEFAULT_SECTION_TIME_LIMIT
+from response_cache import get_response_cache
+from racket_snapshot import get_racket_store
+from racket_catalog import RacketCatalog, catalog_for_snapshot
+from racket_index import RacketIndex, TOP_10_QUERIES
+from racket_ranking import RacketRanker
+from racket_similarity import SimilarityIndex
+from post_templates import (
+    Template, PostBuffer, TOP_10_HEADER, TOP_10_HEADING, COMPARISON_HEADER, NUMBERED_SECTION, get_fragment_cache
+)
+from post_writer import get_post_writer, save_post_files
+from post_manifest import get_post_manifest
+from post_layout import DEFAULT_LAYOUT
+from post_dedup import DEDUP_ATTEMPTS, DuplicatePostError, get_content_store
+
+# Layout of a saved post, compiled once
+POST_LAYOUT = Template("""# {title}
+
+**Meta Description:** {meta_description}
+
+---
+
+{content}
+
+---
+
+## Conclusion
+
+Whether you're looking to improve your UTR rating, find the perfect racket, or enhance your tennis game, the right approach and equipment make all the difference. 
+
+For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.
+
+Our database includes detailed specifications, reviews, and affiliate links to help you make informed purchasing decisions while supporting our platform.
+
+---
+
+**Keywords:** {keywords|join}
+**Category:** Tennis Equipment & Training
+**Generated:** {generated}
+**Website:** https://aceplan.me
+**Database:** https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/edit?gid=0#gid=0
+**Racket Database:** 100+ tennis rackets with detailed specifications and affiliate links
+""")
 
 class EnhancedTennisBlogGenerator:
-    def __init__(self, output_dir: str = "generated_posts", model_name: str = "orca-mini-3b-gguf2-q4_0.gguf"):
+    def __init__(self, output_dir: str = "generated_posts", model_name: str = "orca-mini-3b-gguf2-q4_0.gguf", preload_model: bool = False, background_refresh: bool = False):
         """
         Initialize the enhanced blog post generator.
         
         Args:
             output_dir (str): Directory to save generated posts
             model_name (str): GPT4All model to use
+            preload_model (bool): Start loading the model in the background right away
+            background_refresh (bool): Refresh a stale racket snapshot in the background
         """
         self.output_dir = output_dir
+        # Formats written by save_post: 'txt' (Markdown), 'html', 'json'
+        self.output_formats = ('txt',)
+        # Where posts go inside output_dir: 'flat', 'date' (YYYY/MM/DD) or 'date_slot'
+        self.output_layout = DEFAULT_LAYOUT
+        # Atomic, batched writes off the generating thread (shared by the process)
+        self.post_writer = get_post_writer()
+        self.last_write = None
+        # Index of saved posts; post_info describes the post being generated
+        self.manifest = get_post_manifest()
+        self.post_info: Dict[str, Any] = {}
+        # Hashes of every saved or published post body; exact duplicates are not saved
+        self.content_hashes = get_content_store()
         self.model_name = model_name
-        self.model = None
+        self.model_holder = get_model_holder(model_name)
+        self.response_cache = get_response_cache()
+        self.stream_writer = None
+        self.last_stream_metrics = []
+        
+        # Per-section inference budget; None disables a limit
+        self.section_time_limit = DEFAULT_SECTION_TIME_LIMIT
+        self.section_token_limit = None
+        
+        # One chat session per post so the shared system preamble is evaluated once
+        self.use_chat_session = True
+        self.last_session_stats = {}
         self.ensure_output_directory()
         
-        # Initialize GPT4All model
-        if GPT4ALL_AVAILABLE:
-            try:
-                print(f"Loading GPT4All model: {model_name}")
-                self.model = GPT4All(model_name)
-                print("GPT4All model loaded successfully!")
-            except Exception as e:
-                print(f"Error loading GPT4All model: {e}")
-                print("Falling back to template-based generation")
-                self.model = None
-        else:
-            print("GPT4All not available, using template-based generation")
+        # The GPT4All model is loaded on first use (shared with other generators)
+        if preload_model:
+            self.model_holder.preload_async()
         
-        # Load racket data from Google Sheets
+        # Load racket data from the local snapshot of Google Sheets
+        self.racket_store = get_racket_store()
+        self.background_refresh = background_refresh
         self.rackets = self.load_rackets_from_sheets()
+        self._racket_index = None
+        self._racket_ranker = None
+        self._racket_similarity = None
+        
+        # Rendered racket fragments, shared across posts and generators
+        self.fragments = get_fragment_cache()
+        
+        # Theme weights for Top 10 ranking (None uses racket_ranking.THEME_WEIGHTS)
+        self.ranking_weights = None
         
         # Content themes for unique posts
         self.content_themes = [
@@ -95,44 +160,28 @@ class EnhancedTennisBlogGenerator:
             os.makedirs(self.output_dir)
             print(f"Created output directory: {self.output_dir}")
 
-    def load_rackets_from_sheets(self) -> List[Dict]:
-        """Load racket data from Google Sheets CSV export."""
-        # Google Sheets CSV export URL
-        sheets_url = "https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/export?format=csv&gid=0"
+    def load_rackets_from_sheets(self, refresh: bool = False) -> RacketCatalog:
+        """
+        Load racket data from the local snapshot of the Google Sheets database.
         
-        try:
-            print("Loading racket data from Google Sheets...")
-            response = requests.get(sheets_url)
-            response.raise_for_status()
-            
-            # Parse CSV data
-            csv_data = csv.DictReader(io.StringIO(response.text))
-            rackets = []
-            
-            for row in csv_data:
-                if row.get('Name') and row.get('Name').strip():  # Skip empty rows
-                    racket = {
-                        'id': row.get('#', '').strip(),
-                        'name': row.get('Name', '').strip(),
-                        'type': row.get('Type', '').strip(),
-                        'weight': row.get('Weight (Unstrung, g)', '').strip(),
-                        'head_size': row.get('Head Size (in²)', '').strip(),
-                        'balance': row.get('Balance (cm)', '').strip(),
-                        'string_pattern': row.get('String Pattern', '').strip(),
-                        'best_for': row.get('Best For', '').strip(),
-                        'standout_tech': row.get('Standout Tech', '').strip(),
-                        'skill_level': row.get('Skill Level', '').strip(),
-                        'affiliate_link': row.get('Link', '').strip()
-                    }
-                    rackets.append(racket)
-            
+        The sheet is only contacted when the snapshot is older than its TTL
+        (or refresh is set), and only downloaded again if it has changed.
+        
+        The rackets are returned as a RacketCatalog with parsed numeric specs;
+        records still support racket['name'] style access.
+        
+        Args:
+            refresh (bool): Check the sheet for changes now, even if the snapshot is fresh
+        """
+        print("Loading racket data...")
+        # An explicit refresh waits for the sheet; otherwise a stale snapshot may refresh in the background
+        rackets = self.racket_store.get_rackets(background=self.background_refresh and not refresh, force_check=refresh)
+        if rackets:
             print(f"Loaded {len(rackets)} rackets from database")
-            return rackets
-            
-        except Exception as e:
-            print(f"Error loading rackets from Google Sheets: {e}")
-            print("Using fallback racket data...")
-            return self.get_fallback_rackets()
+            return catalog_for_snapshot(rackets, self.racket_store.version)
+        
+        print("Using fallback racket data...")
+        return RacketCatalog(self.get_fallback_rackets(), version="fallback")
 
     def get_fallback_rackets(self) -> List[Dict]:
         """Fallback racket data if Google Sheets fails."""
@@ -165,14 +214,57 @@ class EnhancedTennisBlogGenerator:
             }
         ]
 
+    @property
+    def racket_index(self) -> RacketIndex:
+        """Attribute index of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_index is None or self._racket_index.catalog is not self.rackets:
+            self._racket_index = RacketIndex(self.rackets)
+        return self._racket_index
+
+    def find_rackets(self, query: str, limit: int = None) -> List[Dict]:
+        """Rackets matching an index query such as "best_for:spin OR type:power"."""
+        return self.rackets.select(self.racket_index.query(query, limit))
+
+    @property
+    def racket_ranker(self) -> RacketRanker:
+        """Spec-based ranker of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_ranker is None or self._racket_ranker.catalog is not self.rackets:
+            self._racket_ranker = RacketRanker(self.rackets, self.racket_index, self.ranking_weights)
+        return self._racket_ranker
+
+    def rank_rackets(self, theme: str, count: int = 10) -> List[Dict]:
+        """Best rackets for a Top 10 theme, with rackets matching the theme's query ranked first."""
+        return self.rackets.select(self.racket_ranker.top_k(theme, count, candidates=TOP_10_QUERIES[theme]))
+
+    @property
+    def racket_similarity(self) -> SimilarityIndex:
+        """Spec similarity index of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_similarity is None or self._racket_similarity.source is not self.rackets:
+            self._racket_similarity = SimilarityIndex.for_catalog(self.rackets)
+        return self._racket_similarity
+
+    def similar_rackets(self, racket, count: int = 3) -> List[Dict]:
+        """The rackets with specs closest to the given one, most similar first."""
+        return self.rackets.select(self.racket_similarity.most_similar(racket.index, count))
+
+    @property
+    def model(self):
+        """The shared GPT4All model, or None if it is not loaded."""
+        return self.model_holder.model
+
     def generate_with_gpt4all(self, prompt: str, max_tokens: int = 500) -> str:
         """Generate content using GPT4All model."""
-        if self.model is None:
+        if not self.model_holder.is_available():
             return self.generate_fallback_content(prompt)
         
         try:
-            response = self.model.generate(prompt, max_tokens=max_tokens, temp=0.7)
-            return response.strip()
+            return generate_text(
+                self.model_holder, prompt, max_tokens=max_tokens, temp=0.7,
+                cache=self.response_cache, writer=self.stream_writer,
+                time_limit=self.section_time_limit, token_limit=self.section_token_limit
+            )
+        except DeadlineExceeded:
+            return self.generate_fallback_content(prompt)
         except Exception as e:
             print(f"Error generating with GPT4All: {e}")
             return self.generate_fallback_content(prompt)
@@ -191,58 +283,50 @@ class EnhancedTennisBlogGenerator:
     def generate_top_10_content(self, theme: str) -> str:
         """Generate top 10 list content."""
         if "spin" in theme:
-            rackets = [r for r in self.rackets if "spin" in r['best_for'].lower() or "power" in r['type'].lower()][:10]
+            rackets = self.rank_rackets("spin")
             title = "Top 10 Tennis Rackets for Spin Players in 2024"
         elif "control" in theme:
-            rackets = [r for r in self.rackets if "control" in r['type'].lower() or "precision" in r['best_for'].lower()][:10]
+            rackets = self.rank_rackets("control")
             title = "Top 10 Control Tennis Rackets for Precision Players"
         elif "power" in theme:
-            rackets = [r for r in self.rackets if "power" in r['type'].lower()][:10]
+            rackets = self.rank_rackets("power")
             title = "Top 10 Power Tennis Rackets for Aggressive Players"
         elif "beginner" in theme:
-            rackets = [r for r in self.rackets if "intermediate" in r['skill_level'].lower()][:10]
+            rackets = self.rank_rackets("beginner")
             title = "Top 10 Best Tennis Rackets for Beginners and Intermediate Players"
         else:
-            rackets = random.sample(self.rackets, 10)
+            rackets = random.sample(self.rackets, min(10, len(self.rackets)))
             title = "Top 10 Tennis Rackets Every Player Should Know About"
+        self.post_info.setdefault('racket_ids', []).extend(racket['id'] for racket in rackets)
 
         prompt = f"""
-        Write an engaging introduction for a blog post titled "{title}".
+        Write the introduction for a blog post titled "{title}".
         Explain why these rackets are important for tennis players and what makes them special.
         Include information about how to choose the right racket for your playing style.
-        Keep it under 200 words and make it SEO-friendly.
+        Keep it under 200 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=300)
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=300))
         
         # Add the top 10 list
-        content += f"\n\n## {title}\n\n"
-        
-        for i, racket in enumerate(rackets, 1):
-            content += f"### {i}. {racket['name']}\n\n"
-            content += f"**Type:** {racket['type']} | **Weight:** {racket['weight']}g | **Head Size:** {racket['head_size']} in²\n\n"
-            content += f"**Best For:** {racket['best_for']}\n\n"
-            content += f"**Standout Technology:** {racket['standout_tech']}\n\n"
-            content += f"**Skill Level:** {racket['skill_level']}\n\n"
-            content += f"**Why It's Great:** This racket excels in {racket['best_for'].lower()} with its {racket['standout_tech']} technology, making it perfect for players seeking {racket['type'].lower()} characteristics.\n\n"
-            content += f"**[Get the {racket['name']} here]({racket['affiliate_link']})**\n\n"
-            content += "---\n\n"
+        content.render(TOP_10_HEADER, title=title)
+        self.fragments.render_each('top_10_entry', rackets, self.rackets.version, content.parts, heading=TOP_10_HEADING)
         
-        return content
+        return content.getvalue()
 
     def generate_utr_improvement_content(self) -> str:
         """Generate UTR improvement guide content."""
         prompt = """
         Write a comprehensive guide on how to improve your UTR (Universal Tennis Rating) quickly and effectively.
         Include specific strategies, training methods, and mental approaches that help players see rapid improvement.
-        Focus on practical, actionable advice that beginners and intermediate players can implement immediately.
-        Keep it engaging and motivational. Aim for 400-500 words.
+        Focus on actionable advice players can implement immediately.
+        Keep it motivational. Aim for 400-500 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=600)
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=600))
         
         # Add specific tips
-        content += "\n\n## 5 Key Strategies to Improve Your UTR Fast\n\n"
+        content.write("\n\n## 5 Key Strategies to Improve Your UTR Fast\n\n")
         
         strategies = [
             {
@@ -267,60 +351,61 @@ class EnhancedTennisBlogGenerator:
             }
         ]
         
-        for i, strategy in enumerate(strategies, 1):
-            content += f"### {i}. {strategy['title']}\n\n"
-            content += f"{strategy['description']}\n\n"
+        content.render_each(NUMBERED_SECTION, 'item', strategies)
         
-        return content
+        return content.getvalue()
 
     def generate_individual_racket_review(self) -> str:
         """Generate individual racket review content."""
         racket = random.choice(self.rackets)
+        self.post_info.setdefault('racket_ids', []).append(racket['id'])
         
         prompt = f"""
         Write a detailed, in-depth review of the {racket['name']} tennis racket.
         Include analysis of its performance characteristics, who it's best suited for, and how it compares to similar rackets.
-        Make it engaging and informative for tennis players looking to buy a new racket.
+        Write it for tennis players looking to buy a new racket.
         Include specific details about the racket's technology and performance.
         Keep it under 400 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=500)
-        
-        # Add technical specifications
-        content += f"\n\n## {racket['name']} - Technical Specifications\n\n"
-        content += f"- **Type:** {racket['type']}\n"
-        content += f"- **Weight:** {racket['weight']}g (unstrung)\n"
-        content += f"- **Head Size:** {racket['head_size']} in²\n"
-        content += f"- **Balance:** {racket['balance']} cm\n"
-        content += f"- **String Pattern:** {racket['string_pattern']}\n"
-        content += f"- **Best For:** {racket['best_for']}\n"
-        content += f"- **Standout Technology:** {racket['standout_tech']}\n"
-        content += f"- **Skill Level:** {racket['skill_level']}\n\n"
-        
-        # Add pros and cons
-        content += "## Pros and Cons\n\n"
-        content += "**Pros:**\n"
-        content += f"- Excellent {racket['best_for'].lower()} performance\n"
-        content += f"- Advanced {racket['standout_tech']} technology\n"
-        content += f"- Suitable for {racket['skill_level'].lower()} players\n"
-        content += "- Professional-grade construction\n\n"
-        
-        content += "**Cons:**\n"
-        content += "- Higher price point\n"
-        content += "- May require adjustment period\n"
-        content += "- Not suitable for complete beginners\n\n"
-        
-        # Add affiliate link
-        content += f"## Where to Buy\n\n"
-        content += f"Ready to try the {racket['name']}? **[Get it here with our affiliate link]({racket['affiliate_link']})** and support AcePlan while getting your new racket!\n\n"
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=500))
         
-        return content
+        # Add technical specifications, pros and cons, and the affiliate link
+        for fragment in ('specs', 'pros_cons', 'where_to_buy'):
+            self.fragments.render(fragment, racket, self.rackets.version, content.parts)
+        
+        return content.getvalue()
 
+    def generate_equipment_comparison_content(self) -> str:
+        """Generate a comparison of a racket and the rackets with the most similar specs."""
+        racket = random.choice(self.rackets)
+        rackets = [racket] + self.similar_rackets(racket, 2)
+        self.post_info.setdefault('racket_ids', []).extend(r['id'] for r in rackets)
+        
+        prompt = f"""
+        Write a comparison of these tennis rackets with similar specifications: {', '.join(r['name'] for r in rackets)}.
+        Explain how they differ in feel, power, control and spin, and which type of player each one suits best.
+        Keep it around 400 words.
+        """
+        
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=600))
+        
+        # Add the specification table
+        content.render(COMPARISON_HEADER)
+        self.fragments.render_each('comparison_row', rackets, self.rackets.version, content.parts)
+        
+        # Add affiliate links
+        content.write("\n## Where to Buy\n\n")
+        self.fragments.render_each('buy_link', rackets, self.rackets.version, content.parts)
+        
+        return content.getvalue()
+
+    @per_post_chat_session
     def generate_blog_post(self, theme: str = None) -> str:
         """Generate a complete blog post with the specified theme."""
         if theme is None:
             theme = random.choice(self.content_themes)
+        self.post_info = {'theme': theme, 'racket_ids': []}
         
         # Generate title and content based on theme
         if theme.startswith("top_10"):
@@ -332,6 +417,9 @@ class EnhancedTennisBlogGenerator:
         elif theme == "individual_racket_review":
             title = f"Complete Review: {random.choice(self.rackets)['name']} Tennis Racket"
             content = self.generate_individual_racket_review()
+        elif theme == "equipment_comparison":
+            title = self.get_title_for_theme(theme)
+            content = self.generate_equipment_comparison_content()
         else:
             title = self.get_title_for_theme(theme)
             content = self.generate_generic_content(theme)
@@ -340,35 +428,13 @@ class EnhancedTennisBlogGenerator:
         meta_description = self.generate_meta_description(title, content[:100])
         
         # Combine all sections
-        blog_post = f"""# {title}
-
-**Meta Description:** {meta_description}
-
----
-
-{content}
-
----
-
-## Conclusion
-
-Whether you're looking to improve your UTR rating, find the perfect racket, or enhance your tennis game, the right approach and equipment make all the difference. 
-
-For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.
-
-Our database includes detailed specifications, reviews, and affiliate links to help you make informed purchasing decisions while supporting our platform.
-
----
-
-**Keywords:** {', '.join(random.sample(self.seo_keywords, 6))}
-**Category:** Tennis Equipment & Training
-**Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Website:** https://aceplan.me
-**Database:** https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/edit?gid=0#gid=0
-**Racket Database:** 100+ tennis rackets with detailed specifications and affiliate links
-"""
-        
-        return blog_post
+        return POST_LAYOUT.render(
+            title=title,
+            meta_description=meta_description,
+            content=content,
+            keywords=random.sample(self.seo_keywords, 6),
+            generated=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
 
     def get_title_for_theme(self, theme: str) -> str:
         """Get appropriate title for content theme."""
@@ -387,9 +453,8 @@ Our database includes detailed specifications, reviews, and affiliate links to h
     def generate_generic_content(self, theme: str) -> str:
         """Generate generic content for other themes."""
         prompt = f"""
-        Write an engaging, informative blog post about {theme.replace('_', ' ')} in tennis.
-        Make it beginner-friendly but informative, include practical tips and advice.
-        Keep it around 400-500 words and make it SEO-optimized.
+        Write a blog post about {theme.replace('_', ' ')} in tennis.
+        Keep it around 400-500 words.
         """
         
         content = self.generate_with_gpt4all(prompt, max_tokens=600)
@@ -404,20 +469,64 @@ Our database includes detailed specifications, reviews, and affiliate links to h
         description = f"Discover {title.lower()}. {content_preview}... Learn tennis tips, equipment reviews, and training guides at AcePlan."
         return description[:160]
 
-    def save_post(self, content: str, filename: str = None) -> str:
+    def generate_unique_post(self, theme: str = None, themes: List[str] = None) -> str:
+        """
+        Generate a post whose body was not saved or published before.
+        
+        Exact duplicates (same body under any title) are regenerated up to
+        DEDUP_ATTEMPTS times; if every attempt is a duplicate, save_post
+        rejects the last one with DuplicatePostError. Each retry uses a theme
+        not tried yet: rankings and template fallbacks give the same body
+        again for the same theme.
+        
+        Args:
+            theme (str): Content theme (optional, random if not given)
+            themes (List[str]): Themes to retry with (default: all content themes)
+            
+        Returns:
+            str: Blog post content
+        """
+        self.content_hashes.index_posts(self.output_dir)
+        themes = themes or self.content_themes
+        theme = theme or random.choice(themes)
+        tried = []
+        for attempt in range(1, DEDUP_ATTEMPTS + 1):
+            content = self.generate_blog_post(theme)
+            if not self.content_hashes.contains(content):
+                break
+            print(f"Generated post duplicates an earlier post (attempt {attempt}/{DEDUP_ATTEMPTS})")
+            tried.append(theme)
+            theme = random.choice([t for t in themes if t not in tried] or themes)
+        return content
+
+    def save_post(self, content: str, filename: str = None, post_info: Dict[str, Any] = None) -> str:
         """Save the blog post to a file."""
         if filename is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"tennis_blog_post_{timestamp}.txt"
         
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"Blog post saved: {filepath}")
+        # Atomic background write; self.last_write resolves once the post is on disk
+        filepath, self.last_write = save_post_files(
+            self.post_writer, content, filename, self.output_dir, self.output_layout, self.output_formats,
+            post_info if post_info is not None else self.post_info, type(self).__name__,
+            self.manifest, self.content_hashes
+        )
         return filepath
 
+    def generate_streamed_post(self, theme: str = None, filename: str = None) -> str:
+        """
+        Generate and save a blog post, journaling each model section to
+        "<filename>.partial" as it streams (see gpt4all_runtime.stream_post).
+        
+        Args:
+            theme (str): Content theme (optional, random if not given)
+            filename (str): Custom filename (optional)
+            
+        Returns:
+            str: Path to saved file
+        """
+        return stream_post(self, lambda: self.generate_unique_post(theme), filename)
+
     def generate_scheduled_post(self, time_of_day: str) -> str:
         """Generate a post for a specific time of day with appropriate theme."""
         # Different themes for different times
@@ -426,13 +535,14 @@ Our database includes detailed specifications, reviews, and affiliate links to h
         evening_themes = ["player_success_story", "tennis_training_tips", "top_10_beginner_rackets"]
         
         if "morning" in time_of_day or "9am" in time_of_day:
-            theme = random.choice(morning_themes)
+            themes = morning_themes
         elif "afternoon" in time_of_day or "12pm" in time_of_day or "3pm" in time_of_day:
-            theme = random.choice(afternoon_themes)
+            themes = afternoon_themes
         else:  # evening
-            theme = random.choice(evening_themes)
+            themes = evening_themes
         
-        content = self.generate_blog_post(theme)
+        # Duplicates are retried with the slot's other themes
+        content = self.generate_unique_post(random.choice(themes), themes)
         
         # Create filename with time info
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -448,8 +558,8 @@ def main():
     print("Database: https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/edit?gid=0#gid=0")
     print()
     
-    # Initialize generator
-    generator = EnhancedTennisBlogGenerator()
+    # Initialize generator (the model loads in the background while the menu is shown)
+    generator = EnhancedTennisBlogGenerator(preload_model=True)
     
     # Menu for user interaction
     while True:
@@ -464,7 +574,7 @@ def main():
         choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == '1':
-            content = generator.generate_blog_post()
+            content = generator.generate_unique_post()
             generator.save_post(content)
             
         elif choice == '2':
@@ -482,8 +592,11 @@ def main():
                 if count > 0:
                     for i in range(count):
                         theme = random.choice(generator.content_themes)
-                        content = generator.generate_blog_post(theme)
-                        generator.save_post(content)
+                        content = generator.generate_unique_post(theme)
+                        try:
+                            generator.save_post(content)
+                        except DuplicatePostError as e:
+                            print(f"Skipping: {e}")
                         time.sleep(2)  # Small delay between posts
                 else:
                     print("Please enter a positive number.")
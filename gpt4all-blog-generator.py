@@ -22,51 +22,176 @@ Website: https://aceplan.me
 """
 
 import os
+import sys
+import re
 import json
 import random
 import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import time
 from pathlib import Path
 
-# GPT4All imports
-try:
-    from gpt4all import GPT4All
-    GPT4ALL_AVAILABLE = True
-except ImportError:
-    GPT4ALL_AVAILABLE = False
-    print("Warning: GPT4All not installed. Install with: pip install gpt4all")
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# GPT4All model handling shared by all generators
+from gpt4all_runtime import get_model_holder, generate_text, per_post_chat_session, stream_post, DeadlineExceeded, DEFAULT_SECTION_TIME_LIMIT
+from response_cache import get_response_cache
+from racket_similarity import SimilarityIndex
+from site_data import load_site_rackets, load_site_drills, TSParseError
+from post_templates import Template, PostBuffer
+from post_document import slugify
+from post_writer import get_post_writer, save_post_files
+from post_manifest import get_post_manifest
+from post_layout import DEFAULT_LAYOUT
+from post_dedup import DEDUP_ATTEMPTS, DuplicatePostError, get_content_store
+from batch_runner import BATCH_SEED_RANGE, generate_posts_parallel, recommended_worker_count
+
+# Sections of a post, in the order they appear, with their token budgets
+SECTION_ORDER = ["gear_highlight", "drill_advice", "player_story", "bonus"]
+SECTION_MAX_TOKENS = {
+    "gear_highlight": 300,
+    "drill_advice": 400,
+    "player_story": 500,
+    "bonus": 250
+}
+
+# Drill advice fragments
+DRILL_STEP = Template("{i}. {instruction}\n")
+DRILL_DETAILS = Template("\n**Focus Areas:** {drill[focus]|join}\n**Duration:** {drill[duration]} minutes\n")
+DRILL_BENEFITS = Template("**Benefits:** {drill[benefits]}")
+DRILL_VARIATIONS = Template("**Variations:** {drill[variations]|join}")
+DRILL_VIDEO = Template("\n\n[Watch the drill video]({drill[videoUrl]})")
+
+# Layout of a saved post, compiled once
+POST_LAYOUT = Template("""# {title}
+
+**Meta Description:** {meta_description}
+
+---
+
+## Gear Highlight: {racket[name]}
+
+{gear_highlight}
+
+---
+
+## Drill Advice: {drill[name]}
+
+{drill_advice}
+
+---
+
+## Player Story: {player_story[name]}'s Journey to UTR {player_story[current_utr]}
+
+{player_story_content}
+
+---
+
+## Bonus Section
+
+{new_section}
+
+---
+
+## Conclusion
+
+Whether you're just starting your tennis journey or looking to take your game to the next level, the right equipment, proper training, and dedication are key to success. The {racket[name]} offers excellent performance for {racket[level]|lower} players, while the {drill[name]} provides a solid foundation for improving your footwork.
+
+{player_story[name]}'s story demonstrates that with consistent practice and the right approach, significant improvement is achievable. Remember, every great tennis player started as a beginner.
+
+For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.
+
+---
+
+**Keywords:** {keywords|join}
+**Category:** Tennis Equipment & Training
+**Generated:** {generated}
+**Website:** https://aceplan.me
+**Racket Database:** 100+ tennis rackets with detailed specifications and reviews
+""")
+
+# Shortest text accepted as a real section in single-pass output
+MIN_SECTION_LENGTH = 80
+
+SECTION_MARKER = re.compile(r"^[ \t#*]*(" + "|".join(SECTION_ORDER) + r")[ \t#*:]*$", re.I | re.M)
+
+def parse_section_document(document: str) -> Dict[str, str]:
+    """
+    Split a single-pass model response into its sections.
+    
+    Only sections that appear once and have a reasonable length are
+    returned; anything else is left out so it can be regenerated.
+    
+    Args:
+        document (str): Model response with marker lines between sections
+        
+    Returns:
+        Dict[str, str]: Section key -> section text
+    """
+    markers = list(SECTION_MARKER.finditer(document))
+    keys = [match.group(1).lower() for match in markers]
+    
+    sections = {}
+    for i, match in enumerate(markers):
+        key = keys[i]
+        if keys.count(key) > 1:
+            continue
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(document)
+        text = document[match.end():end].strip()
+        if len(text) >= MIN_SECTION_LENGTH:
+            sections[key] = text
+    
+    return sections
 
 class TennisBlogGenerator:
-    def __init__(self, output_dir: str = "generated_posts", model_name: str = "orca-mini-3b-gguf2-q4_0.gguf"):
+    def __init__(self, output_dir: str = "generated_posts", model_name: str = "orca-mini-3b-gguf2-q4_0.gguf", preload_model: bool = False, single_pass: bool = False):
         """
         Initialize the blog post generator with GPT4All.
         
         Args:
             output_dir (str): Directory to save generated posts
             model_name (str): GPT4All model to use
+            preload_model (bool): Start loading the model in the background right away
+            single_pass (bool): Generate all post sections with one model call
         """
         self.output_dir = output_dir
+        # Formats written by save_post: 'txt' (Markdown), 'html', 'json'
+        self.output_formats = ('txt',)
+        # Where posts go inside output_dir: 'flat', 'date' (YYYY/MM/DD) or 'date_slot'
+        self.output_layout = DEFAULT_LAYOUT
+        # Atomic, batched writes off the generating thread (shared by the process)
+        self.post_writer = get_post_writer()
+        self.last_write = None
+        # Index of saved posts; post_info describes the post being generated
+        self.manifest = get_post_manifest()
+        self.post_info: Dict[str, Any] = {}
+        # Hashes of every saved or published post body; exact duplicates are not saved
+        self.content_hashes = get_content_store()
         self.model_name = model_name
-        self.model = None
+        self.single_pass = single_pass
+        self.model_holder = get_model_holder(model_name)
+        self.response_cache = get_response_cache()
+        self.stream_writer = None
+        self.last_stream_metrics = []
+        
+        # Per-section inference budget; None disables a limit
+        self.section_time_limit = DEFAULT_SECTION_TIME_LIMIT
+        self.section_token_limit = None
+        
+        # One chat session per post so the shared system preamble is evaluated once
+        self.use_chat_session = True
+        self.last_session_stats = {}
         self.ensure_output_directory()
         
-        # Initialize GPT4All model
-        if GPT4ALL_AVAILABLE:
-            try:
-                print(f"Loading GPT4All model: {model_name}")
-                self.model = GPT4All(model_name)
-                print("GPT4All model loaded successfully!")
-            except Exception as e:
-                print(f"Error loading GPT4All model: {e}")
-                print("Falling back to template-based generation")
-                self.model = None
-        else:
-            print("GPT4All not available, using template-based generation")
+        # The GPT4All model is loaded on first use (shared with other generators)
+        if preload_model:
+            self.model_holder.preload_async()
         
         # Load racket and drill data
         self.rackets = self.load_rackets()
         self.drills = self.load_drills()
+        self._racket_similarity = None
         
         # Player story templates
         self.player_stories = [
@@ -116,8 +241,16 @@ class TennisBlogGenerator:
             print(f"Created output directory: {self.output_dir}")
 
     def load_rackets(self) -> List[Dict]:
-        """Load racket data from the existing rackets.ts file."""
-        # This would normally parse the TypeScript file, but for now we'll use a subset
+        """Load racket data from the website's rackets.ts file (parsed once, then cached)."""
+        try:
+            return load_site_rackets()
+        except (OSError, TSParseError) as e:
+            print(f"Error loading rackets.ts: {e}")
+            print("Using fallback racket data...")
+            return self.get_fallback_rackets()
+
+    def get_fallback_rackets(self) -> List[Dict]:
+        """Fallback racket data when rackets.ts is unavailable."""
         return [
             {
                 "name": "Tecnifibre TFight 295",
@@ -182,7 +315,16 @@ class TennisBlogGenerator:
         ]
 
     def load_drills(self) -> List[Dict]:
-        """Load drill data from the existing drills.ts file."""
+        """Load drill data from the website's drills.ts file (parsed once, then cached)."""
+        try:
+            return load_site_drills()
+        except (OSError, TSParseError) as e:
+            print(f"Error loading drills.ts: {e}")
+            print("Using fallback drill data...")
+            return self.get_fallback_drills()
+
+    def get_fallback_drills(self) -> List[Dict]:
+        """Fallback drill data when drills.ts is unavailable."""
         return [
             {
                 "name": "Split-Step Footwork Drill",
@@ -238,24 +380,49 @@ class TennisBlogGenerator:
             }
         ]
 
-    def generate_with_gpt4all(self, prompt: str, max_tokens: int = 500) -> str:
+    @property
+    def racket_similarity(self) -> SimilarityIndex:
+        """Spec similarity index of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_similarity is None or self._racket_similarity.source is not self.rackets:
+            self._racket_similarity = SimilarityIndex.for_profiles(self.rackets)
+        return self._racket_similarity
+
+    def alternative_racket(self, racket: Dict) -> Dict:
+        """The racket with specs closest to the given one."""
+        similarity = self.racket_similarity
+        nearest = similarity.most_similar(similarity.position(racket['name']), 1)
+        return self.rackets[nearest[0]] if nearest else racket
+
+    @property
+    def model(self):
+        """The shared GPT4All model, or None if it is not loaded."""
+        return self.model_holder.model
+
+    def generate_with_gpt4all(self, prompt: str, max_tokens: int = 500, sections: int = 1) -> str:
         """
         Generate content using GPT4All model.
         
         Args:
             prompt (str): The prompt to generate content from
             max_tokens (int): Maximum number of tokens to generate
+            sections (int): Number of post sections the prompt asks for (scales the deadline)
             
         Returns:
             str: Generated content
         """
-        if self.model is None:
+        if not self.model_holder.is_available():
             return self.generate_fallback_content(prompt)
         
         try:
             # Generate content with GPT4All
-            response = self.model.generate(prompt, max_tokens=max_tokens, temp=0.7)
-            return response.strip()
+            return generate_text(
+                self.model_holder, prompt, max_tokens=max_tokens, temp=0.7,
+                cache=self.response_cache, writer=self.stream_writer,
+                time_limit=self.section_time_limit * sections if self.section_time_limit else None,
+                token_limit=self.section_token_limit * sections if self.section_token_limit else None
+            )
+        except DeadlineExceeded:
+            return self.generate_fallback_content(prompt)
         except Exception as e:
             print(f"Error generating with GPT4All: {e}")
             return self.generate_fallback_content(prompt)
@@ -277,51 +444,74 @@ class TennisBlogGenerator:
         description = f"Discover {title.lower()}. {content_preview[:100]}... Learn tennis tips, drills, and equipment recommendations at AcePlan."
         return description[:160]  # Keep under 160 characters for SEO
 
-    def generate_gear_highlight(self, racket: Dict) -> str:
-        """Generate gear highlight section for a specific racket."""
-        prompt = f"""
+    def gear_highlight_prompt(self, racket: Dict) -> str:
+        """Build the prompt for the gear highlight section."""
+        return f"""
         Write a detailed analysis of the {racket['name']} tennis racket. Explain why it's great for:
         1. Spin generation and control
         2. Power and shot depth
         3. Overall control and precision
         
         Include specific technical details about weight ({racket['weight']}), head size ({racket['headSize']}), and stiffness ({racket['stiffness']}).
-        Make it beginner-friendly but informative. Keep it under 200 words.
+        Keep it under 200 words.
+        """
+
+    def generate_gear_highlight(self, racket: Dict, body: str = None) -> str:
         """
+        Generate gear highlight section for a specific racket.
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=300)
+        Args:
+            racket (Dict): Racket to highlight
+            body (str): Already generated section text (optional)
+        """
+        if body is None:
+            body = self.generate_with_gpt4all(self.gear_highlight_prompt(racket), max_tokens=300)
+        content = body
         
         # Add internal link to AcePlan
         content += f"\n\nFor more detailed racket reviews and our complete 100-racket database, visit [AcePlan](https://aceplan.me) to find the perfect racket for your game."
         
         return content
 
-    def generate_drill_advice(self, drill: Dict) -> str:
-        """Generate step-by-step drill advice."""
-        prompt = f"""
+    def drill_advice_prompt(self, drill: Dict) -> str:
+        """Build the prompt for the drill advice section."""
+        return f"""
         Write a beginner-friendly explanation of the {drill['name']} tennis drill. 
         Explain why this drill is important for improving footwork and tennis performance.
         Provide clear, actionable steps that a beginner can follow.
         Include tips for proper form and common mistakes to avoid.
-        Keep it under 250 words and make it engaging.
+        Keep it under 250 words.
         """
+
+    def generate_drill_advice(self, drill: Dict, body: str = None) -> str:
+        """
+        Generate step-by-step drill advice.
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=400)
+        Args:
+            drill (Dict): Drill to explain
+            body (str): Already generated section text (optional)
+        """
+        if body is None:
+            body = self.generate_with_gpt4all(self.drill_advice_prompt(drill), max_tokens=400)
+        content = PostBuffer(body)
         
         # Add the detailed instructions
-        content += f"\n\n**Step-by-Step Instructions:**\n"
-        for i, instruction in enumerate(drill['instructions'], 1):
-            content += f"{i}. {instruction}\n"
-        
-        content += f"\n**Focus Areas:** {', '.join(drill['focus'])}\n"
-        content += f"**Duration:** {drill['duration']} minutes\n"
-        content += f"**Benefits:** {drill['benefits']}"
-        
-        return content
-
-    def generate_player_story(self, story: Dict) -> str:
-        """Generate player success story."""
-        prompt = f"""
+        content.write("\n\n**Step-by-Step Instructions:**\n")
+        content.render_each(DRILL_STEP, 'instruction', drill['instructions'])
+        
+        content.render(DRILL_DETAILS, drill=drill)
+        if drill.get('benefits'):
+            content.render(DRILL_BENEFITS, drill=drill)
+        elif drill.get('variations'):
+            content.render(DRILL_VARIATIONS, drill=drill)
+        if drill.get('videoUrl'):
+            content.render(DRILL_VIDEO, drill=drill)
+        
+        return content.getvalue()
+
+    def player_story_prompt(self, story: Dict) -> str:
+        """Build the prompt for the player story section."""
+        return f"""
         Write an inspiring story about {story['name']}, a {story['age']}-year-old tennis player from {story['location']} 
         who improved from UTR {story['starting_utr']} to UTR {story['current_utr']} in {story['timeframe']}.
         
@@ -331,16 +521,31 @@ class TennisBlogGenerator:
         Make it motivational and relatable for other young tennis players. Include specific details about their journey.
         Keep it under 300 words.
         """
+
+    def generate_player_story(self, story: Dict, body: str = None) -> str:
+        """
+        Generate player success story.
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=500)
+        Args:
+            story (Dict): Player story template
+            body (str): Already generated section text (optional)
+        """
+        if body is None:
+            body = self.generate_with_gpt4all(self.player_story_prompt(story), max_tokens=500)
+        content = body
         
         # Add AcePlan reference
         content += f"\n\n{story['name']}'s story shows that with the right training routine and dedication, significant improvement is possible. For personalized training plans and equipment recommendations, visit [AcePlan](https://aceplan.me)."
         
         return content
 
-    def generate_new_section(self) -> str:
-        """Generate bonus tip, drill, or racket recommendation."""
+    def new_section_prompt(self, racket: Dict = None) -> str:
+        """
+        Pick a bonus tip, related drill or racket recommendation and build its prompt.
+        
+        Args:
+            racket (Dict): Racket featured in the post; a recommendation suggests the most similar one (optional)
+        """
         section_types = ["bonus_tip", "related_drill", "racket_recommendation"]
         section_type = random.choice(section_types)
         
@@ -358,25 +563,81 @@ class TennisBlogGenerator:
             Keep it under 150 words.
             """
         else:  # racket_recommendation
-            racket = random.choice(self.rackets)
+            racket = self.alternative_racket(racket) if racket is not None else random.choice(self.rackets)
             prompt = f"""
             Write a brief recommendation for the {racket['name']} as an alternative or complementary racket choice.
             Explain why this racket might be suitable for different playing styles or skill levels.
             Keep it under 150 words.
             """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=250)
+        return prompt
+
+    def generate_new_section(self, prompt: str = None, body: str = None) -> str:
+        """
+        Generate bonus tip, drill, or racket recommendation.
+        
+        Args:
+            prompt (str): Prompt from new_section_prompt() (optional, picked at random)
+            body (str): Already generated section text (optional)
+        """
+        if body is None:
+            body = self.generate_with_gpt4all(prompt or self.new_section_prompt(), max_tokens=250)
+        content = body
         
         # Add AcePlan link
         content += f"\n\nFor more tennis tips, drills, and equipment reviews, explore our comprehensive resources at [AcePlan](https://aceplan.me)."
         
         return content
 
-    def generate_blog_post(self) -> str:
-        """Generate a complete blog post with all required sections."""
+    def generate_sections_single_pass(self, prompts: Dict[str, str]) -> Dict[str, str]:
+        """
+        Generate all post sections with one model call.
+        
+        The model is asked for one document with a marker line before each
+        section. Sections that are missing or too short are regenerated on
+        their own; the rest are used as they are.
+        
+        Args:
+            prompts (Dict[str, str]): Section key -> its individual prompt
+            
+        Returns:
+            Dict[str, str]: Section key -> generated text
+        """
+        instructions = "\n".join(
+            f"### {key.upper()}\n{' '.join(prompts[key].split())}" for key in SECTION_ORDER
+        )
+        prompt = f"""
+        Write the four sections of a tennis blog post described below.
+        Start each section with its marker line exactly as shown (for example "### GEAR_HIGHLIGHT"),
+        in the same order, and write nothing before the first marker.
+
+        {instructions}
+        """
+        
+        max_tokens = sum(SECTION_MAX_TOKENS.values())
+        document = self.generate_with_gpt4all(prompt, max_tokens=max_tokens, sections=len(SECTION_ORDER))
+        sections = parse_section_document(document)
+        
+        malformed = [key for key in SECTION_ORDER if key not in sections]
+        if malformed:
+            print(f"Single-pass generation: retrying {len(malformed)}/{len(SECTION_ORDER)} sections ({', '.join(malformed)})")
+            for key in malformed:
+                sections[key] = self.generate_with_gpt4all(prompts[key], max_tokens=SECTION_MAX_TOKENS[key])
+        
+        return sections
+
+    @per_post_chat_session
+    def generate_blog_post(self, racket: Dict = None) -> str:
+        """
+        Generate a complete blog post with all required sections.
+        
+        Args:
+            racket (Dict): Racket to feature (optional, random if not given)
+        """
         # Select random content
-        racket = random.choice(self.rackets)
-        drill = random.choice([d for d in self.drills if d['category'] == 'footwork'])
+        racket = racket or random.choice(self.rackets)
+        drill = random.choice([d for d in self.drills if d['category'] == 'footwork'] or self.drills)
+        self.post_info = {'theme': None, 'racket_ids': [racket.get('id') or slugify(racket['name'])]}
         player_story = random.choice(self.player_stories)
         
         # Generate title
@@ -393,68 +654,71 @@ class TennisBlogGenerator:
         meta_description = self.generate_meta_description(title, f"Learn about the {racket['name']} racket, essential footwork drills, and inspiring player success stories.")
         
         # Generate content sections
-        gear_highlight = self.generate_gear_highlight(racket)
-        drill_advice = self.generate_drill_advice(drill)
-        player_story_content = self.generate_player_story(player_story)
-        new_section = self.generate_new_section()
+        bonus_prompt = self.new_section_prompt(racket)
+        if self.single_pass and self.model_holder.is_available():
+            bodies = self.generate_sections_single_pass({
+                'gear_highlight': self.gear_highlight_prompt(racket),
+                'drill_advice': self.drill_advice_prompt(drill),
+                'player_story': self.player_story_prompt(player_story),
+                'bonus': bonus_prompt
+            })
+        else:
+            bodies = {}
+        
+        gear_highlight = self.generate_gear_highlight(racket, bodies.get('gear_highlight'))
+        drill_advice = self.generate_drill_advice(drill, bodies.get('drill_advice'))
+        player_story_content = self.generate_player_story(player_story, bodies.get('player_story'))
+        new_section = self.generate_new_section(bonus_prompt, bodies.get('bonus'))
         
         # Combine all sections
-        blog_post = f"""# {title}
-
-**Meta Description:** {meta_description}
-
----
-
-## Gear Highlight: {racket['name']}
-
-{gear_highlight}
-
----
-
-## Drill Advice: {drill['name']}
-
-{drill_advice}
-
----
-
-## Player Story: {player_story['name']}'s Journey to UTR {player_story['current_utr']}
-
-{player_story_content}
-
----
-
-## Bonus Section
-
-{new_section}
-
----
-
-## Conclusion
-
-Whether you're just starting your tennis journey or looking to take your game to the next level, the right equipment, proper training, and dedication are key to success. The {racket['name']} offers excellent performance for players seeking {racket['category']} characteristics, while the {drill['name']} provides a solid foundation for improving your footwork.
-
-{player_story['name']}'s story demonstrates that with consistent practice and the right approach, significant improvement is achievable. Remember, every great tennis player started as a beginner.
-
-For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.
-
----
-
-**Keywords:** {', '.join(random.sample(self.seo_keywords, 6))}
-**Category:** Tennis Equipment & Training
-**Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Website:** https://aceplan.me
-**Racket Database:** 100+ tennis rackets with detailed specifications and reviews
-"""
+        return POST_LAYOUT.render(
+            title=title,
+            meta_description=meta_description,
+            racket=racket,
+            drill=drill,
+            player_story=player_story,
+            gear_highlight=gear_highlight,
+            drill_advice=drill_advice,
+            player_story_content=player_story_content,
+            new_section=new_section,
+            keywords=random.sample(self.seo_keywords, 6),
+            generated=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+    def generate_unique_post(self) -> str:
+        """
+        Generate a post whose body was not saved or published before.
+        
+        Exact duplicates (same body under any title) are regenerated up to
+        DEDUP_ATTEMPTS times; if every attempt is a duplicate, save_post
+        rejects the last one with DuplicatePostError. Each retry features a
+        racket not tried yet: template fallbacks and cached responses give
+        the same body again for the same racket.
         
-        return blog_post
+        Returns:
+            str: Blog post content
+        """
+        self.content_hashes.index_posts(self.output_dir)
+        racket = None
+        tried = set()
+        for attempt in range(1, DEDUP_ATTEMPTS + 1):
+            content = self.generate_blog_post(racket)
+            if not self.content_hashes.contains(content):
+                break
+            print(f"Generated post duplicates an earlier post (attempt {attempt}/{DEDUP_ATTEMPTS})")
+            tried.update(self.post_info['racket_ids'])
+            untried = [r for r in self.rackets if (r.get('id') or slugify(r['name'])) not in tried]
+            racket = random.choice(untried or self.rackets)
+        return content
 
-    def save_post(self, content: str, filename: str = None) -> str:
+    def save_post(self, content: str, filename: str = None, post_info: Dict[str, Any] = None) -> str:
         """
         Save the blog post to a file.
         
         Args:
             content (str): Blog post content
             filename (str): Custom filename (optional)
+            post_info (Dict): Theme and racket ids of the post (default: the last post generated)
             
         Returns:
             str: Path to saved file
@@ -463,14 +727,27 @@ For more comprehensive tennis resources, equipment reviews, and training guides,
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"tennis_blog_post_{timestamp}.txt"
         
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"Blog post saved: {filepath}")
+        # Atomic background write; self.last_write resolves once the post is on disk
+        filepath, self.last_write = save_post_files(
+            self.post_writer, content, filename, self.output_dir, self.output_layout, self.output_formats,
+            post_info if post_info is not None else self.post_info, type(self).__name__,
+            self.manifest, self.content_hashes
+        )
         return filepath
 
+    def generate_streamed_post(self, filename: str = None) -> str:
+        """
+        Generate and save a blog post, journaling each model section to
+        "<filename>.partial" as it streams (see gpt4all_runtime.stream_post).
+        
+        Args:
+            filename (str): Custom filename (optional)
+            
+        Returns:
+            str: Path to saved file
+        """
+        return stream_post(self, self.generate_unique_post, filename)
+
     def generate_daily_post(self) -> str:
         """
         Generate and save a daily blog post.
@@ -481,7 +758,7 @@ For more comprehensive tennis resources, equipment reviews, and training guides,
         print("Generating daily tennis blog post with GPT4All...")
         
         # Generate the post
-        content = self.generate_blog_post()
+        content = self.generate_unique_post()
         
         # Create filename with date
         date_str = datetime.datetime.now().strftime("%Y%m%d")
@@ -493,36 +770,91 @@ For more comprehensive tennis resources, equipment reviews, and training guides,
         print(f"Daily post generated successfully: {filename}")
         return filepath
 
-    def generate_batch_posts(self, count: int = 5) -> List[str]:
+    def generate_seeded_post(self, seed: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Generate one batch post with a fixed seed.
+        
+        Args:
+            seed (int): Seed for the post's random choices
+            
+        Returns:
+            Tuple[str, Dict]: Post content and its post_info
+        """
+        # Seed only this post; callers' own use of random is left as it was
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            content = self.generate_unique_post()
+            post_info = dict(self.post_info)
+        finally:
+            random.setstate(state)
+        return content, post_info
+
+    def generate_batch_posts(self, count: int = 5, workers: int = 1, seed: Optional[int] = None) -> List[str]:
         """
         Generate multiple blog posts.
         
         Args:
             count (int): Number of posts to generate
+            workers (int): Worker processes to use (0 picks a count from RAM and cores)
+            seed (int): Base seed for reproducible batches (optional)
             
         Returns:
             List[str]: List of file paths for generated posts
         """
-        print(f"Generating {count} tennis blog posts with GPT4All...")
-        
-        filepaths = []
-        
-        for i in range(count):
-            print(f"Generating post {i+1}/{count}...")
+        if workers == 0:
+            workers = recommended_worker_count(self.model_name)
+        
+        print(f"Generating {count} tennis blog posts with GPT4All ({workers} worker(s))...")
+        
+        # One seed per post keeps a batch reproducible however it is split
+        if seed is None:
+            seed = random.randrange(BATCH_SEED_RANGE)
+        
+        # One timestamp per batch plus the post number keeps filenames unique
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        width = max(3, len(str(count)))
+        
+        saved = {}
+        pending = list(range(count))
+        for attempt in range(DEDUP_ATTEMPTS + 1):
+            if not pending:
+                break
+            if attempt:
+                print(f"Regenerating {len(pending)} post(s) that duplicate earlier posts...")
+            # Retry passes draw seeds above the range batch seeds come from, so they never repeat another batch's posts
+            seeds = [seed + attempt * BATCH_SEED_RANGE + i for i in pending]
             
-            # Generate the post
-            content = self.generate_blog_post()
+            # (content, post_info) per post, in seed order; each is saved as soon as it is generated
+            if workers > 1 and len(pending) > 1:
+                posts = generate_posts_parallel(
+                    os.path.abspath(__file__),
+                    type(self).__name__,
+                    seeds,
+                    workers,
+                    {'output_dir': self.output_dir, 'model_name': self.model_name, 'single_pass': self.single_pass}
+                )
+            else:
+                def generate_sequentially():
+                    for i, post_seed in zip(pending, seeds):
+                        print(f"Generating post {i + 1}/{count}...")
+                        yield self.generate_seeded_post(post_seed)
+                posts = generate_sequentially()
             
-            # Create filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tennis_blog_post_{timestamp}_{i+1}.txt"
-            
-            # Save the post
-            filepath = self.save_post(content, filename)
-            filepaths.append(filepath)
-            
-            # Small delay between posts
-            time.sleep(2)
+            # Posts generated at the same time in other workers are not checked against each other;
+            # collisions are regenerated in the next pass, once the pool has exited
+            collided = []
+            for i, (content, post_info) in zip(pending, posts):
+                filename = f"tennis_blog_post_{timestamp}_{i + 1:0{width}d}.txt"
+                try:
+                    saved[i] = self.save_post(content, filename, post_info)
+                except DuplicatePostError:
+                    collided.append(i)
+            pending = collided
+        
+        for i in pending:
+            print(f"Skipping post {i + 1}/{count}: still a duplicate after {DEDUP_ATTEMPTS} regenerations")
+        filepaths = [saved[i] for i in sorted(saved)]
         
         print(f"Batch generation completed: {len(filepaths)} posts generated")
         return filepaths
@@ -537,8 +869,8 @@ def main():
     print("Racket Database: 100+ tennis rackets")
     print()
     
-    # Initialize generator
-    generator = TennisBlogGenerator()
+    # Initialize generator (the model loads in the background while the menu is shown)
+    generator = TennisBlogGenerator(preload_model=True)
     
     # Menu for user interaction
     while True:
@@ -547,12 +879,13 @@ def main():
         print("2. Generate daily post")
         print("3. Generate batch of posts (5)")
         print("4. Generate custom number of posts")
-        print("5. Exit")
+        print("5. Generate custom number of posts in parallel")
+        print("6. Exit")
         
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == '1':
-            content = generator.generate_blog_post()
+            content = generator.generate_unique_post()
             generator.save_post(content)
             
         elif choice == '2':
@@ -572,6 +905,17 @@ def main():
                 print("Please enter a valid number.")
                 
         elif choice == '5':
+            try:
+                count = int(input("Enter number of posts to generate: "))
+                workers = int(input(f"Enter number of workers (0 = auto, recommended {recommended_worker_count(generator.model_name)}): "))
+                if count > 0 and workers >= 0:
+                    generator.generate_batch_posts(count, workers=workers)
+                else:
+                    print("Please enter a positive number.")
+            except ValueError:
+                print("Please enter a valid number.")
+                
+        elif choice == '6':
             print("Thank you for using AcePlan Tennis Blog Generator!")
             break
             
@@ -0,0 +1,783 @@
+#!/usr/bin/env python3
+"""
+AcePlan GPT4All Runtime
+=======================
+
+Shared GPT4All model handling for the AcePlan blog generators.
+
+Features:
+- One long-lived model holder per model name, shared by every generator in the process
+- Lazy, thread-safe model loading with optional background preload
+- Explicit reload and health-check hooks for long-running schedulers
+- Serialized access to the model so several jobs can share it safely
+- Streaming generation into a recoverable partial post file
+- Per-section time and token deadlines
+- Per-post chat sessions that evaluate the shared system preamble once
+- Per-host thread and batch-size settings from calibration.py
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import time
+import socket
+import logging
+import functools
+import contextlib
+import importlib.util
+import datetime
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
+
+from response_cache import atomic_write_json
+from post_dedup import DuplicatePostError
+
+# GPT4All is only imported when a model is actually loaded
+GPT4ALL_AVAILABLE = importlib.util.find_spec("gpt4all") is not None
+if not GPT4ALL_AVAILABLE:
+    print("Warning: GPT4All not installed. Install with: pip install gpt4all")
+
+DEFAULT_MODEL_NAME = "orca-mini-3b-gguf2-q4_0.gguf"
+
+# Longest a single section may spend generating before it is cut short
+DEFAULT_SECTION_TIME_LIMIT = 180.0
+
+# Best thread count and batch size per host and model, written by calibration.py
+CALIBRATION_FILE = os.path.join("blog_cache", "gpt4all_calibration.json")
+
+# Context window the models are loaded with (GPT4All default)
+DEFAULT_CONTEXT_TOKENS = 2048
+
+# Framing shared by every blog prompt, evaluated once per chat session
+BLOG_SYSTEM_PROMPT = (
+    "You are a writer for AcePlan (https://aceplan.me), a tennis equipment and training website. "
+    "Write engaging, informative, SEO-friendly content for beginner and intermediate tennis players, "
+    "with practical tips and a friendly tone. Stay within the length given in each request."
+)
+
+logger = logging.getLogger("aceplan.gpt4all")
+
+class DeadlineExceeded(Exception):
+    """Raised when a section hits its deadline without usable text."""
+
+class SectionDeadline:
+    def __init__(self, seconds: Optional[float] = None, max_tokens: Optional[int] = None):
+        """
+        Initialize a per-section inference budget.
+
+        Args:
+            seconds (float): Time allowed for the section (None for no limit)
+            max_tokens (int): Tokens allowed for the section (None for no limit)
+        """
+        self.seconds = seconds
+        self.max_tokens = max_tokens
+        self.start = time.monotonic()
+        self.tokens = 0
+        self.tripped = None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the budget, or None if there is no time limit."""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - (time.monotonic() - self.start))
+
+    def elapsed(self) -> float:
+        """Seconds since the budget started."""
+        return time.monotonic() - self.start
+
+    def begin(self):
+        """Restart the clock once the model is ready to generate."""
+        self.start = time.monotonic()
+
+    def callback(self, token_id: int, response: str) -> bool:
+        """GPT4All token callback that stops generation when the budget runs out."""
+        self.tokens += 1
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            self.tripped = 'tokens'
+            return False
+        if self.seconds is not None and self.elapsed() >= self.seconds:
+            self.tripped = 'time'
+            return False
+        return True
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); GPT4All does not expose its tokenizer."""
+    return (len(text) + 3) // 4 if text else 0
+
+class ChatSession:
+    def __init__(self, holder: 'ModelHolder', system_prompt: str, context_tokens: int = DEFAULT_CONTEXT_TOKENS):
+        """
+        Initialize a chat session that keeps the model's context between turns.
+
+        The system prompt is only evaluated when the session opens; later
+        turns reuse it from the model's context instead of sending it again.
+        The model-side session is opened lazily on the first real generation,
+        so posts served entirely from the response cache never load the model.
+
+        Args:
+            holder (ModelHolder): Holder of the model the session runs on
+            system_prompt (str): Preamble shared by every turn
+            context_tokens (int): Context window; the session restarts before overflowing it
+        """
+        self.holder = holder
+        self.system_prompt = system_prompt
+        self.context_tokens = context_tokens
+        self.preamble_tokens = estimate_tokens(system_prompt)
+        self.calls = 0
+        self.starts = 0
+        self.used_tokens = 0
+        self._session = None
+
+    def turn(self, prompt: str, max_tokens: int):
+        """
+        Prepare the model for one turn of the session.
+
+        Called by the holder with the model lock held. Opening the session
+        takes an extra hold on the lock so no other thread can interleave
+        turns into this session's context before it is closed.
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        if self._session is not None and self.used_tokens + prompt_tokens + max_tokens > self.context_tokens * 0.9:
+            self._close_model_session()
+
+        if self._session is None:
+            self.holder.lock.acquire()
+            self._session = self.holder.model.chat_session(self.system_prompt)
+            self._session.__enter__()
+            self.starts += 1
+            self.used_tokens = self.preamble_tokens
+
+        self.calls += 1
+        self.used_tokens += prompt_tokens
+
+    def add_response(self, text: str):
+        """Count a turn's response towards the session's context use."""
+        self.used_tokens += estimate_tokens(text)
+
+    def _close_model_session(self):
+        if self._session is None:
+            return
+        try:
+            self._session.__exit__(None, None, None)
+        finally:
+            self._session = None
+            self.holder.lock.release()
+
+    def close(self):
+        """End the session and release the model."""
+        self._close_model_session()
+
+    def stats(self) -> Dict[str, int]:
+        """Return turn counts and the prompt-eval tokens the session saved."""
+        return {
+            'calls': self.calls,
+            'session_starts': self.starts,
+            'preamble_tokens': self.preamble_tokens,
+            # Each turn after the first in a session skips re-evaluating the preamble
+            'prompt_tokens_saved': self.preamble_tokens * (self.calls - self.starts)
+        }
+
+def host_name() -> str:
+    """Name calibration results are stored under."""
+    return socket.gethostname() or "localhost"
+
+def load_calibration(model_name: str, path: str = CALIBRATION_FILE) -> Optional[Dict[str, Any]]:
+    """
+    Return this host's calibrated settings for a model.
+
+    Settings recorded with a different CPU count are ignored, since the
+    host (or its VM size) has changed since calibration.
+
+    Args:
+        model_name (str): GPT4All model the settings were measured with
+        path (str): Calibration file
+
+    Returns:
+        Dict: Settings with n_threads and n_batch, or None if not calibrated
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            settings = json.load(f).get(host_name(), {}).get(model_name)
+    except (OSError, ValueError):
+        return None
+
+    if not settings or settings.get('cpu_count') != os.cpu_count():
+        return None
+    return settings
+
+def save_calibration(model_name: str, settings: Dict[str, Any], path: str = CALIBRATION_FILE):
+    """Store this host's calibrated settings for a model, keeping other hosts' entries."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+
+    data.setdefault(host_name(), {})[model_name] = settings
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write_json(path, data)
+
+class ModelHolder:
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, n_threads: Optional[int] = None,
+                 n_batch: Optional[int] = None):
+        """
+        Initialize a holder for a single GPT4All model.
+
+        Settings left as None come from this host's calibration when the
+        model loads, or the GPT4All defaults if it was never calibrated.
+
+        Args:
+            model_name (str): GPT4All model to use
+            n_threads (int): CPU threads for the model (optional)
+            n_batch (int): Prompt tokens evaluated per batch (optional)
+        """
+        self.model_name = model_name
+        self.n_threads = n_threads
+        self.n_batch = n_batch
+        self.model = None
+        self.loaded_at = None
+        self.load_count = 0
+        self.last_error = None
+        self.load_failed = False
+        self.deadline_trips = {'time': 0, 'tokens': 0, 'busy': 0}
+        self.prompt_tokens_saved = 0
+        self.lock = threading.RLock()
+        self.local = threading.local()
+
+    def is_loaded(self) -> bool:
+        """Return True if the model is currently loaded."""
+        return self.model is not None
+
+    def is_available(self) -> bool:
+        """Return False if GPT4All is missing or the model failed to load."""
+        return GPT4ALL_AVAILABLE and not self.load_failed
+
+    def load(self) -> Optional[Any]:
+        """
+        Load the model if it is not loaded yet.
+
+        Safe to call from several threads; only the first call loads. A failed
+        load is not retried until reload() is called.
+
+        Returns:
+            The loaded GPT4All model, or None if it is unavailable
+        """
+        with self.lock:
+            if self.model is not None:
+                return self.model
+
+            if self.load_failed:
+                return None
+
+            if not GPT4ALL_AVAILABLE:
+                print("GPT4All not available, using template-based generation")
+                self.load_failed = True
+                return None
+
+            calibrated = load_calibration(self.model_name)
+            if calibrated:
+                if self.n_threads is None:
+                    self.n_threads = calibrated.get('n_threads')
+                if self.n_batch is None:
+                    self.n_batch = calibrated.get('n_batch')
+                print(f"Using calibrated settings: {self.n_threads} threads, batch size {self.n_batch}")
+
+            try:
+                print(f"Loading GPT4All model: {self.model_name}")
+                from gpt4all import GPT4All
+                self.model = GPT4All(self.model_name, n_threads=self.n_threads)
+                self.loaded_at = datetime.datetime.now()
+                self.load_count += 1
+                self.last_error = None
+                print("GPT4All model loaded successfully!")
+            except Exception as e:
+                print(f"Error loading GPT4All model: {e}")
+                print("Falling back to template-based generation")
+                self.model = None
+                self.last_error = str(e)
+                self.load_failed = True
+
+            return self.model
+
+    def preload_async(self) -> threading.Thread:
+        """
+        Start loading the model in a background thread.
+
+        Generation calls made while it loads simply wait for it.
+
+        Returns:
+            threading.Thread: The loader thread
+        """
+        thread = threading.Thread(target=self.load, name=f"preload-{self.model_name}", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self):
+        """Release the loaded model."""
+        with self.lock:
+            if self.model is not None:
+                close = getattr(self.model, "close", None)
+                if close is not None:
+                    try:
+                        close()
+                    except Exception as e:
+                        print(f"Error closing GPT4All model: {e}")
+            self.model = None
+            self.loaded_at = None
+
+    def reload(self) -> Optional[Any]:
+        """Drop the current model and load it again from disk."""
+        with self.lock:
+            self.unload()
+            self.load_failed = False
+            return self.load()
+
+    def set_threads(self, n_threads: int):
+        """Change the CPU thread count, applying it to the loaded model right away."""
+        with self.lock:
+            self.n_threads = n_threads
+            if self.model is not None:
+                self.model.model.set_thread_count(n_threads)
+
+    @contextlib.contextmanager
+    def chat_session(self, system_prompt: str = BLOG_SYSTEM_PROMPT) -> Iterator[ChatSession]:
+        """
+        Route this thread's generations through one chat session.
+
+        Args:
+            system_prompt (str): Preamble evaluated once for the session
+
+        Yields:
+            ChatSession: The session, for its stats()
+        """
+        previous = getattr(self.local, 'session', None)
+        session = ChatSession(self, system_prompt)
+        self.local.session = session
+        try:
+            yield session
+        finally:
+            self.local.session = previous
+            session.close()
+            self.prompt_tokens_saved += session.stats()['prompt_tokens_saved']
+
+    def active_system_prompt(self) -> str:
+        """System prompt of this thread's chat session, or "" outside a session."""
+        session = getattr(self.local, 'session', None)
+        return session.system_prompt if session is not None else ""
+
+    def _prepare(self, prompt: str, deadline: Optional[SectionDeadline], kwargs: Dict[str, Any]):
+        """Load the model, start the thread's session turn and arm the deadline.
+
+        Returns:
+            ChatSession: The thread's session, or None outside a session
+        """
+        if self.load() is None:
+            raise RuntimeError(f"GPT4All model not available: {self.model_name}")
+        session = getattr(self.local, 'session', None)
+        if session is not None:
+            session.turn(prompt, kwargs.get('max_tokens', 200))
+        if self.n_batch is not None:
+            kwargs.setdefault('n_batch', self.n_batch)
+        if deadline is not None:
+            deadline.begin()
+            kwargs['callback'] = deadline.callback
+        return session
+
+    def _acquire(self, deadline: Optional[SectionDeadline]):
+        """Take the model lock, giving up if the deadline passes first."""
+        timeout = deadline.remaining() if deadline is not None else None
+        if not self.lock.acquire(timeout=-1 if timeout is None else timeout):
+            deadline.tripped = 'busy'
+            raise DeadlineExceeded("model busy with another generation")
+
+    def generate(self, prompt: str, deadline: Optional[SectionDeadline] = None, **kwargs) -> str:
+        """
+        Run a generation on the held model.
+
+        Calls are serialized because a GPT4All model cannot run two
+        generations at the same time. The model is loaded on first use.
+
+        Args:
+            prompt (str): The prompt to generate content from
+            deadline (SectionDeadline): Budget that stops generation early (optional)
+            **kwargs: Extra arguments passed to GPT4All.generate
+
+        Returns:
+            str: Generated content
+        """
+        self._acquire(deadline)
+        try:
+            session = self._prepare(prompt, deadline, kwargs)
+            response = self.model.generate(prompt, **kwargs)
+            if session is not None:
+                session.add_response(response)
+            return response
+        finally:
+            self.lock.release()
+
+    def stream(self, prompt: str, deadline: Optional[SectionDeadline] = None, **kwargs) -> Iterator[str]:
+        """
+        Stream tokens from the held model as they are generated.
+
+        The model stays locked until the stream is exhausted or closed.
+
+        Args:
+            prompt (str): The prompt to generate content from
+            deadline (SectionDeadline): Budget that stops generation early (optional)
+            **kwargs: Extra arguments passed to GPT4All.generate
+
+        Yields:
+            str: Generated tokens
+        """
+        self._acquire(deadline)
+        try:
+            session = self._prepare(prompt, deadline, kwargs)
+            for token in self.model.generate(prompt, streaming=True, **kwargs):
+                if session is not None:
+                    session.add_response(token)
+                yield token
+        finally:
+            self.lock.release()
+
+    def health_check(self, prompt: str = "Reply with OK.", max_tokens: int = 4) -> bool:
+        """
+        Check that the model is loaded and can still generate.
+
+        Args:
+            prompt (str): Short prompt used for the probe generation
+            max_tokens (int): Token budget for the probe generation
+
+        Returns:
+            bool: True if the model answered, False otherwise
+        """
+        if self.model is None:
+            return False
+
+        try:
+            self.generate(prompt, max_tokens=max_tokens, temp=0.0)
+            return True
+        except Exception as e:
+            print(f"GPT4All health check failed: {e}")
+            self.last_error = str(e)
+            return False
+
+    def status(self) -> Dict[str, Any]:
+        """Return a summary of the holder state."""
+        return {
+            'model_name': self.model_name,
+            'loaded': self.is_loaded(),
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'n_threads': self.n_threads,
+            'n_batch': self.n_batch,
+            'load_count': self.load_count,
+            'last_error': self.last_error,
+            'deadline_trips': dict(self.deadline_trips),
+            'prompt_tokens_saved': self.prompt_tokens_saved
+        }
+
+_holders: Dict[str, ModelHolder] = {}
+_holders_lock = threading.Lock()
+
+def get_model_holder(model_name: str = DEFAULT_MODEL_NAME) -> ModelHolder:
+    """
+    Return the process-wide holder for a model name.
+
+    Every generator built in the same process shares the holder, so the
+    model is only loaded once no matter how many generators are created.
+
+    Args:
+        model_name (str): GPT4All model to use
+
+    Returns:
+        ModelHolder: Shared holder for the model
+    """
+    with _holders_lock:
+        holder = _holders.get(model_name)
+        if holder is None:
+            holder = ModelHolder(model_name)
+            _holders[model_name] = holder
+        return holder
+
+PARTIAL_SUFFIX = ".partial"
+# Section start/end comments StreamingPostWriter writes around each section
+JOURNAL_MARKER = re.compile(r"^<!-- section \d+[: ].*-->\n?", re.M)
+
+def section_label(prompt: str) -> str:
+    """Use the first line of a prompt as a short section label."""
+    for line in prompt.strip().splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return "section"
+
+class StreamingPostWriter:
+    def __init__(self, filepath: str):
+        """
+        Initialize a writer that journals generated sections as they stream.
+
+        Tokens are appended to "<filepath>.partial" as they arrive, so
+        progress can be followed with tail -f and an interrupted post can be
+        recovered with recover_partial_posts().
+
+        Args:
+            filepath (str): Final path of the post
+        """
+        self.filepath = filepath
+        self.partial_path = filepath + PARTIAL_SUFFIX
+        self.metrics: List[Dict[str, Any]] = []
+        self.file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def _write(self, text: str):
+        self.file.write(text)
+        self.file.flush()
+
+    def _begin_section(self, prompt: str):
+        self._write(f"\n<!-- section {len(self.metrics) + 1}: {section_label(prompt)} -->\n")
+
+    def _end_section(self, label: str, ttft: Optional[float], tokens: int, seconds: float):
+        self.metrics.append({
+            'section': label,
+            'ttft_seconds': round(ttft, 3) if ttft is not None else None,
+            'tokens': tokens,
+            'seconds': round(seconds, 3)
+        })
+        ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+        self._write(f"\n<!-- section {len(self.metrics)} complete: ttft {ttft_text}, {tokens} tokens, {seconds:.2f}s -->\n")
+
+    def write_section(self, prompt: str, text: str):
+        """Journal a section that did not need streaming (e.g. a cache hit)."""
+        self._begin_section(prompt)
+        self._write(text)
+        self._end_section(section_label(prompt), 0.0, 0, 0.0)
+
+    def stream_section(self, prompt: str, tokens: Iterable[str]) -> str:
+        """
+        Journal a section token by token and return its full text.
+
+        Args:
+            prompt (str): Prompt the section was generated from
+            tokens (Iterable[str]): Token stream from the model
+
+        Returns:
+            str: The complete section text
+        """
+        self._begin_section(prompt)
+        start = time.monotonic()
+        ttft = None
+        parts = []
+
+        for token in tokens:
+            if ttft is None:
+                ttft = time.monotonic() - start
+            parts.append(token)
+            self._write(token)
+
+        self._end_section(section_label(prompt), ttft, len(parts), time.monotonic() - start)
+        return "".join(parts)
+
+    def close(self):
+        """Close the journal but keep it on disk for recovery."""
+        if not self.file.closed:
+            self.file.close()
+
+    def finish(self):
+        """Drop the journal once the final post has been saved."""
+        self.close()
+        if os.path.exists(self.partial_path):
+            os.unlink(self.partial_path)
+
+def stream_post(generator, build: Callable[[], str], filename: str = None) -> str:
+    """
+    Generate and save a post, streaming each model section to disk.
+
+    Sections are journaled to "<filename>.partial" as tokens arrive, with
+    time-to-first-token recorded per section in generator.last_stream_metrics.
+    If generation is interrupted the journal stays on disk and can be
+    recovered with recover_partial_posts().
+
+    Args:
+        generator: Blog generator (output_dir, stream_writer, save_post, last_write)
+        build (Callable[[], str]): Generates the post content
+        filename (str): Custom filename (optional)
+
+    Returns:
+        str: Path to saved file
+    """
+    if filename is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"tennis_blog_post_{timestamp}.txt"
+
+    writer = StreamingPostWriter(os.path.join(generator.output_dir, filename))
+    generator.stream_writer = writer
+    try:
+        content = build()
+    finally:
+        generator.stream_writer = None
+        writer.close()
+
+    try:
+        filepath = generator.save_post(content, filename)
+    except DuplicatePostError:
+        # Nothing to recover: the post was rejected, not interrupted
+        writer.finish()
+        raise
+    # Keep the journal until the final post is on disk
+    generator.last_write.add_done_callback(lambda write: writer.finish() if write.exception() is None else None)
+
+    generator.last_stream_metrics = writer.metrics
+    for metric in writer.metrics:
+        ttft = f"{metric['ttft_seconds']:.2f}s" if metric['ttft_seconds'] is not None else "n/a"
+        print(f"  Section '{metric['section'][:40]}': first token {ttft}, {metric['tokens']} tokens in {metric['seconds']:.2f}s")
+
+    return filepath
+
+def recover_partial_posts(generator) -> List[str]:
+    """
+    Save the journals of interrupted posts as "<name>_recovered.txt".
+
+    Recovered posts go through the generator's save_post like any other
+    post (output layout, duplicate check, .html/.json exports, post
+    manifest), so retention and archiving see them. A journal is deleted
+    once its post is on disk, or right away if it is empty or a duplicate.
+
+    Args:
+        generator: Blog generator whose output_dir holds the journals
+
+    Returns:
+        List[str]: Paths of the recovered posts
+    """
+    output_dir = generator.output_dir
+    recovered = []
+    if not os.path.isdir(output_dir):
+        return recovered
+
+    for name in sorted(os.listdir(output_dir)):
+        if not name.endswith(PARTIAL_SUFFIX):
+            continue
+        partial_path = os.path.join(output_dir, name)
+        with open(partial_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = JOURNAL_MARKER.sub("", f.read()).strip()
+        base, ext = os.path.splitext(name[:-len(PARTIAL_SUFFIX)])
+        filename = f"{base}_recovered{ext or '.txt'}"
+
+        if not content:
+            print(f"Dropping empty partial post: {name}")
+            os.unlink(partial_path)
+            continue
+        try:
+            filepath = generator.save_post(content + "\n", filename)
+        except DuplicatePostError as e:
+            print(f"Dropping partial post: {e}")
+            os.unlink(partial_path)
+            continue
+
+        generator.last_write.add_done_callback(
+            lambda write, path=partial_path: os.unlink(path) if write.exception() is None and os.path.exists(path) else None
+        )
+        print(f"Recovered partial post: {filepath}")
+        recovered.append(filepath)
+
+    return recovered
+
+def trim_to_sentence(text: str) -> str:
+    """Cut text that stopped mid-sentence back to its last complete sentence."""
+    match = re.search(r"^(.*[.!?])[\"')\]]*(?=\s|$)", text.strip(), re.S)
+    return match.group(0).strip() if match else ""
+
+def record_deadline(holder: ModelHolder, deadline: SectionDeadline, prompt: str, used_partial: bool):
+    """Count and log a section that hit its deadline."""
+    holder.deadline_trips[deadline.tripped] = holder.deadline_trips.get(deadline.tripped, 0) + 1
+    outcome = "partial" if used_partial else "fallback"
+    elapsed = deadline.elapsed()
+    print(f"Section deadline hit ({deadline.tripped}) after {elapsed:.1f}s and {deadline.tokens} tokens, using {outcome} content")
+    logger.warning(
+        "metric=section_deadline reason=%s seconds=%.2f tokens=%d outcome=%s section=%r",
+        deadline.tripped, elapsed, deadline.tokens, outcome, section_label(prompt)
+    )
+
+def generate_text(holder: ModelHolder, prompt: str, max_tokens: int, temp: float,
+                  cache=None, writer: Optional[StreamingPostWriter] = None,
+                  time_limit: Optional[float] = None, token_limit: Optional[int] = None) -> str:
+    """
+    Generate text with the shared model, using the response cache and
+    streaming into a post journal when they are given.
+
+    If the section runs past time_limit seconds or token_limit tokens the
+    text generated so far is kept up to its last complete sentence; if
+    there is none, DeadlineExceeded is raised so the caller can use its
+    template fallback. Cut-short text is never cached.
+
+    Args:
+        holder (ModelHolder): Holder of the loaded model
+        prompt (str): The prompt to generate content from
+        max_tokens (int): Maximum number of tokens to generate
+        temp (float): Sampling temperature
+        cache: ResponseCache to consult and fill (optional)
+        writer (StreamingPostWriter): Journal to stream tokens into (optional)
+        time_limit (float): Seconds allowed for the section (optional)
+        token_limit (int): Tokens allowed for the section (optional)
+
+    Returns:
+        str: Generated content
+    """
+    system_prompt = holder.active_system_prompt()
+    if cache is not None:
+        cached = cache.get(holder.model_name, prompt, max_tokens, temp, system_prompt)
+        if cached is not None:
+            if writer is not None:
+                writer.write_section(prompt, cached)
+            return cached
+
+    deadline = None
+    if time_limit is not None or (token_limit is not None and token_limit < max_tokens):
+        deadline = SectionDeadline(time_limit, token_limit)
+
+    try:
+        if writer is not None:
+            tokens = holder.stream(prompt, deadline=deadline, max_tokens=max_tokens, temp=temp)
+            response = writer.stream_section(prompt, tokens).strip()
+        else:
+            response = holder.generate(prompt, deadline=deadline, max_tokens=max_tokens, temp=temp).strip()
+    except DeadlineExceeded:
+        record_deadline(holder, deadline, prompt, used_partial=False)
+        raise
+
+    if deadline is not None and deadline.tripped:
+        partial = trim_to_sentence(response)
+        record_deadline(holder, deadline, prompt, used_partial=bool(partial))
+        if not partial:
+            raise DeadlineExceeded(f"no complete sentence within the {deadline.tripped} budget")
+        return partial
+
+    if cache is not None:
+        cache.put(holder.model_name, prompt, max_tokens, temp, response, system_prompt)
+    return response
+
+def per_post_chat_session(method):
+    """
+    Run a generator's post-building method inside one chat session.
+
+    The generator needs model_holder and use_chat_session attributes; the
+    session's stats are stored on last_session_stats.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.use_chat_session or not self.model_holder.is_available():
+            return method(self, *args, **kwargs)
+
+        with self.model_holder.chat_session() as session:
+            result = method(self, *args, **kwargs)
+
+        self.last_session_stats = session.stats()
+        if session.calls:
+            print(f"Chat session: {session.calls} model calls, ~{self.last_session_stats['prompt_tokens_saved']} prompt-eval tokens saved")
+            logger.info(
+                "metric=chat_session calls=%d starts=%d preamble_tokens=%d prompt_tokens_saved=%d",
+                session.calls, session.starts, session.preamble_tokens, self.last_session_stats['prompt_tokens_saved']
+            )
+        return result
+
+    return wrapper
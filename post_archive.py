@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Archive
+====================
+
+Rotates aged posts into compressed per-month archives instead of deleting
+them, so the whole corpus is kept at a fraction of its size and inode count.
+
+Features:
+- One zip per month (posts-YYYY-MM.zip), each post compressed on its own,
+  so a single post is read without decompressing the archive
+- Every rotation writes a new part (posts-YYYY-MM-002.zip, ...) to a temp
+  file that is fsynced and renamed, so an existing archive is never
+  modified in place; compact() merges a month's parts the same way
+- index.json inside each archive lists its posts and their metadata, so
+  archives stay usable without the manifest
+- Post manifest records each post's archive and member for random access
+  by post id; originals are deleted only once their archive is on disk
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import json
+import datetime
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional
+
+from post_manifest import PostManifest
+from post_layout import companion_paths
+from response_cache import replacement_mode
+
+ARCHIVE_DIR_NAME = "archive"
+# Posts are compressed one by one; for files of a few KB DEFLATE beats LZMA
+ARCHIVE_COMPRESSION = zipfile.ZIP_DEFLATED
+ARCHIVE_COMPRESS_LEVEL = 9
+INDEX_MEMBER = "index.json"
+
+def archive_month(created_at: float) -> str:
+    """Month (YYYY-MM) a post is archived under."""
+    return datetime.datetime.fromtimestamp(created_at).strftime("%Y-%m")
+
+def archive_name(month: str, part: int = 1) -> str:
+    return f"posts-{month}.zip" if part == 1 else f"posts-{month}-{part:03d}.zip"
+
+def _fsync_directory(directory: str):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class PostArchive:
+    def __init__(self, archive_dir: str, manifest: PostManifest, compression: int = ARCHIVE_COMPRESSION):
+        """
+        Initialize the archive.
+
+        Args:
+            archive_dir (str): Directory holding the monthly archives
+            manifest (PostManifest): Manifest the archived posts are recorded in
+            compression (int): zipfile compression method for each post
+        """
+        self.archive_dir = archive_dir
+        self.manifest = manifest
+        self.compression = compression
+
+    def parts(self, month: str) -> List[str]:
+        """Archive files of a month, oldest part first."""
+        first = archive_name(month)
+        prefix = first[:-len(".zip")] + "-"
+        try:
+            names = os.listdir(self.archive_dir)
+        except OSError:
+            return []
+        parts = sorted(name for name in names if name.startswith(prefix) and name.endswith(".zip"))
+        if first in names:
+            parts.insert(0, first)
+        return [os.path.join(self.archive_dir, name) for name in parts]
+
+    def _next_part(self, month: str) -> str:
+        existing = {os.path.basename(path) for path in self.parts(month)}
+        part = 1
+        while archive_name(month, part) in existing:
+            part += 1
+        return os.path.join(self.archive_dir, archive_name(month, part))
+
+    def _write_zip(self, path: str, members: List[tuple], index: List[Dict[str, Any]]):
+        """Write an archive atomically: temp file, fsync, rename, fsync the directory."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.archive_dir, prefix=".tmp-", suffix=".zip")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                with zipfile.ZipFile(f, 'w', compression=self.compression, compresslevel=ARCHIVE_COMPRESS_LEVEL) as archive:
+                    for member, data in members:
+                        archive.writestr(member, data)
+                    archive.writestr(INDEX_MEMBER, json.dumps(index, indent=1), compress_type=zipfile.ZIP_DEFLATED)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, replacement_mode(path))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        _fsync_directory(self.archive_dir)
+
+    def archive(self, posts: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Move posts (manifest rows) into their months' archives.
+
+        Args:
+            posts (Iterable[Dict]): Posts from PostManifest.posts()
+
+        Returns:
+            List[str]: Paths of the post files that were archived and deleted
+        """
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for post in posts:
+            if post.get('archive'):
+                continue
+            by_month.setdefault(archive_month(post['created_at']), []).append(post)
+
+        deleted = []
+        for month, month_posts in sorted(by_month.items()):
+            members, index, locations, files, missing = [], [], {}, [], []
+            for post in month_posts:
+                paths = [post['path']] + companion_paths(post['path'])
+                try:
+                    contents = []
+                    for path in paths:
+                        with open(path, 'rb') as f:
+                            contents.append(f.read())
+                except FileNotFoundError:
+                    missing.append(post['path'])
+                    continue
+
+                member = f"{post['id']}/{os.path.basename(post['path'])}"
+                for path, data in zip(paths, contents):
+                    members.append((f"{post['id']}/{os.path.basename(path)}", data))
+                index.append({
+                    'id': post['id'],
+                    'member': member,
+                    'path': post['path'],
+                    'companions': [f"{post['id']}/{os.path.basename(path)}" for path in paths[1:]],
+                    'generator': post.get('generator'),
+                    'theme': post.get('theme'),
+                    'slot': post.get('slot'),
+                    'racket_ids': post.get('racket_ids', []),
+                    'content_hash': post.get('content_hash'),
+                    'size': post.get('size'),
+                    'created_at': post['created_at']
+                })
+                locations[post['id']] = member
+                files.extend(paths)
+
+            if missing:
+                self.manifest.remove(missing)
+            if not members:
+                continue
+
+            path = self._next_part(month)
+            self._write_zip(path, members, index)
+            self.manifest.mark_archived({post_id: (path, member) for post_id, member in locations.items()})
+
+            for file_path in files:
+                try:
+                    os.unlink(file_path)
+                except FileNotFoundError:
+                    pass
+            deleted.extend(entry['path'] for entry in index)
+            print(f"Archived {len(index)} posts to {path}")
+        return deleted
+
+    def read(self, post_id: int, extension: str = None) -> Optional[str]:
+        """
+        Text of an archived post (or of one of its companions) by post id.
+
+        Only the requested member is decompressed.
+
+        Args:
+            post_id (int): Manifest id of the post
+            extension (str): '.html' or '.json' for a companion file (default: the post)
+
+        Returns:
+            str: File content, or None if the post is not archived
+        """
+        post = self.manifest.post(post_id)
+        if post is None or not post['archive']:
+            return None
+        member = post['member']
+        if extension:
+            member = os.path.splitext(member)[0] + extension
+        with zipfile.ZipFile(post['archive']) as archive:
+            try:
+                return archive.read(member).decode('utf-8')
+            except KeyError:
+                return None
+
+    def index(self, archive_path: str) -> List[Dict[str, Any]]:
+        """Posts listed in an archive's own index."""
+        with zipfile.ZipFile(archive_path) as archive:
+            return json.loads(archive.read(INDEX_MEMBER))
+
+    def compact(self, month: str) -> Optional[str]:
+        """
+        Merge a month's archive parts into one archive.
+
+        The merged archive replaces the first part atomically; the manifest
+        is updated before the other parts are deleted.
+
+        Args:
+            month (str): Month (YYYY-MM)
+
+        Returns:
+            str: Path of the merged archive, or None if there was nothing to merge
+        """
+        parts = self.parts(month)
+        if len(parts) < 2:
+            return None
+
+        members, index = [], []
+        for part in parts:
+            with zipfile.ZipFile(part) as archive:
+                for info in archive.infolist():
+                    if info.filename != INDEX_MEMBER:
+                        members.append((info.filename, archive.read(info)))
+                index.extend(json.loads(archive.read(INDEX_MEMBER)))
+
+        target = os.path.join(self.archive_dir, archive_name(month))
+        self._write_zip(target, members, index)
+        self.manifest.mark_archived({entry['id']: (target, entry['member']) for entry in index})
+        for part in parts:
+            if os.path.abspath(part) != os.path.abspath(target):
+                os.unlink(part)
+        print(f"Compacted {len(parts)} parts of {month} into {target}")
+        return target
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Deduplication
+==========================
+
+Content-addressed check that stops the generators from saving or
+publishing a post whose body is identical to one already saved or
+published, e.g. the same fallback text under a different title.
+
+Features:
+- Body hash over the normalized post: title, metadata lines (keywords,
+  category, generated time, ...) and whitespace/case differences ignored
+- Persistent hash set in SQLite, mirrored in memory for O(1) checks; a miss
+  is confirmed with a primary-key lookup, so posts claimed by other
+  processes (batch workers, the publisher) are seen
+- Atomic claim, safe across threads and processes sharing the store
+- One-time backfill from data/published-articles/ and the output directory
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Set
+
+from post_document import parse_blocks
+
+DEFAULT_STORE_PATH = os.path.join("blog_cache", "content_hashes.sqlite3")
+PUBLISHED_ARTICLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "published-articles")
+
+# Times a generator regenerates a post whose body was already used
+DEDUP_ATTEMPTS = 3
+
+WHITESPACE = re.compile(r"\s+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS body_hashes (
+    hash BLOB PRIMARY KEY,
+    source TEXT,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dedup_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class DuplicatePostError(ValueError):
+    """Raised when a post's body was already saved or published."""
+
+def normalize_body(markdown: str) -> str:
+    """Post body without its title and metadata lines, lowercased with whitespace collapsed."""
+    lines = []
+    for block in parse_blocks(markdown):
+        if block['kind'] == 'metadata' or (block['kind'] == 'heading' and block['level'] == 1):
+            continue
+        lines.extend(block['lines'])
+    return WHITESPACE.sub(" ", " ".join(lines)).strip().lower()
+
+def body_hash(markdown: str) -> bytes:
+    return hashlib.blake2b(normalize_body(markdown).encode('utf-8'), digest_size=16).digest()
+
+class ContentHashStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Open (or create) the hash store.
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.hashes: Optional[Set[bytes]] = None
+        self.indexed: Set[str] = set()
+
+    def _load(self):
+        if self.hashes is None:
+            self.hashes = {row[0] for row in self.connection.execute("SELECT hash FROM body_hashes")}
+
+    def contains(self, markdown: str) -> bool:
+        """Whether a post with this body was already saved or published."""
+        digest = body_hash(markdown)
+        with self.lock:
+            self._load()
+            if digest in self.hashes:
+                return True
+            # Claimed by another process since the set was loaded
+            if self.connection.execute("SELECT 1 FROM body_hashes WHERE hash = ?", (digest,)).fetchone():
+                self.hashes.add(digest)
+                return True
+            return False
+
+    def claim(self, markdown: str, source: str = None) -> bool:
+        """
+        Record a post's body unless it is already known.
+
+        Args:
+            markdown (str): Post content
+            source (str): Where the post goes (path or URL), kept for reference
+
+        Returns:
+            bool: True if the body was new and is now claimed, False if it is a duplicate
+        """
+        digest = body_hash(markdown)
+        with self.lock:
+            self._load()
+            if digest in self.hashes:
+                return False
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO body_hashes (hash, source, created_at) VALUES (?, ?, ?)",
+                (digest, source, time.time())
+            )
+            self.hashes.add(digest)
+            # Another process may have claimed it since the set was loaded
+            return cursor.rowcount == 1
+
+    def release(self, markdown: str):
+        """Forget a claimed body, e.g. when its save or publish failed."""
+        digest = body_hash(markdown)
+        with self.lock:
+            self._load()
+            self.hashes.discard(digest)
+            self.connection.execute("DELETE FROM body_hashes WHERE hash = ?", (digest,))
+
+    def _index_once(self, key: str, texts) -> int:
+        with self.lock:
+            if key in self.indexed:
+                return 0
+            if self.connection.execute("SELECT 1 FROM dedup_meta WHERE key = ?", (key,)).fetchone():
+                self.indexed.add(key)
+                return 0
+
+        added = 0
+        for source, text in texts:
+            if text and self.claim(text, source):
+                added += 1
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO dedup_meta (key, value) VALUES (?, ?)",
+                (key, json.dumps({'at': time.time(), 'added': added}))
+            )
+            self.indexed.add(key)
+        return added
+
+    def index_published(self, directory: str = PUBLISHED_ARTICLES_DIR) -> int:
+        """Add the bodies of published articles (once per directory); returns the number added."""
+        def articles():
+            for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+                if not name.endswith('.json') or name == 'index.json':
+                    continue
+                try:
+                    with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                        article = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if isinstance(article, dict):
+                    yield os.path.join(directory, name), article.get('content', '')
+
+        return self._index_once(f"published:{os.path.abspath(directory)}", articles())
+
+    def index_posts(self, directory: str) -> int:
+        """Add the bodies of posts saved in an output directory (once per directory); returns the number added."""
+        def posts():
+            for root, _, names in os.walk(directory):
+                for name in sorted(names):
+                    if not name.endswith('.txt') or name.startswith('.'):
+                        continue
+                    try:
+                        with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                            yield os.path.join(root, name), f.read()
+                    except (OSError, UnicodeDecodeError):
+                        continue
+
+        return self._index_once(f"posts:{os.path.abspath(directory)}", posts())
+
+    def __len__(self) -> int:
+        with self.lock:
+            self._load()
+            return len(self.hashes)
+
+_store: Optional[ContentHashStore] = None
+_store_lock = threading.Lock()
+
+def get_content_store() -> ContentHashStore:
+    """Return the process-wide content hash store, backfilled from the published articles."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ContentHashStore()
+            _store.index_published()
+        return _store
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Documents
+======================
+
+Turns a generated post into every format the site needs in one pass:
+the Markdown text saved to generated_posts/, sanitized HTML and a JSON
+article document with the fields of the site's Article type. Publishing and
+static export use these instead of re-parsing the saved text.
+
+Features:
+- Block parser for the Markdown the generators write (ATX and underlined
+  headings, paragraphs, bullet/numbered lists, tables, rules)
+- One walk over the blocks emits Markdown, HTML and the article's
+  excerpt, headings and metadata together
+- HTML is built from escaped text only: raw HTML in model output is shown
+  as text and links are limited to http(s), mailto and site-relative URLs
+- Metadata lines (**Meta Description:**, **Keywords:**, **Category:**, ...)
+  become article fields
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import math
+import html
+from typing import Any, Dict, List
+
+from response_cache import atomic_write_json
+
+# Formats save_post can write next to each other (the .txt is the Markdown)
+OUTPUT_FORMATS = ('txt', 'html', 'json')
+
+# Same rules as the publish API (src/app/api/articles/publish/route.ts)
+EXCERPT_LENGTH = 150
+WORDS_PER_MINUTE = 200
+
+ATX_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+SETEXT_RULE = re.compile(r"^(=+|-+)\s*$")
+HORIZONTAL_RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})\s*$")
+BULLET_ITEM = re.compile(r"^\s*[-*+]\s+(.*)$")
+NUMBERED_ITEM = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+TABLE_ROW = re.compile(r"^\s*\|.*\|\s*$")
+TABLE_DIVIDER = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?\s*$")
+# Metadata lines, bold (**Keywords:** ...) or plain (Keywords: ...)
+METADATA_KEYS = ('Meta Description', 'Keywords', 'Category', 'Generated', 'Website', 'Database', 'Racket Database')
+METADATA_LINE = re.compile(r"^(?:\*\*)?(" + "|".join(METADATA_KEYS) + r"):(?:\*\*)?\s*(.*)$")
+# Metadata shown in the article page rather than only in its fields
+VISIBLE_METADATA = ('website', 'database', 'racket database')
+
+# Categories of the site's Article type
+ARTICLE_CATEGORIES = ('technique', 'equipment', 'fitness', 'strategy', 'news', 'tips')
+
+# Link URLs may contain one level of balanced parentheses (e.g. Wikipedia-style URLs)
+LINK_URL = r"(?:[^()\s]|\([^()\s]*\))+"
+LINK = re.compile(r"\[([^\]]+)\]\((" + LINK_URL + r")\)")
+BOLD = re.compile(r"\*\*(.+?)\*\*")
+ITALIC = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])")
+CODE = re.compile(r"`([^`]+)`")
+MARKUP = re.compile(r"\[([^\]]+)\]\((?:[^()]|\([^()]*\))*\)|[*_`#]")
+SAFE_URL = re.compile(r"^(?:https?://|mailto:|/|#)", re.I)
+
+def slugify(text: str) -> str:
+    """URL slug the same way the publish API builds it."""
+    slug = re.sub(r"[^a-z0-9\s-]", "", text.lower())
+    slug = re.sub(r"\s+", "-", slug)
+    return re.sub(r"-+", "-", slug).strip()
+
+def _inline_html(text: str) -> str:
+    """Escape text and convert inline Markdown (links, bold, italic, code)."""
+    links = []
+
+    def keep_link(match: re.Match) -> str:
+        url = match.group(2)
+        label = match.group(1)
+        if SAFE_URL.match(url):
+            links.append(f'<a href="{html.escape(url, quote=True)}">{_inline_html(label)}</a>')
+        else:
+            links.append(_inline_html(label))
+        return f"\x00{len(links) - 1}\x00"
+
+    text = LINK.sub(keep_link, text)
+    text = html.escape(text, quote=False)
+    text = CODE.sub(r"<code>\1</code>", text)
+    text = BOLD.sub(r"<strong>\1</strong>", text)
+    text = ITALIC.sub(r"<em>\1</em>", text)
+    return re.sub(r"\x00(\d+)\x00", lambda match: links[int(match.group(1))], text)
+
+def _plain(text: str) -> str:
+    """Text of inline Markdown without markup."""
+    return MARKUP.sub(lambda match: match.group(1) or "", text).strip()
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+def parse_blocks(markdown: str) -> List[Dict[str, Any]]:
+    """
+    Split a post into blocks.
+
+    Each block has a 'kind' (heading, paragraph, list, table, rule, metadata)
+    and its source 'lines'; headings carry 'level' and 'text', lists
+    'ordered' and 'items', tables 'rows', metadata 'key' and 'value'.
+
+    Args:
+        markdown (str): Post text
+
+    Returns:
+        List[Dict]: Blocks in document order
+    """
+    lines = markdown.split('\n')
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        following = lines[i + 1] if i + 1 < len(lines) else ""
+        heading = ATX_HEADING.match(line)
+        if heading:
+            blocks.append({'kind': 'heading', 'level': len(heading.group(1)), 'text': heading.group(2), 'lines': [line]})
+            i += 1
+        elif SETEXT_RULE.match(following) and not BULLET_ITEM.match(line) and not TABLE_ROW.match(line):
+            level = 1 if following.lstrip().startswith('=') else 2
+            blocks.append({'kind': 'heading', 'level': level, 'text': line.strip(), 'lines': [line, following]})
+            i += 2
+        elif HORIZONTAL_RULE.match(line):
+            blocks.append({'kind': 'rule', 'lines': [line]})
+            i += 1
+        elif TABLE_ROW.match(line) and TABLE_DIVIDER.match(following):
+            start = i
+            rows = [_table_cells(line)]
+            i += 2
+            while i < len(lines) and TABLE_ROW.match(lines[i]):
+                rows.append(_table_cells(lines[i]))
+                i += 1
+            blocks.append({'kind': 'table', 'rows': rows, 'lines': lines[start:i]})
+        elif BULLET_ITEM.match(line) or NUMBERED_ITEM.match(line):
+            ordered = NUMBERED_ITEM.match(line) is not None
+            item_pattern = NUMBERED_ITEM if ordered else BULLET_ITEM
+            start = i
+            items = []
+            while i < len(lines) and item_pattern.match(lines[i]):
+                items.append(item_pattern.match(lines[i]).group(1))
+                i += 1
+            blocks.append({'kind': 'list', 'ordered': ordered, 'items': items, 'lines': lines[start:i]})
+        elif METADATA_LINE.match(line):
+            match = METADATA_LINE.match(line)
+            blocks.append({'kind': 'metadata', 'key': match.group(1).strip().lower(), 'value': match.group(2).strip(), 'lines': [line]})
+            i += 1
+        else:
+            start = i
+            while (i < len(lines) and lines[i].strip() and not ATX_HEADING.match(lines[i])
+                   and not HORIZONTAL_RULE.match(lines[i]) and not METADATA_LINE.match(lines[i])
+                   and not (i + 1 < len(lines) and SETEXT_RULE.match(lines[i + 1]) and i > start)):
+                if i > start and (BULLET_ITEM.match(lines[i]) or NUMBERED_ITEM.match(lines[i])):
+                    break
+                i += 1
+            if i == start:
+                i += 1
+            blocks.append({'kind': 'paragraph', 'lines': lines[start:i]})
+    return blocks
+
+class RenderedPost:
+    """A post in all output formats."""
+
+    def __init__(self, markdown: str, html_text: str, document: Dict[str, Any]):
+        self.markdown = markdown
+        self.html = html_text
+        self.document = document
+
+    def to_json(self) -> str:
+        return json.dumps(self.document, ensure_ascii=False, indent=2)
+
+def render_post(markdown: str, title: str = None, category: str = None, tags: List[str] = None,
+                meta_description: str = None) -> RenderedPost:
+    """
+    Render a post as Markdown, HTML and a JSON article in one pass over its blocks.
+
+    Args:
+        markdown (str): Post text as generated
+        title (str): Title (default: the first level-1 heading)
+        category (str): Article category (default: the **Category:** line)
+        tags (List[str]): Tags (default: the **Keywords:** line)
+        meta_description (str): SEO description (default: the **Meta Description:** line)
+
+    Returns:
+        RenderedPost: Markdown (the text as given), HTML and article document
+    """
+    html_parts: List[str] = []
+    paragraphs: List[str] = []
+    headings: List[Dict[str, Any]] = []
+    metadata: Dict[str, str] = {}
+    anchors: Dict[str, int] = {}
+
+    for block in parse_blocks(markdown):
+        kind = block['kind']
+        if kind == 'heading':
+            text = block['text']
+            if title is None and block['level'] == 1:
+                title = _plain(text)
+            anchor = slugify(_plain(text)) or "section"
+            anchors[anchor] = anchors.get(anchor, 0) + 1
+            if anchors[anchor] > 1:
+                anchor = f"{anchor}-{anchors[anchor]}"
+            headings.append({'id': anchor, 'level': block['level'], 'text': _plain(text)})
+            html_parts.append(f'<h{block["level"]} id="{anchor}">{_inline_html(text)}</h{block["level"]}>\n')
+        elif kind == 'paragraph':
+            text = " ".join(line.strip() for line in block['lines'])
+            html_parts.append(f"<p>{_inline_html(text)}</p>\n")
+            paragraphs.append(_plain(text))
+        elif kind == 'list':
+            tag = 'ol' if block['ordered'] else 'ul'
+            items = "".join(f"<li>{_inline_html(item)}</li>" for item in block['items'])
+            html_parts.append(f"<{tag}>{items}</{tag}>\n")
+        elif kind == 'table':
+            header, *rows = block['rows']
+            head = "".join(f"<th>{_inline_html(cell)}</th>" for cell in header)
+            body = "".join("<tr>" + "".join(f"<td>{_inline_html(cell)}</td>" for cell in row) + "</tr>" for row in rows)
+            html_parts.append(f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>\n")
+        elif kind == 'rule':
+            html_parts.append("<hr>\n")
+        elif kind == 'metadata':
+            metadata[block['key']] = block['value']
+            if block['key'] in VISIBLE_METADATA:
+                html_parts.append(f"<p><strong>{html.escape(block['key'].title())}:</strong> {_inline_html(block['value'])}</p>\n")
+
+    title = title or "Untitled"
+    if meta_description is None:
+        meta_description = metadata.get('meta description')
+    if tags is None:
+        tags = [tag.strip() for tag in metadata.get('keywords', '').split(',') if tag.strip()]
+    if category is None:
+        category = metadata.get('category', '').lower()
+        category = category if category in ARTICLE_CATEGORIES else 'equipment'
+
+    text = " ".join(paragraph for paragraph in paragraphs if paragraph)
+    excerpt = meta_description or (text[:EXCERPT_LENGTH].strip() + "...")
+    words = len(markdown.split())
+
+    document = {
+        'title': title,
+        'slug': slugify(title),
+        'excerpt': excerpt,
+        'content': markdown,
+        'html': "".join(html_parts),
+        'category': category,
+        'tags': tags,
+        'readTime': max(1, math.ceil(words / WORDS_PER_MINUTE)),
+        'wordCount': words,
+        'seoTitle': title,
+        'seoDescription': meta_description or excerpt,
+        'headings': headings,
+        'author': 'AcePlan AI',
+        'status': 'draft'
+    }
+    return RenderedPost(markdown, document['html'], document)
+
+def write_post_formats(filepath: str, rendered: RenderedPost, formats=OUTPUT_FORMATS, writer=None) -> List[str]:
+    """
+    Write the HTML and JSON of a saved post next to its .txt file.
+
+    Args:
+        filepath (str): Path of the saved .txt post
+        rendered (RenderedPost): Rendered post
+        formats: Formats to write ('html', 'json'; 'txt' is written by save_post)
+        writer (PostWriter): Background writer to queue the files on (default: write them now)
+
+    Returns:
+        List[str]: Paths written (or queued)
+    """
+    base = os.path.splitext(filepath)[0]
+    paths = []
+    if 'html' in formats:
+        path = base + ".html"
+        if writer is not None:
+            writer.submit(path, rendered.html)
+        else:
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(rendered.html)
+            os.replace(tmp, path)
+        paths.append(path)
+    if 'json' in formats:
+        path = base + ".json"
+        if writer is not None:
+            writer.submit(path, json.dumps(rendered.document))
+        else:
+            atomic_write_json(path, rendered.document)
+        paths.append(path)
+    return paths
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Layout
+===================
+
+Where generated posts live inside the output directory. The default
+"flat" layout keeps every post directly in generated_posts/; the sharded
+layouts put each post in a year/month/day directory (optionally split by
+schedule slot), so listing, retention and backups only open the shards for
+the dates they need.
+
+Features:
+- Layouts: flat, date (YYYY/MM/DD) and date_slot (YYYY/MM/DD/<slot>)
+- Post dates from the timestamp in the filename, else the file's mtime
+- Shard lookups for a date range and direct lookup of a post by filename
+- Migration of existing posts (with their .html/.json companions) into a
+  layout, keeping the post manifest's paths in step
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import datetime
+from typing import Dict, Iterator, List, Optional
+
+from post_manifest import infer_slot
+
+LAYOUTS = ('flat', 'date', 'date_slot')
+DEFAULT_LAYOUT = 'flat'
+
+# Shard of posts whose filename names no slot
+OTHER_SLOT = 'other'
+
+# Timestamps the generators put in filenames: 20250907 or 20250907_231341
+FILENAME_DATE = re.compile(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?:_(\d{2})(\d{2})(\d{2}))?(?!\d)")
+
+# Formats written next to a post's .txt; they are moved, archived and deleted with it
+COMPANION_EXTENSIONS = ('.html', '.json')
+# Files that belong to a post: the .txt and the formats written next to it
+POST_EXTENSIONS = ('.txt',) + COMPANION_EXTENSIONS
+
+def companion_paths(path: str) -> List[str]:
+    """Companion files (.html/.json) of a post that exist on disk."""
+    stem, _ = os.path.splitext(path)
+    return [stem + ext for ext in COMPANION_EXTENSIONS if os.path.exists(stem + ext)]
+
+def post_date(filename: str) -> Optional[datetime.datetime]:
+    """Date (and time, if present) encoded in a post's filename."""
+    for match in FILENAME_DATE.finditer(os.path.basename(filename)):
+        try:
+            parts = [int(part) for part in match.groups() if part is not None]
+            return datetime.datetime(*parts)
+        except ValueError:
+            continue
+    return None
+
+def shard_dir(layout: str, when: datetime.date, slot: Optional[str] = None) -> str:
+    """
+    Directory of a post relative to the output directory ("" for the flat layout).
+
+    Args:
+        layout (str): One of LAYOUTS
+        when (datetime.date): Date of the post
+        slot (str): Schedule slot (date_slot layout only)
+
+    Returns:
+        str: Relative shard directory
+    """
+    if layout == 'flat':
+        return ""
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown output layout: {layout!r}")
+    parts = [f"{when.year:04d}", f"{when.month:02d}", f"{when.day:02d}"]
+    if layout == 'date_slot':
+        parts.append(slot or OTHER_SLOT)
+    return os.path.join(*parts)
+
+def post_path(output_dir: str, filename: str, layout: str = DEFAULT_LAYOUT,
+              when: datetime.datetime = None, slot: str = None) -> str:
+    """
+    Path a new post is saved to.
+
+    Args:
+        output_dir (str): Output directory
+        filename (str): Post filename
+        layout (str): One of LAYOUTS
+        when (datetime.datetime): Date of the post (default: from the filename, else now)
+        slot (str): Schedule slot (default: from the filename)
+
+    Returns:
+        str: Path of the post
+    """
+    if layout == 'flat':
+        return os.path.join(output_dir, filename)
+    when = when or post_date(filename) or datetime.datetime.now()
+    slot = slot if slot is not None else infer_slot(filename)
+    return os.path.join(output_dir, shard_dir(layout, when, slot), filename)
+
+def _numbered_dirs(path: str, low: int, high: int) -> List[str]:
+    """Subdirectories of path named by a number in [low, high], in order."""
+    try:
+        names = [entry.name for entry in os.scandir(path) if entry.is_dir() and entry.name.isdigit()]
+    except OSError:
+        return []
+    return [os.path.join(path, name) for name in sorted(names, key=int) if low <= int(name) <= high]
+
+def shard_dirs(output_dir: str, since: datetime.date = None, until: datetime.date = None) -> List[str]:
+    """
+    Day shards of a sharded output directory that fall in a date range.
+
+    Only the year and month directories overlapping the range are listed.
+
+    Args:
+        output_dir (str): Output directory
+        since (datetime.date): First day (inclusive, optional)
+        until (datetime.date): Last day (inclusive, optional)
+
+    Returns:
+        List[str]: Day directories, oldest first
+    """
+    since = since or datetime.date.min
+    until = until or datetime.date.max
+    days = []
+    for year_dir in _numbered_dirs(output_dir, since.year, until.year):
+        year = int(os.path.basename(year_dir))
+        first_month = since.month if year == since.year else 1
+        last_month = until.month if year == until.year else 12
+        for month_dir in _numbered_dirs(year_dir, first_month, last_month):
+            month = int(os.path.basename(month_dir))
+            first_day = since.day if (year, month) == (since.year, since.month) else 1
+            last_day = until.day if (year, month) == (until.year, until.month) else 31
+            days.extend(_numbered_dirs(month_dir, first_day, last_day))
+    return days
+
+def iter_posts(output_dir: str, since: datetime.date = None, until: datetime.date = None,
+               slot: str = None, extension: str = '.txt') -> Iterator[str]:
+    """
+    Post files of a sharded output directory in a date range (and slot).
+
+    Args:
+        output_dir (str): Output directory
+        since (datetime.date): First day (inclusive, optional)
+        until (datetime.date): Last day (inclusive, optional)
+        slot (str): Only this slot's shards (date_slot layout)
+        extension (str): File extension of posts
+
+    Returns:
+        Iterator[str]: Post paths
+    """
+    for day_dir in shard_dirs(output_dir, since, until):
+        for root, dirs, names in os.walk(day_dir):
+            if root == day_dir and slot is not None:
+                dirs[:] = [name for name in dirs if name == slot]
+            dirs.sort()
+            for name in sorted(names):
+                if name.endswith(extension) and not name.startswith('.'):
+                    yield os.path.join(root, name)
+
+def find_post(output_dir: str, filename: str) -> Optional[str]:
+    """
+    Locate a post by filename in any layout without scanning the output directory.
+
+    The shard is derived from the date in the filename; posts without one
+    are looked up in the flat layout only.
+
+    Args:
+        output_dir (str): Output directory
+        filename (str): Post filename
+
+    Returns:
+        str: Path of the post, or None if it is not found
+    """
+    candidates = [os.path.join(output_dir, filename)]
+    when = post_date(filename)
+    if when is not None:
+        candidates.append(os.path.join(output_dir, shard_dir('date', when), filename))
+        candidates.append(os.path.join(output_dir, shard_dir('date_slot', when, infer_slot(filename)), filename))
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+def remove_empty_shards(path: str, output_dir: str):
+    """Remove the shard directories above a deleted post that are now empty (never output_dir itself)."""
+    output_dir = os.path.abspath(output_dir)
+    directory = os.path.dirname(os.path.abspath(path))
+    while directory != output_dir and directory.startswith(output_dir + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
+
+def migrate_layout(output_dir: str, layout: str, manifest=None, dry_run: bool = False) -> Dict[str, str]:
+    """
+    Move existing posts into a layout.
+
+    Each post's date comes from its filename, or its mtime if the name has
+    none. Companion .html/.json files move with their .txt, and manifest
+    entries are updated to the new paths.
+
+    Args:
+        output_dir (str): Output directory
+        layout (str): Target layout (one of LAYOUTS)
+        manifest (PostManifest): Manifest to update (optional)
+        dry_run (bool): Only report the moves
+
+    Returns:
+        Dict[str, str]: Old path -> new path of every moved file
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown output layout: {layout!r}")
+
+    moves: Dict[str, str] = {}
+    for root, dirs, names in os.walk(output_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.startswith('.') or not name.endswith(POST_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            when = post_date(name)
+            if when is None:
+                try:
+                    when = datetime.datetime.fromtimestamp(os.stat(path).st_mtime)
+                except OSError:
+                    continue
+            target = post_path(output_dir, name, layout, when=when)
+            if os.path.abspath(target) != os.path.abspath(path):
+                moves[path] = target
+
+    if dry_run:
+        return moves
+
+    moved: Dict[str, str] = {}
+    for path, target in moves.items():
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            print(f"Skipping {path}: {target} already exists")
+            continue
+        os.replace(path, target)
+        remove_empty_shards(path, output_dir)
+        moved[path] = target
+
+    if manifest is not None:
+        manifest.move({path: target for path, target in moved.items() if path.endswith('.txt')})
+    return moved
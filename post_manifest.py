@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Manifest
+=====================
+
+SQLite index of every post the generators save, so cleanup, listing and
+"what did we post last week" queries are index lookups instead of globbing
+and stat-ing generated_posts/.
+
+Features:
+- One row per saved post: path, generator, theme, slot, content hash,
+  size and creation time, plus the ids of the rackets it features
+- Recorded by save_post once the background writer has the file in place,
+  so the manifest never lists a post that is not on disk
+- Indexed queries by time range, theme, slot and racket
+- One-time backfill of posts saved before the manifest existed
+- WAL journal, so readers (schedulers, CLI) do not block writers
+- Archive location (archive file and member) of posts rotated into
+  compressed archives by post_archive.py
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_MANIFEST_PATH = os.path.join("blog_cache", "post_manifest.sqlite3")
+
+# Slot a post was generated for, from the names the generators and schedulers use
+SLOT_NAME = re.compile(r"^(?:tennis_blog_)?(morning|afternoon|evening|daily|weekly|9am|12pm|3pm|5pm|7pm)_")
+SLOT_ALIASES = {'9am': 'morning', '12pm': 'afternoon', '3pm': 'afternoon', '5pm': 'evening', '7pm': 'evening'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    generator TEXT,
+    theme TEXT,
+    slot TEXT,
+    content_hash TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    archive TEXT,
+    member TEXT
+);
+CREATE INDEX IF NOT EXISTS posts_created ON posts (created_at);
+CREATE INDEX IF NOT EXISTS posts_theme ON posts (theme, created_at);
+CREATE INDEX IF NOT EXISTS posts_slot ON posts (slot, created_at);
+CREATE INDEX IF NOT EXISTS posts_hash ON posts (content_hash);
+CREATE TABLE IF NOT EXISTS post_rackets (
+    racket_id TEXT NOT NULL,
+    post_id INTEGER NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+    PRIMARY KEY (racket_id, post_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS post_rackets_post ON post_rackets (post_id);
+CREATE TABLE IF NOT EXISTS manifest_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+POST_COLUMNS = (
+    "posts.id, posts.path, posts.generator, posts.theme, posts.slot, posts.content_hash, posts.size, posts.created_at, "
+    "posts.archive, posts.member, "
+    "(SELECT group_concat(racket_id, char(31)) FROM post_rackets WHERE post_rackets.post_id = posts.id) AS racket_ids"
+)
+
+def infer_slot(filename: str) -> Optional[str]:
+    """Slot (morning, afternoon, evening, daily, weekly) encoded in a post's filename, if any."""
+    match = SLOT_NAME.match(os.path.basename(filename))
+    if match is None:
+        return None
+    return SLOT_ALIASES.get(match.group(1), match.group(1))
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class PostManifest:
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        """
+        Open (or create) the manifest database.
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        # Shared by the generating threads and the post writer's flush thread, under self.lock
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        # Manifests created before archiving existed lack the archive columns
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(posts)")}
+        for column in ('archive', 'member'):
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE posts ADD COLUMN {column} TEXT")
+
+    def _insert(self, path: str, digest: Optional[str], size: int, created_at: float, generator: Optional[str],
+                theme: Optional[str], slot: Optional[str], racket_ids: Iterable[str]):
+        self.connection.execute(
+            "INSERT INTO posts (path, generator, theme, slot, content_hash, size, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET generator = excluded.generator, theme = excluded.theme, "
+            "slot = excluded.slot, content_hash = excluded.content_hash, size = excluded.size, "
+            "created_at = excluded.created_at, archive = NULL, member = NULL",
+            (path, generator, theme, slot, digest, size, created_at)
+        )
+        post_id = self.connection.execute("SELECT id FROM posts WHERE path = ?", (path,)).fetchone()[0]
+        self.connection.execute("DELETE FROM post_rackets WHERE post_id = ?", (post_id,))
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO post_rackets (racket_id, post_id) VALUES (?, ?)",
+            [(str(racket_id), post_id) for racket_id in racket_ids if racket_id]
+        )
+
+    def record(self, path: str, content: bytes, theme: str = None, slot: str = None,
+               racket_ids: Iterable[str] = (), generator: str = None, created_at: float = None):
+        """
+        Add or update the entry of a saved post.
+
+        Args:
+            path (str): Path of the post file
+            content (bytes): Post content as written
+            theme (str): Content theme (optional)
+            slot (str): Schedule slot (default: from the filename)
+            racket_ids (Iterable[str]): Rackets featured in the post
+            generator (str): Name of the generator that wrote it (optional)
+            created_at (float): Unix time (default: now)
+        """
+        slot = slot if slot is not None else infer_slot(path)
+        created_at = time.time() if created_at is None else created_at
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                self._insert(os.path.abspath(path), content_hash(content), len(content), created_at,
+                             generator, theme, slot, list(racket_ids))
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def record_when_written(self, write: Future, path: str, content: str, **fields):
+        """
+        Record a post once its pending write (a PostWriter future) succeeds.
+
+        Args:
+            write (Future): Write of the post file
+            path (str): Path of the post file
+            content (str): Post content
+            **fields: theme, slot, racket_ids, generator (see record)
+        """
+        data = content.encode('utf-8')
+        fields.setdefault('created_at', time.time())
+
+        def on_written(done: Future):
+            if done.exception() is not None:
+                return
+            try:
+                self.record(path, data, **fields)
+            except sqlite3.Error as e:
+                print(f"Error recording {path} in the post manifest: {e}")
+
+        write.add_done_callback(on_written)
+
+    def remove(self, paths: Iterable[str]) -> int:
+        """Drop the entries of deleted posts; returns the number removed."""
+        rows = [(os.path.abspath(path),) for path in paths]
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                cursor = self.connection.executemany("DELETE FROM posts WHERE path = ?", rows)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def move(self, paths: Dict[str, str]) -> int:
+        """Update the paths of moved posts (old path -> new path); returns the number updated."""
+        rows = [(os.path.abspath(new), os.path.abspath(old)) for old, new in paths.items()]
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                cursor = self.connection.executemany("UPDATE posts SET path = ? WHERE path = ?", rows)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def posts(self, since: float = None, until: float = None, theme: str = None, slot: str = None,
+              racket_id: str = None, under: str = None, archived: bool = None, limit: int = None,
+              newest_first: bool = True) -> List[Dict[str, Any]]:
+        """
+        Posts matching the given filters.
+
+        Args:
+            since (float): Only posts created at or after this Unix time
+            until (float): Only posts created before this Unix time
+            theme (str): Only posts of this theme
+            slot (str): Only posts of this slot
+            racket_id (str): Only posts featuring this racket
+            under (str): Only posts whose path is inside this directory
+            archived (bool): Only archived (True) or only unarchived (False) posts
+            limit (int): Most posts to return
+            newest_first (bool): Order by creation time, newest first (else oldest first)
+
+        Returns:
+            List[Dict]: Posts (absolute paths) with their racket ids
+        """
+        tables = "posts"
+        clauses, params = [], []
+        if racket_id is not None:
+            tables = "post_rackets JOIN posts ON posts.id = post_rackets.post_id"
+            clauses.append("post_rackets.racket_id = ?")
+            params.append(racket_id)
+        for clause, value in (("posts.created_at >= ?", since), ("posts.created_at < ?", until),
+                              ("posts.theme = ?", theme), ("posts.slot = ?", slot)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if archived is not None:
+            clauses.append("posts.archive IS NOT NULL" if archived else "posts.archive IS NULL")
+        if under is not None:
+            prefix = os.path.join(os.path.abspath(under), "")
+            # Range scan on the path's unique index
+            clauses.append("posts.path >= ? AND posts.path < ?")
+            params.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+
+        query = f"SELECT {POST_COLUMNS} FROM {tables}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY posts.created_at {'DESC' if newest_first else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = [dict(row) for row in self.connection.execute(query, params)]
+        for row in rows:
+            row['racket_ids'] = row['racket_ids'].split('\x1f') if row['racket_ids'] else []
+        return rows
+
+    def mark_archived(self, locations: Dict[int, tuple]) -> int:
+        """
+        Record where posts were archived.
+
+        Args:
+            locations (Dict[int, tuple]): Post id -> (archive path, member name)
+
+        Returns:
+            int: Number of posts updated
+        """
+        rows = [(os.path.abspath(archive), member, post_id) for post_id, (archive, member) in locations.items()]
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                cursor = self.connection.executemany("UPDATE posts SET archive = ?, member = ? WHERE id = ?", rows)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def post(self, post_id: int) -> Optional[Dict[str, Any]]:
+        """A post by id, or None."""
+        with self.lock:
+            row = self.connection.execute(f"SELECT {POST_COLUMNS} FROM posts WHERE posts.id = ?", (post_id,)).fetchone()
+        if row is None:
+            return None
+        post = dict(row)
+        post['racket_ids'] = post['racket_ids'].split('\x1f') if post['racket_ids'] else []
+        return post
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def is_indexed(self, directory: str) -> bool:
+        """Whether posts saved in directory before the manifest existed have been added."""
+        key = f"indexed:{os.path.abspath(directory)}"
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM manifest_meta WHERE key = ?", (key,)).fetchone() is not None
+
+    def index_directory(self, directory: str, pattern: str = ".txt") -> int:
+        """
+        Add posts already on disk that are not in the manifest (one scan per directory).
+
+        Args:
+            directory (str): Output directory to scan, including subdirectories
+            pattern (str): File suffix of posts
+
+        Returns:
+            int: Number of posts added
+        """
+        added = 0
+        rows = []
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith(pattern) and not name.startswith('.'):
+                    rows.append(os.path.abspath(os.path.join(root, name)))
+
+        with self.lock:
+            known = {row[0] for row in self.connection.execute("SELECT path FROM posts")}
+            self.connection.execute("BEGIN")
+            try:
+                for path in rows:
+                    if path in known:
+                        continue
+                    try:
+                        with open(path, 'rb') as f:
+                            data = f.read()
+                        mtime = os.stat(path).st_mtime
+                    except OSError:
+                        continue
+                    self._insert(path, content_hash(data), len(data), mtime, None, None, infer_slot(path), ())
+                    added += 1
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO manifest_meta (key, value) VALUES (?, ?)",
+                    (f"indexed:{os.path.abspath(directory)}", json.dumps({'at': time.time(), 'added': added}))
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return added
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+_manifest: Optional[PostManifest] = None
+_manifest_lock = threading.Lock()
+
+def get_post_manifest() -> PostManifest:
+    """Return the process-wide post manifest."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = PostManifest()
+        return _manifest
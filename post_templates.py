@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Templates
+======================
+
+Small template engine shared by the blog generators. A layout is compiled
+once into literal text and field lookups, and rendering appends the pieces
+to a buffer that is joined a single time at the end, so a post costs time
+linear in its length however many list entries it has.
+
+Features:
+- str.format-style fields: {title}, {racket[name]}, {story.name}, {n:02d}
+- Filters after a bar: {racket[best_for]|lower}, {keywords|join}
+- Renders into a list, io.StringIO or any object with write()
+- render_each() for list sections (Top 10 entries, steps, table rows)
+- Shared racket fragments used by the enhanced and website generators
+- FragmentCache memoizing rendered racket fragments per racket and catalog
+  version, so a racket that recurs across a batch is rendered once
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import re
+import string
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+FILTERS: Dict[str, Callable[[Any], Any]] = {
+    'lower': lambda value: str(value).lower(),
+    'upper': lambda value: str(value).upper(),
+    'title': lambda value: str(value).title(),
+    'strip': lambda value: str(value).strip(),
+    'join': lambda value: ", ".join(str(item) for item in value),
+    'len': len
+}
+
+FIELD = re.compile(r"([A-Za-z_]\w*)((?:\[[^\]]+\]|\.[A-Za-z_]\w*)*)$")
+FIELD_PART = re.compile(r"\[([^\]]+)\]|\.([A-Za-z_]\w*)")
+
+class TemplateError(ValueError):
+    """Raised for a malformed template field."""
+
+def _compile_field(field: str, conversion: Optional[str], format_spec: str) -> Callable[[Dict[str, Any]], str]:
+    expression, *filters = [part.strip() for part in field.split('|')]
+    match = FIELD.match(expression)
+    if match is None:
+        raise TemplateError(f"bad template field: {{{field}}}")
+    for name in filters:
+        if name not in FILTERS:
+            raise TemplateError(f"unknown template filter: {name!r}")
+
+    name = match.group(1)
+    lookups = []
+    for item, attribute in FIELD_PART.findall(match.group(2)):
+        if item:
+            lookups.append((True, int(item) if item.isdigit() else item))
+        else:
+            lookups.append((False, attribute))
+    pipeline = [FILTERS[name] for name in filters]
+
+    def get(values: Dict[str, Any]) -> str:
+        value = values[name]
+        for is_item, key in lookups:
+            value = value[key] if is_item else getattr(value, key)
+        for apply in pipeline:
+            value = apply(value)
+        if conversion == 'r':
+            value = repr(value)
+        elif conversion == 's':
+            value = str(value)
+        if format_spec:
+            return format(value, format_spec)
+        return value if type(value) is str else str(value)
+
+    return get
+
+class Template:
+    def __init__(self, source: str):
+        """
+        Compile a template.
+
+        Args:
+            source (str): Template text; literal braces are written {{ and }}
+        """
+        self.source = source
+        self.parts: List[tuple] = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(source):
+            getter = _compile_field(field, conversion, format_spec) if field is not None else None
+            self.parts.append((literal, getter))
+
+    def render(self, values: Dict[str, Any] = None, out: Union[List[str], Any] = None, **fields) -> Optional[str]:
+        """
+        Render the template.
+
+        Args:
+            values (Dict): Field values
+            out (list or file-like): Buffer to append to; when omitted the text is returned
+            **fields: More field values
+
+        Returns:
+            str: Rendered text if no buffer was given, else None
+        """
+        if fields:
+            values = dict(values, **fields) if values else fields
+        buffer = [] if out is None else out
+        write = buffer.append if isinstance(buffer, list) else buffer.write
+        for literal, getter in self.parts:
+            if literal:
+                write(literal)
+            if getter is not None:
+                write(getter(values))
+        return "".join(buffer) if out is None else None
+
+    def render_each(self, name: str, items: Iterable[Any], out: Union[List[str], Any] = None,
+                    start: int = 1, **fields) -> Optional[str]:
+        """
+        Render the template once per item, with the item as field `name` and its position as {i}.
+
+        Args:
+            name (str): Field name of the item
+            items (Iterable): Items to render
+            out (list or file-like): Buffer to append to; when omitted the text is returned
+            start (int): Number of the first item
+            **fields: Field values shared by every item
+
+        Returns:
+            str: Rendered text if no buffer was given, else None
+        """
+        buffer = [] if out is None else out
+        values = dict(fields)
+        for i, item in enumerate(items, start):
+            values[name] = item
+            values['i'] = i
+            self.render(values, buffer)
+        return "".join(buffer) if out is None else None
+
+class PostBuffer:
+    """Collects the pieces of a post and joins them once."""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, text: str = ""):
+        self.parts: List[str] = [text] if text else []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def render(self, template: Template, values: Dict[str, Any] = None, **fields):
+        template.render(values, self.parts, **fields)
+
+    def render_each(self, template: Template, name: str, items: Iterable[Any], start: int = 1, **fields):
+        template.render_each(name, items, self.parts, start, **fields)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+# Racket fragments shared by the sheet-based generators (enhanced and website)
+
+TOP_10_HEADER = Template("\n\n## {title}\n\n")
+
+TOP_10_HEADING = Template("### {i}. {racket[name]}\n\n")
+
+# Per-racket part of a Top 10 entry (the numbered heading depends on the position)
+TOP_10_ENTRY = Template(
+    "**Type:** {racket[type]} | **Weight:** {racket[weight]}g | **Head Size:** {racket[head_size]} in²\n\n"
+    "**Best For:** {racket[best_for]}\n\n"
+    "**Standout Technology:** {racket[standout_tech]}\n\n"
+    "**Skill Level:** {racket[skill_level]}\n\n"
+    "**Why It's Great:** This racket excels in {racket[best_for]|lower} with its {racket[standout_tech]} technology, "
+    "making it perfect for players seeking {racket[type]|lower} characteristics.\n\n"
+    "**[Get the {racket[name]} here]({racket[affiliate_link]})**\n\n"
+    "---\n\n"
+)
+
+RACKET_SPECS = Template(
+    "\n\n## {racket[name]} - Technical Specifications\n\n"
+    "- **Type:** {racket[type]}\n"
+    "- **Weight:** {racket[weight]}g (unstrung)\n"
+    "- **Head Size:** {racket[head_size]} in²\n"
+    "- **Balance:** {racket[balance]} cm\n"
+    "- **String Pattern:** {racket[string_pattern]}\n"
+    "- **Best For:** {racket[best_for]}\n"
+    "- **Standout Technology:** {racket[standout_tech]}\n"
+    "- **Skill Level:** {racket[skill_level]}\n\n"
+)
+
+RACKET_PROS_CONS = Template(
+    "## Pros and Cons\n\n"
+    "**Pros:**\n"
+    "- Excellent {racket[best_for]|lower} performance\n"
+    "- Advanced {racket[standout_tech]} technology\n"
+    "- Suitable for {racket[skill_level]|lower} players\n"
+    "- Professional-grade construction\n\n"
+    "**Cons:**\n"
+    "- Higher price point\n"
+    "- May require adjustment period\n"
+    "- Not suitable for complete beginners\n\n"
+)
+
+RACKET_WHERE_TO_BUY = Template(
+    "## Where to Buy\n\n"
+    "Ready to try the {racket[name]}? **[Get it here with our affiliate link]({racket[affiliate_link]})** "
+    "and support AcePlan while getting your new racket!\n\n"
+)
+
+COMPARISON_HEADER = Template(
+    "\n\n## Specification Comparison\n\n"
+    "| Racket | Type | Weight | Head Size | Balance | String Pattern | Best For |\n"
+    "|---|---|---|---|---|---|---|\n"
+)
+
+COMPARISON_ROW = Template(
+    "| {racket[name]} | {racket[type]} | {racket[weight]}g | {racket[head_size]} in² | "
+    "{racket[balance]} cm | {racket[string_pattern]} | {racket[best_for]} |\n"
+)
+
+BUY_LINK = Template("- **[Get the {racket[name]} here]({racket[affiliate_link]})**\n")
+
+NUMBERED_SECTION = Template("### {i}. {item[title]}\n\n{item[description]}\n\n")
+
+# Fragment types a FragmentCache renders, by name
+RACKET_FRAGMENTS = {
+    'top_10_entry': TOP_10_ENTRY,
+    'specs': RACKET_SPECS,
+    'pros_cons': RACKET_PROS_CONS,
+    'where_to_buy': RACKET_WHERE_TO_BUY,
+    'comparison_row': COMPARISON_ROW,
+    'buy_link': BUY_LINK
+}
+
+# Catalog versions kept at once (e.g. the current snapshot and the fallback data)
+DEFAULT_FRAGMENT_VERSIONS = 2
+
+class FragmentCache:
+    def __init__(self, templates: Dict[str, Template] = None, max_versions: int = DEFAULT_FRAGMENT_VERSIONS):
+        """
+        Initialize the cache of rendered racket fragments.
+
+        Fragments are keyed by catalog version, fragment type and racket id,
+        so a new sheet snapshot (a new catalog version) never reuses text
+        rendered from the old one. Only the newest max_versions catalog
+        versions are kept.
+
+        Args:
+            templates (Dict[str, Template]): Fragment type -> template (default RACKET_FRAGMENTS)
+            max_versions (int): Catalog versions to keep fragments for
+        """
+        self.templates = dict(RACKET_FRAGMENTS if templates is None else templates)
+        self.max_versions = max_versions
+        self.lock = threading.Lock()
+        self.versions: "OrderedDict[str, Dict[tuple, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _fragments(self, version: str) -> Dict[tuple, str]:
+        with self.lock:
+            fragments = self.versions.get(version)
+            if fragments is None:
+                fragments = {}
+                self.versions[version] = fragments
+                while len(self.versions) > self.max_versions:
+                    self.versions.popitem(last=False)
+            else:
+                self.versions.move_to_end(version)
+            return fragments
+
+    def render(self, kind: str, racket, version: Optional[str], out: Union[List[str], Any] = None) -> str:
+        """
+        Rendered fragment of a racket, from the cache when possible.
+
+        Args:
+            kind (str): Fragment type (a key of the templates)
+            racket: Racket record or dict with the sheet's fields
+            version (str): Catalog version the racket comes from (None disables caching)
+            out (list or file-like): Buffer to append the fragment to (optional)
+
+        Returns:
+            str: Rendered fragment
+        """
+        if version is None:
+            text = self.templates[kind].render(racket=racket)
+        else:
+            fragments = self._fragments(version)
+            key = (kind, racket['id'], racket['name'])
+            text = fragments.get(key)
+            if text is None:
+                text = self.templates[kind].render(racket=racket)
+                fragments[key] = text
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if out is not None:
+            out.append(text) if isinstance(out, list) else out.write(text)
+        return text
+
+    def render_each(self, kind: str, rackets: Iterable[Any], version: Optional[str],
+                    out: Union[List[str], Any] = None, heading: Template = None, start: int = 1) -> Optional[str]:
+        """
+        Render a fragment per racket, optionally preceded by a numbered heading.
+
+        Args:
+            kind (str): Fragment type
+            rackets (Iterable): Rackets in display order
+            version (str): Catalog version the rackets come from
+            out (list or file-like): Buffer to append to; when omitted the text is returned
+            heading (Template): Template rendered before each fragment with {i} and {racket} (optional)
+            start (int): Number of the first racket
+
+        Returns:
+            str: Rendered text if no buffer was given, else None
+        """
+        buffer = [] if out is None else out
+        for i, racket in enumerate(rackets, start):
+            if heading is not None:
+                heading.render({'i': i, 'racket': racket}, buffer)
+            self.render(kind, racket, version, buffer)
+        return "".join(buffer) if out is None else None
+
+    def clear(self):
+        with self.lock:
+            self.versions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self.lock:
+            return {
+                'versions': list(self.versions),
+                'fragments': sum(len(fragments) for fragments in self.versions.values()),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+_fragment_cache: Optional[FragmentCache] = None
+_fragment_cache_lock = threading.Lock()
+
+def get_fragment_cache() -> FragmentCache:
+    """Return the process-wide racket fragment cache."""
+    global _fragment_cache
+    with _fragment_cache_lock:
+        if _fragment_cache is None:
+            _fragment_cache = FragmentCache()
+        return _fragment_cache
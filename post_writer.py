@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+AcePlan Post Writer
+===================
+
+Writes generated posts to disk from a background thread, so generation
+never waits on the file system and a crash never leaves a half-written
+post where the site or the schedulers can see it.
+
+Features:
+- Atomic writes: each post goes to a hidden temp file in the target
+  directory and is renamed over the final name once complete
+- Batched durability: the temp files of a batch are fsynced together,
+  renamed, then each directory is fsynced once
+- Bounded queue between generators and the flush thread, so a slow disk
+  applies back-pressure instead of buffering posts without limit
+- Futures for callers that need to know a post is on disk
+- Pending posts are flushed at interpreter exit
+- save_post_files(): the save path shared by the generators (layout,
+  duplicate check, .html/.json exports, post manifest)
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from response_cache import replacement_mode
+from post_document import render_post, write_post_formats
+from post_layout import DEFAULT_LAYOUT, post_path
+from post_dedup import DuplicatePostError
+
+# Posts waiting to be written before submit() blocks
+DEFAULT_MAX_PENDING = 256
+# Posts committed (fsynced and renamed) together
+DEFAULT_BATCH_SIZE = 64
+
+TEMP_SUFFIX = ".tmp"
+# Temp files older than this are left over from a crash, not a live writer
+STALE_TEMP_SECONDS = 3600
+
+logger = logging.getLogger("aceplan.writer")
+
+def temp_prefix(path: str) -> str:
+    """Prefix of the hidden temp files a post is staged in."""
+    return f".{os.path.basename(path)}."
+
+def remove_stale_temp_files(directory: str, max_age: float = STALE_TEMP_SECONDS) -> List[str]:
+    """
+    Delete temp files an interrupted writer left behind.
+
+    Args:
+        directory (str): Output directory
+        max_age (float): Only temp files at least this old (seconds) are removed
+
+    Returns:
+        List[str]: Paths removed
+    """
+    removed = []
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return removed
+
+    for entry in entries:
+        if not (entry.name.startswith('.') and entry.name.endswith(TEMP_SUFFIX)):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed.append(entry.path)
+        except OSError:
+            pass
+    return removed
+
+def _fsync_directory(directory: str):
+    """Persist renames in a directory (not supported on every platform)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class _Job:
+    __slots__ = ('path', 'data', 'future', 'fd', 'temp_path')
+
+    def __init__(self, path: str, data: bytes):
+        self.path = path
+        self.data = data
+        self.future: Future = Future()
+        self.fd: Optional[int] = None
+        self.temp_path: Optional[str] = None
+
+class PostWriter:
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, batch_size: int = DEFAULT_BATCH_SIZE,
+                 durable: bool = True):
+        """
+        Initialize the writer. The flush thread starts on the first submit.
+
+        Args:
+            max_pending (int): Queue capacity; submit() blocks while it is full
+            batch_size (int): Most posts committed per batch
+            durable (bool): fsync files and directories before reporting a post written
+        """
+        self.batch_size = max(1, batch_size)
+        self.durable = durable
+        self.queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=max(1, max_pending))
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.directories = set()
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="post-writer", daemon=True)
+                self.thread.start()
+
+    def submit(self, path: str, data: Union[str, bytes]) -> Future:
+        """
+        Queue a file to be written atomically.
+
+        Args:
+            path (str): Final path
+            data (str or bytes): File content (str is written as UTF-8)
+
+        Returns:
+            Future: Resolves to the path once the file is in place, or to the write error
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        job = _Job(path, data)
+        self._ensure_thread()
+        self.queue.put(job)
+        return job.future
+
+    def flush(self):
+        """Block until every post submitted so far is written."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Write everything pending and stop the flush thread."""
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None and thread.is_alive():
+            self.queue.put(None)
+            thread.join()
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            batch = [job]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    job = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+
+            try:
+                self._commit(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def _stage(self, job: _Job):
+        directory = os.path.dirname(job.path) or "."
+        if directory not in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            remove_stale_temp_files(directory)
+            self.directories.add(directory)
+        job.fd, job.temp_path = tempfile.mkstemp(dir=directory, prefix=temp_prefix(job.path), suffix=TEMP_SUFFIX)
+        # Posts are served by the web server: not the owner-only mode mkstemp uses
+        os.chmod(job.temp_path, replacement_mode(job.path))
+        view = memoryview(job.data)
+        while view:
+            view = view[os.write(job.fd, view):]
+
+    def _discard(self, job: _Job, error: Exception):
+        if job.fd is not None:
+            os.close(job.fd)
+            job.fd = None
+        if job.temp_path and os.path.exists(job.temp_path):
+            os.unlink(job.temp_path)
+        self.failed += 1
+        logger.error(f"Failed to write {job.path}: {error}")
+        job.future.set_exception(error)
+
+    def _commit(self, batch: List[_Job]):
+        """Stage every post of a batch, sync them together, then rename them into place."""
+        staged = []
+        for job in batch:
+            try:
+                self._stage(job)
+                staged.append(job)
+            except Exception as e:
+                self._discard(job, e)
+
+        if self.durable:
+            for job in list(staged):
+                try:
+                    os.fsync(job.fd)
+                except OSError as e:
+                    staged.remove(job)
+                    self._discard(job, e)
+
+        renamed = []
+        for job in staged:
+            try:
+                os.close(job.fd)
+                job.fd = None
+                os.replace(job.temp_path, job.path)
+                renamed.append(job)
+            except OSError as e:
+                self._discard(job, e)
+
+        if self.durable:
+            for directory in {os.path.dirname(job.path) or "." for job in renamed}:
+                _fsync_directory(directory)
+
+        self.batches += 1
+        self.written += len(renamed)
+        for job in renamed:
+            job.data = None
+            job.future.set_result(job.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return writer statistics."""
+        return {
+            'pending': self.queue.qsize(),
+            'written': self.written,
+            'failed': self.failed,
+            'batches': self.batches
+        }
+
+_writer: Optional[PostWriter] = None
+_writer_lock = threading.Lock()
+
+def get_post_writer() -> PostWriter:
+    """Return the process-wide post writer (flushed at interpreter exit)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PostWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+def save_post_files(writer: PostWriter, content: str, filename: str, output_dir: str,
+                    layout: str = DEFAULT_LAYOUT, formats=('txt',), post_info: Dict[str, Any] = None,
+                    generator: str = None, manifest=None, content_hashes=None) -> Tuple[str, Future]:
+    """
+    Save a generated post: the .txt through the writer, its .html/.json
+    exports, and its post manifest entry once it is on disk.
+
+    Args:
+        writer (PostWriter): Writer the files are submitted to
+        content (str): Post content (Markdown)
+        filename (str): Post filename
+        output_dir (str): Output directory
+        layout (str): Output layout ('flat', 'date', 'date_slot')
+        formats (tuple): Formats to write ('txt', 'html', 'json')
+        post_info (Dict): Theme and racket ids recorded in the manifest
+        generator (str): Name of the generator, recorded in the manifest
+        manifest (PostManifest): Manifest to record the post in (optional)
+        content_hashes (ContentHashStore): Store that rejects duplicate bodies (optional)
+
+    Returns:
+        Tuple[str, Future]: Path of the post, and its write (resolves once it is on disk)
+
+    Raises:
+        DuplicatePostError: The post's body was already saved or published
+    """
+    post_info = post_info or {}
+    filepath = post_path(output_dir, filename, layout)
+
+    if content_hashes is not None:
+        content_hashes.index_posts(output_dir)
+        if not content_hashes.claim(content, filepath):
+            raise DuplicatePostError(f"Post body duplicates an earlier post, not saved: {filename}")
+
+    write = writer.submit(filepath, content)
+    if content_hashes is not None:
+        # A post that never reached the disk does not count as saved
+        write.add_done_callback(lambda done: content_hashes.release(content) if done.exception() is not None else None)
+
+    # HTML and JSON are rendered from the same parse of the post
+    if any(fmt != 'txt' for fmt in formats):
+        write_post_formats(filepath, render_post(content), formats, writer)
+
+    if manifest is not None:
+        manifest.record_when_written(
+            write, filepath, content,
+            generator=generator,
+            theme=post_info.get('theme'),
+            racket_ids=post_info.get('racket_ids', ())
+        )
+
+    print(f"Blog post saved: {filepath}")
+    return filepath, write
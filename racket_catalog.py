@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+AcePlan Racket Catalog
+======================
+
+Compact, column-oriented store for the racket database used by the blog
+generators.
+
+Features:
+- Weight, head size and balance parsed once into float columns
+- String pattern parsed into main/cross string counts
+- Categorical fields (type, best for, skill level, ...) stored as interned
+  category codes
+- Attribute access on records (racket.weight -> 300.0) and dict-style access
+  with the sheet's original text (racket['weight'] -> '300')
+- Columnar views that can be handed to array code without copying
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import re
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# Fields parsed into float columns (NaN when the sheet has no number)
+NUMERIC_FIELDS = ('weight', 'head_size', 'balance')
+# Fields with few distinct values, stored as codes into a category list
+CATEGORICAL_FIELDS = ('type', 'best_for', 'skill_level', 'standout_tech', 'string_pattern')
+# Free-text fields, kept as plain lists
+TEXT_FIELDS = ('id', 'name', 'affiliate_link')
+
+FIELDS = ('id', 'name', 'type', 'weight', 'head_size', 'balance', 'string_pattern',
+          'best_for', 'standout_tech', 'skill_level', 'affiliate_link')
+
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+STRING_PATTERN = re.compile(r"(\d+)\s*[x×X]\s*(\d+)")
+
+def parse_number(text: str) -> float:
+    """Return the first number in a sheet cell, or NaN if there is none."""
+    match = NUMBER.search(text or "")
+    return float(match.group(0)) if match else float("nan")
+
+def parse_string_pattern(text: str) -> tuple:
+    """Return (mains, crosses) from a pattern like '16x19', or (0, 0) if unknown."""
+    match = STRING_PATTERN.search(text or "")
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+class RacketRecord:
+    """One racket in a RacketCatalog, read from the catalog's columns."""
+
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog: 'RacketCatalog', index: int):
+        self.catalog = catalog
+        self.index = index
+
+    def __getattr__(self, name: str):
+        try:
+            return self.catalog.value(name, self.index)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, field: str) -> str:
+        """Sheet text of a field, so records work where racket dicts are expected."""
+        return self.catalog.text(field, self.index)
+
+    def get(self, field: str, default: str = None) -> Optional[str]:
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self) -> tuple:
+        return FIELDS
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the racket as a plain dict of sheet text."""
+        return {field: self[field] for field in FIELDS}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RacketRecord) and other.catalog is self.catalog and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.catalog), self.index))
+
+    def __repr__(self) -> str:
+        return f"RacketRecord({self.index}, {self['name']!r})"
+
+class RacketCatalog(Sequence):
+    def __init__(self, rows: Iterable[Dict[str, str]], version: Optional[str] = None):
+        """
+        Build the catalog from racket dicts (as parsed from the sheet).
+
+        Args:
+            rows (Iterable[Dict]): Rackets with the sheet's text fields
+            version (str): Version of the data the catalog was built from (optional)
+        """
+        self.version = version
+        self.size = 0
+
+        self.numeric = {field: array('d') for field in NUMERIC_FIELDS}
+        self.numeric_text = {field: [] for field in NUMERIC_FIELDS}
+        self.string_mains = array('B')
+        self.string_crosses = array('B')
+
+        self.categories: Dict[str, List[str]] = {field: [] for field in CATEGORICAL_FIELDS}
+        self.codes = {field: array('H') for field in CATEGORICAL_FIELDS}
+        self._category_codes: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+
+        self.texts: Dict[str, List[str]] = {field: [] for field in TEXT_FIELDS}
+
+        for row in rows:
+            self._append(row)
+
+    def _append(self, row: Dict[str, str]):
+        for field in NUMERIC_FIELDS:
+            text = (row.get(field) or "").strip()
+            self.numeric[field].append(parse_number(text))
+            self.numeric_text[field].append(sys.intern(text))
+
+        mains, crosses = parse_string_pattern(row.get('string_pattern', ""))
+        self.string_mains.append(min(mains, 255))
+        self.string_crosses.append(min(crosses, 255))
+
+        for field in CATEGORICAL_FIELDS:
+            text = (row.get(field) or "").strip()
+            codes = self._category_codes[field]
+            code = codes.get(text)
+            if code is None:
+                code = len(self.categories[field])
+                codes[text] = code
+                self.categories[field].append(sys.intern(text))
+            self.codes[field].append(code)
+
+        for field in TEXT_FIELDS:
+            self.texts[field].append((row.get(field) or "").strip())
+
+        self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [RacketRecord(self, i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("racket index out of range")
+        return RacketRecord(self, index)
+
+    def __iter__(self) -> Iterator[RacketRecord]:
+        for i in range(self.size):
+            yield RacketRecord(self, i)
+
+    def value(self, field: str, index: int):
+        """Typed value of a field: float for specs, int for string counts, str otherwise."""
+        if field in self.numeric:
+            return self.numeric[field][index]
+        if field == 'string_mains':
+            return self.string_mains[index]
+        if field == 'string_crosses':
+            return self.string_crosses[index]
+        return self.text(field, index)
+
+    def text(self, field: str, index: int) -> str:
+        """Sheet text of a field."""
+        if field in self.codes:
+            return self.categories[field][self.codes[field][index]]
+        if field in self.texts:
+            return self.texts[field][index]
+        if field in self.numeric_text:
+            return self.numeric_text[field][index]
+        raise KeyError(field)
+
+    def column(self, field: str) -> array:
+        """
+        Columnar view of a field.
+
+        Numeric fields and string counts give their value array, categorical
+        fields their code array (see categories[field] for the labels). The
+        arrays support the buffer protocol, so numpy.frombuffer() can wrap
+        them without copying.
+        """
+        if field in self.numeric:
+            return self.numeric[field]
+        if field == 'string_mains':
+            return self.string_mains
+        if field == 'string_crosses':
+            return self.string_crosses
+        if field in self.codes:
+            return self.codes[field]
+        raise KeyError(field)
+
+    def values(self, field: str) -> List[str]:
+        """Sheet text of a field for every racket, in catalog order."""
+        return [self.text(field, i) for i in range(self.size)]
+
+    def select(self, indices: Iterable[int]) -> List[RacketRecord]:
+        """Records for a list of catalog indices."""
+        return [RacketRecord(self, i) for i in indices]
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Return every racket as a plain dict of sheet text."""
+        return [record.to_dict() for record in self]
+
+_catalogs: Dict[str, RacketCatalog] = {}
+
+def catalog_for_snapshot(rows: List[Dict[str, str]], version: Optional[str]) -> RacketCatalog:
+    """
+    Return the catalog for a snapshot version, building it only once.
+
+    Args:
+        rows (List[Dict]): Rackets of the snapshot
+        version (str): Snapshot version (None always builds a new catalog)
+
+    Returns:
+        RacketCatalog: Catalog shared by every generator using the snapshot
+    """
+    if version is None:
+        return RacketCatalog(rows)
+
+    catalog = _catalogs.get(version)
+    if catalog is None:
+        catalog = RacketCatalog(rows, version)
+        _catalogs.clear()
+        _catalogs[version] = catalog
+    return catalog
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+AcePlan Racket Attribute Index
+==============================
+
+Inverted index from racket attributes to catalog positions, used to pick
+the candidates for Top 10 posts without scanning every racket.
+
+Features:
+- Built once per RacketCatalog from its category codes
+- Normalized tokens per field ("best_for:spin") and across fields ("spin");
+  a query token also matches longer tokens containing it ("spin" matches
+  "Topspin"), like the substring checks it replaces
+- AND / OR / NOT queries with parentheses, e.g.
+  "best_for:spin OR type:power", "skill_level:intermediate AND type:control"
+- Posting lists stored as integer bitsets, so a query costs a few word-wise
+  AND/OR operations no matter how many rackets match
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import re
+from typing import Dict, List
+
+from racket_catalog import RacketCatalog, CATEGORICAL_FIELDS
+
+# Fields indexed for queries (string_pattern is matched through its parsed counts instead)
+INDEXED_FIELDS = ('type', 'best_for', 'skill_level', 'standout_tech')
+
+# Candidate queries for each Top 10 theme
+TOP_10_QUERIES = {
+    "spin": "best_for:spin OR type:power",
+    "control": "type:control OR best_for:precision",
+    "power": "type:power",
+    "beginner": "skill_level:intermediate"
+}
+
+TOKEN = re.compile(r"[a-z0-9]+")
+QUERY_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+
+class QueryError(ValueError):
+    """Raised for a malformed index query."""
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase a value and split it into alphanumeric tokens."""
+    return TOKEN.findall(text.lower())
+
+class RacketIndex:
+    def __init__(self, catalog: RacketCatalog):
+        """
+        Build the index for a catalog.
+
+        Each distinct category value is tokenized once; its racket bitset is
+        then added to the posting of every token it contains.
+
+        Args:
+            catalog (RacketCatalog): Catalog to index
+        """
+        self.catalog = catalog
+        self.all_bits = (1 << len(catalog)) - 1
+        self.postings: Dict[str, int] = {}
+        self.term_cache: Dict[str, int] = {}
+
+        for field in INDEXED_FIELDS:
+            if field not in CATEGORICAL_FIELDS:
+                continue
+            value_bits = [0] * len(catalog.categories[field])
+            for position, code in enumerate(catalog.column(field)):
+                value_bits[code] |= 1 << position
+
+            for value, bits in zip(catalog.categories[field], value_bits):
+                for token in set(normalize_tokens(value)):
+                    for key in (f"{field}:{token}", token):
+                        self.postings[key] = self.postings.get(key, 0) | bits
+
+    def term(self, term: str) -> int:
+        """Bitset of rackets matching one "field:token" or "token" term."""
+        field, _, token = term.lower().rpartition(":")
+        tokens = normalize_tokens(token)
+        if not tokens:
+            raise QueryError(f"empty query term: {term!r}")
+        if field and field not in INDEXED_FIELDS:
+            raise QueryError(f"field is not indexed: {field!r}")
+
+        bits = self.all_bits
+        for part in tokens:
+            bits &= self.token_bits(f"{field}:{part}" if field else part)
+        return bits
+
+    def token_bits(self, key: str) -> int:
+        """
+        Bitset for a posting key, including keys whose token contains it.
+
+        The expansion scans the distinct tokens (not the rackets) once per
+        key and is cached, so repeated queries are plain lookups.
+        """
+        bits = self.term_cache.get(key)
+        if bits is None:
+            field, _, token = key.rpartition(":")
+            bits = 0
+            for other, other_bits in self.postings.items():
+                other_field, _, other_token = other.rpartition(":")
+                if other_field == field and token in other_token:
+                    bits |= other_bits
+            self.term_cache[key] = bits
+        return bits
+
+    def query_bits(self, query: str) -> int:
+        """
+        Evaluate a query to a bitset of catalog positions.
+
+        Grammar: OR of AND-groups of (optionally NOT-ed) terms or
+        parenthesized queries; AND binds tighter than OR.
+        """
+        tokens = QUERY_TOKEN.findall(query)
+        position = 0
+
+        def peek() -> str:
+            return tokens[position].upper() if position < len(tokens) else ""
+
+        def parse_or() -> int:
+            nonlocal position
+            bits = parse_and()
+            while peek() == "OR":
+                position += 1
+                bits |= parse_and()
+            return bits
+
+        def parse_and() -> int:
+            nonlocal position
+            bits = parse_not()
+            while peek() == "AND":
+                position += 1
+                bits &= parse_not()
+            return bits
+
+        def parse_not() -> int:
+            nonlocal position
+            if peek() == "NOT":
+                position += 1
+                return self.all_bits & ~parse_not()
+            if peek() == "(":
+                position += 1
+                bits = parse_or()
+                if peek() != ")":
+                    raise QueryError(f"missing ')' in query: {query!r}")
+                position += 1
+                return bits
+            if peek() in ("", ")", "AND", "OR"):
+                raise QueryError(f"expected a term in query: {query!r}")
+            term = tokens[position]
+            position += 1
+            return self.term(term)
+
+        bits = parse_or()
+        if position != len(tokens):
+            raise QueryError(f"unexpected {tokens[position]!r} in query: {query!r}")
+        return bits
+
+    def query(self, query: str, limit: int = None) -> List[int]:
+        """Catalog positions matching a query, in catalog (sheet) order (at most limit)."""
+        bits = self.query_bits(query)
+        positions = []
+        while bits and (limit is None or len(positions) < limit):
+            low = bits & -bits
+            positions.append(low.bit_length() - 1)
+            bits ^= low
+        return positions
+
+    def count(self, query: str) -> int:
+        """Number of rackets matching a query."""
+        return bin(self.query_bits(query)).count("1")
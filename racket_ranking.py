@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+AcePlan Racket Ranking
+======================
+
+Ranks the racket catalog per Top 10 theme from numeric specs, so a Top 10
+post lists the rackets that best fit the theme instead of the first ten
+matches in sheet order.
+
+Features:
+- Feature matrix (head size, weight, balance, string-pattern openness)
+  standardized once per catalog
+- Per-theme weights (spin, control, power, beginner) that can be overridden
+- Attribute bonuses from index queries, e.g. best_for:spin
+- Top-k selection with numpy.argpartition, sorting only the k winners
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from racket_catalog import RacketCatalog
+from racket_index import RacketIndex
+
+FEATURES = ('head_size', 'weight', 'balance', 'string_openness')
+
+# Feature weights per theme (features are z-scores across the catalog) and
+# score bonuses for rackets matching an index query
+THEME_WEIGHTS = {
+    "spin": {
+        'features': {'string_openness': 1.0, 'head_size': 0.5, 'weight': -0.25},
+        'bonus': {"best_for:spin": 1.0, "type:power": 0.5}
+    },
+    "control": {
+        'features': {'string_openness': -1.0, 'head_size': -1.0, 'weight': 0.5, 'balance': -0.5},
+        'bonus': {"type:control": 1.0, "best_for:precision": 1.0}
+    },
+    "power": {
+        'features': {'head_size': 1.0, 'balance': 0.5, 'weight': -0.25},
+        'bonus': {"type:power": 1.0, "best_for:power": 0.5}
+    },
+    "beginner": {
+        'features': {'weight': -1.0, 'head_size': 1.0},
+        'bonus': {"skill_level:beginner": 1.0, "skill_level:intermediate": 0.5, "skill_level:advanced": -1.0}
+    }
+}
+
+# Added to the score of query candidates so they always rank ahead of the rest
+CANDIDATE_OFFSET = 1e6
+
+def standardize(values: np.ndarray) -> np.ndarray:
+    """Z-score a column, mapping missing values (NaN) and constant columns to 0."""
+    mean = np.nanmean(values) if np.isfinite(values).any() else 0.0
+    std = np.nanstd(values) if np.isfinite(values).any() else 0.0
+    if not std:
+        return np.zeros_like(values)
+    return np.nan_to_num((values - mean) / std)
+
+class RacketRanker:
+    def __init__(self, catalog: RacketCatalog, index: Optional[RacketIndex] = None,
+                 weights: Optional[Dict[str, Dict]] = None):
+        """
+        Build the feature matrix for a catalog.
+
+        Args:
+            catalog (RacketCatalog): Catalog to rank
+            index (RacketIndex): Index used for bonus and candidate queries (built if not given)
+            weights (Dict): Theme weights overriding THEME_WEIGHTS (optional)
+        """
+        self.catalog = catalog
+        self.index = index if index is not None else RacketIndex(catalog)
+        self.weights = {theme: dict(config) for theme, config in THEME_WEIGHTS.items()}
+        if weights:
+            self.weights.update(weights)
+
+        mains = np.frombuffer(catalog.column('string_mains'), dtype=np.uint8).astype(np.float64)
+        crosses = np.frombuffer(catalog.column('string_crosses'), dtype=np.uint8).astype(np.float64)
+        # Fewer string intersections = more open pattern; unknown patterns stay NaN
+        openness = np.where(mains * crosses > 0, -(mains * crosses), np.nan)
+
+        columns = {field: np.frombuffer(catalog.column(field), dtype=np.float64) for field in ('head_size', 'weight', 'balance')}
+        columns['string_openness'] = openness
+
+        self.features = np.column_stack([standardize(columns[name]) for name in FEATURES]) if len(catalog) else np.zeros((0, len(FEATURES)))
+        self.score_cache: Dict[str, np.ndarray] = {}
+        self.mask_cache: Dict[str, np.ndarray] = {}
+
+    def _mask(self, query: str) -> np.ndarray:
+        mask = self.mask_cache.get(query)
+        if mask is None:
+            mask = np.zeros(len(self.catalog), dtype=bool)
+            mask[self.index.query(query)] = True
+            self.mask_cache[query] = mask
+        return mask
+
+    def set_weights(self, theme: str, features: Dict[str, float], bonus: Dict[str, float] = None):
+        """Replace the weights of a theme."""
+        self.weights[theme] = {'features': dict(features), 'bonus': dict(bonus or {})}
+        self.score_cache.pop(theme, None)
+
+    def scores(self, theme: str) -> np.ndarray:
+        """Score of every racket for a theme (higher is a better fit)."""
+        cached = self.score_cache.get(theme)
+        if cached is not None:
+            return cached
+
+        config = self.weights[theme]
+        vector = np.array([config['features'].get(name, 0.0) for name in FEATURES])
+        scores = self.features @ vector
+        for query, bonus in config.get('bonus', {}).items():
+            scores = scores + bonus * self._mask(query)
+
+        self.score_cache[theme] = scores
+        return scores
+
+    def top_k(self, theme: str, k: int = 10, candidates: Optional[str] = None) -> List[int]:
+        """
+        Catalog positions of the k best rackets for a theme, best first.
+
+        Args:
+            theme (str): Theme in the weights (spin, control, power, beginner)
+            k (int): Number of rackets to return (fewer if the catalog is smaller)
+            candidates (str): Index query whose matches rank ahead of all other rackets (optional)
+
+        Returns:
+            List[int]: Catalog positions
+        """
+        scores = self.scores(theme)
+        if candidates:
+            scores = scores + CANDIDATE_OFFSET * self._mask(candidates)
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind='stable')].tolist()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+AcePlan Racket Similarity
+=========================
+
+Nearest-neighbour search over racket spec vectors, used to pick the
+rackets a comparison post or an "alternative racket" section talks about.
+
+Features:
+- Spec columns z-scored so weight, head size, balance, ... count equally
+- Pairwise distance matrix and neighbour order precomputed at build time,
+  so "k most similar to X" is a slice of a stored row
+- "Closest racket to this spec profile" for partial profiles (only the
+  given specs are compared)
+- Builders for the sheet catalog and for the rackets.ts-style dicts
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from racket_catalog import RacketCatalog, parse_number
+
+# Spec columns compared for sheet rackets (see catalog_spec_vectors)
+CATALOG_SPECS = ('weight', 'head_size', 'balance', 'string_density')
+
+# Spec columns compared for rackets.ts rackets (see profile_spec_vectors)
+PROFILE_SPECS = ('weight', 'head_size', 'stiffness', 'level')
+
+STIFFNESS_LEVELS = {'soft': 0, 'medium-soft': 0.5, 'medium': 1, 'medium-stiff': 2, 'stiff': 3}
+PLAYER_LEVELS = {'beginner': 0, 'beginner-intermediate': 0.5, 'intermediate': 1,
+                 'intermediate-advanced': 1.5, 'advanced': 2, 'professional': 2.5}
+
+def catalog_spec_vectors(catalog: RacketCatalog) -> np.ndarray:
+    """Spec matrix (rackets x CATALOG_SPECS) of a sheet catalog; unknown specs are NaN."""
+    mains = np.frombuffer(catalog.column('string_mains'), dtype=np.uint8).astype(np.float64)
+    crosses = np.frombuffer(catalog.column('string_crosses'), dtype=np.uint8).astype(np.float64)
+    density = np.where(mains * crosses > 0, mains * crosses, np.nan)
+    columns = [np.frombuffer(catalog.column(field), dtype=np.float64) for field in ('weight', 'head_size', 'balance')]
+    return np.column_stack(columns + [density]) if len(catalog) else np.zeros((0, len(CATALOG_SPECS)))
+
+def profile_spec_vectors(rackets: Iterable[Dict]) -> np.ndarray:
+    """Spec matrix (rackets x PROFILE_SPECS) of rackets.ts-style dicts; unknown specs are NaN."""
+    rows = []
+    for racket in rackets:
+        rows.append([
+            parse_number(racket.get('weight', '')),
+            parse_number(racket.get('headSize', '')),
+            STIFFNESS_LEVELS.get(racket.get('stiffness', '').strip().lower(), np.nan),
+            PLAYER_LEVELS.get(racket.get('level', '').strip().lower(), np.nan)
+        ])
+    return np.array(rows, dtype=np.float64).reshape(-1, len(PROFILE_SPECS))
+
+class SimilarityIndex:
+    def __init__(self, vectors: np.ndarray, specs: Sequence[str], keys: Optional[Sequence[str]] = None):
+        """
+        Standardize the spec vectors and precompute all pairwise distances.
+
+        Args:
+            vectors (np.ndarray): Raw spec matrix, one row per racket (NaN = unknown)
+            specs (Sequence[str]): Name of each spec column
+            keys (Sequence[str]): Racket names (or ids) for lookup by key (optional)
+        """
+        self.specs = list(specs)
+        # Racket collection the index was built from, so owners can tell when it is stale
+        self.source = None
+        self.keys = {key: position for position, key in enumerate(keys)} if keys is not None else {}
+        vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, len(self.specs))
+
+        finite = np.isfinite(vectors)
+        counts = finite.sum(axis=0)
+        self.mean = np.where(counts > 0, np.nansum(np.where(finite, vectors, 0.0), axis=0) / np.maximum(counts, 1), 0.0)
+        centered = np.where(finite, vectors - self.mean, 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(counts, 1))
+        self.std = np.where(std > 0, std, 1.0)
+        # Unknown specs sit at the catalog average
+        self.vectors = centered / self.std
+
+        squared = (self.vectors ** 2).sum(axis=1)
+        distances = squared[:, None] + squared[None, :] - 2.0 * self.vectors @ self.vectors.T
+        self.distances = np.sqrt(np.maximum(distances, 0.0))
+        np.fill_diagonal(self.distances, np.inf)
+        # Every other racket, nearest first (stable so ties keep catalog order)
+        self.neighbours = np.argsort(self.distances, axis=1, kind='stable')[:, :-1] if len(self.vectors) else np.zeros((0, 0), dtype=int)
+
+    @classmethod
+    def for_catalog(cls, catalog: RacketCatalog) -> 'SimilarityIndex':
+        """Build the index for a sheet catalog."""
+        index = cls(catalog_spec_vectors(catalog), CATALOG_SPECS, catalog.values('name'))
+        index.source = catalog
+        return index
+
+    @classmethod
+    def for_profiles(cls, rackets: List[Dict]) -> 'SimilarityIndex':
+        """Build the index for rackets.ts-style racket dicts."""
+        index = cls(profile_spec_vectors(rackets), PROFILE_SPECS, [racket.get('name', '') for racket in rackets])
+        index.source = rackets
+        return index
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def position(self, key: str) -> int:
+        """Position of a racket by the key it was indexed under."""
+        return self.keys[key]
+
+    def most_similar(self, position: int, k: int = 3) -> List[int]:
+        """Positions of the k rackets most similar to the one at position, nearest first."""
+        return self.neighbours[position, :k].tolist()
+
+    def distance(self, a: int, b: int) -> float:
+        """Spec distance between two rackets (0 = identical specs)."""
+        return 0.0 if a == b else float(self.distances[a, b])
+
+    def closest_to(self, profile: Dict[str, float], k: int = 1, exclude: Iterable[int] = ()) -> List[int]:
+        """
+        Positions of the k rackets closest to a spec profile, nearest first.
+
+        Only the specs given in the profile are compared, so
+        {'weight': 300, 'head_size': 100} ignores balance and pattern.
+
+        Args:
+            profile (Dict[str, float]): Spec values in the index's units
+            k (int): Number of rackets to return
+            exclude (Iterable[int]): Positions to leave out
+
+        Returns:
+            List[int]: Racket positions
+        """
+        columns = [self.specs.index(name) for name in profile if name in self.specs]
+        if not columns or not len(self.vectors):
+            return []
+
+        target = (np.array([profile[self.specs[c]] for c in columns], dtype=np.float64) - self.mean[columns]) / self.std[columns]
+        distances = np.sqrt(((self.vectors[:, columns] - target) ** 2).sum(axis=1))
+        distances[list(exclude)] = np.inf
+
+        k = min(k, int(np.isfinite(distances).sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        return nearest[np.argsort(distances[nearest], kind='stable')].tolist()
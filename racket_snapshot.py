@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+AcePlan Racket Database Snapshot
+================================
+
+Local snapshot of the 100-racket Google Sheets database shared by the blog
+generators, so building a generator reads racket data from disk instead of
+downloading the sheet.
+
+Features:
+- Snapshot stored as parsed JSON next to the response cache
+- Refreshed only once it is older than a TTL, with a conditional request
+  (ETag / Last-Modified) so an unchanged sheet is not downloaded again
+- Optional background refresh that serves the current snapshot meanwhile
+- Request timeout, and the last good snapshot is kept when a refresh fails
+
+Author: AcePlan Team
+Website: https://aceplan.me
+Database: https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/edit?gid=0#gid=0
+"""
+
+import os
+import io
+import csv
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Any
+
+import requests
+
+from response_cache import atomic_write_json
+
+# Google Sheets CSV export URL
+SHEETS_CSV_URL = "https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/export?format=csv&gid=0"
+
+DEFAULT_SNAPSHOT_DIR = os.path.join("blog_cache", "rackets")
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+def parse_racket_csv(text: str) -> List[Dict[str, str]]:
+    """
+    Parse the sheet's CSV export into racket dicts.
+
+    Args:
+        text (str): CSV export of the racket sheet
+
+    Returns:
+        List[Dict]: One dict per named racket row
+    """
+    rackets = []
+    for row in csv.DictReader(io.StringIO(text)):
+        if row.get('Name') and row.get('Name').strip():  # Skip empty rows
+            rackets.append({
+                'id': row.get('#', '').strip(),
+                'name': row.get('Name', '').strip(),
+                'type': row.get('Type', '').strip(),
+                'weight': row.get('Weight (Unstrung, g)', '').strip(),
+                'head_size': row.get('Head Size (in²)', '').strip(),
+                'balance': row.get('Balance (cm)', '').strip(),
+                'string_pattern': row.get('String Pattern', '').strip(),
+                'best_for': row.get('Best For', '').strip(),
+                'standout_tech': row.get('Standout Tech', '').strip(),
+                'skill_level': row.get('Skill Level', '').strip(),
+                'affiliate_link': row.get('Link', '').strip()
+            })
+    return rackets
+
+class RacketSnapshotStore:
+    def __init__(self, url: str = SHEETS_CSV_URL, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        """
+        Initialize the snapshot store for one sheet export.
+
+        Args:
+            url (str): CSV export URL of the sheet
+            snapshot_dir (str): Directory holding the snapshot file
+            ttl_seconds (float): Age after which the sheet is checked for changes
+            timeout (float): Seconds to wait for the sheet before giving up
+        """
+        self.url = url
+        self.snapshot_dir = snapshot_dir
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.path = os.path.join(snapshot_dir, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.json")
+        self.lock = threading.Lock()
+        self.thread_lock = threading.Lock()
+        self.refresh_thread = None
+        self.last_error = None
+
+        # Parsed snapshot and the file mtime it was read at
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.snapshot_mtime = None
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Return the snapshot on disk, re-reading it only if another process replaced it."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+        if self.snapshot is None or mtime != self.snapshot_mtime:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.snapshot = json.load(f)
+                self.snapshot_mtime = mtime
+            except (OSError, ValueError) as e:
+                print(f"Error reading racket snapshot: {e}")
+                return self.snapshot
+        return self.snapshot
+
+    def _write(self, snapshot: Dict[str, Any]):
+        atomic_write_json(self.path, snapshot)
+        self.snapshot = snapshot
+        self.snapshot_mtime = os.path.getmtime(self.path)
+
+    def is_stale(self) -> bool:
+        """Return True if the sheet has not been checked within the TTL."""
+        snapshot = self._read()
+        return snapshot is None or time.time() - snapshot.get('checked_at', 0) > self.ttl_seconds
+
+    @property
+    def version(self) -> Optional[str]:
+        """Content hash of the current snapshot, or None if there is none."""
+        snapshot = self._read()
+        return snapshot.get('version') if snapshot else None
+
+    def refresh(self) -> bool:
+        """
+        Check the sheet for changes and update the snapshot.
+
+        Sends the stored ETag and Last-Modified so an unchanged sheet answers
+        304 without a body. A failed request or an export with no rackets
+        leaves the last good snapshot in place.
+
+        Returns:
+            bool: True if the snapshot is up to date with the sheet
+        """
+        with self.lock:
+            snapshot = self._read()
+            headers = {}
+            if snapshot:
+                if snapshot.get('etag'):
+                    headers['If-None-Match'] = snapshot['etag']
+                if snapshot.get('last_modified'):
+                    headers['If-Modified-Since'] = snapshot['last_modified']
+
+            try:
+                response = requests.get(self.url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and snapshot:
+                    self._write(dict(snapshot, checked_at=time.time()))
+                    print("Racket database unchanged since last snapshot")
+                    self.last_error = None
+                    return True
+
+                response.raise_for_status()
+                rackets = parse_racket_csv(response.text)
+                if not rackets:
+                    raise ValueError("sheet export contained no rackets")
+            except Exception as e:
+                print(f"Error refreshing racket snapshot: {e}")
+                self.last_error = str(e)
+                return False
+
+            now = time.time()
+            self._write({
+                'url': self.url,
+                'version': hashlib.sha256(response.content).hexdigest()[:16],
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': now,
+                'checked_at': now,
+                'rackets': rackets
+            })
+            self.last_error = None
+            print(f"Updated racket snapshot: {len(rackets)} rackets")
+            return True
+
+    def refresh_async(self) -> threading.Thread:
+        """Refresh in a background thread unless a refresh is already running."""
+        with self.thread_lock:
+            if self.refresh_thread is None or not self.refresh_thread.is_alive():
+                self.refresh_thread = threading.Thread(target=self.refresh, name="racket-snapshot-refresh", daemon=True)
+                self.refresh_thread.start()
+            return self.refresh_thread
+
+    def get_rackets(self, background: bool = False, force_check: bool = False) -> Optional[List[Dict[str, str]]]:
+        """
+        Return the racket list, refreshing the snapshot when it is stale.
+
+        Without a snapshot on disk the sheet is always fetched right away.
+
+        Args:
+            background (bool): Serve the current snapshot and refresh a stale one in the background
+            force_check (bool): Check the sheet for changes even if the snapshot is fresh
+
+        Returns:
+            List[Dict]: Rackets from the newest good snapshot, or None if there is none
+        """
+        if force_check or self.is_stale():
+            if background and self._read() is not None:
+                self.refresh_async()
+            elif not self.refresh() and self._read() is not None:
+                fetched = time.strftime('%Y-%m-%d %H:%M', time.localtime(self.snapshot.get('fetched_at', 0)))
+                print(f"Using last good racket snapshot from {fetched}")
+
+        snapshot = self._read()
+        return snapshot['rackets'] if snapshot else None
+
+    def status(self) -> Dict[str, Any]:
+        """Return a summary of the snapshot state."""
+        snapshot = self._read() or {}
+        return {
+            'path': self.path,
+            'rackets': len(snapshot.get('rackets', [])),
+            'version': snapshot.get('version'),
+            'fetched_at': snapshot.get('fetched_at'),
+            'checked_at': snapshot.get('checked_at'),
+            'stale': self.is_stale(),
+            'last_error': self.last_error
+        }
+
+_stores: Dict[str, RacketSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+def get_racket_store(url: str = SHEETS_CSV_URL) -> RacketSnapshotStore:
+    """Return the process-wide snapshot store for a sheet export URL."""
+    with _stores_lock:
+        store = _stores.get(url)
+        if store is None:
+            store = RacketSnapshotStore(url)
+            _stores[url] = store
+        return store
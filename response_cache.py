@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+AcePlan GPT4All Response Cache
+==============================
+
+Disk-backed cache of GPT4All responses shared by the blog generators.
+
+Features:
+- Keyed on model name, system prompt, normalized prompt, max_tokens and temperature
+- Keeps up to N response variants per key so cached posts stay fresh
+- Age- and size-based eviction
+- Hit/miss counters (per process and lifetime) for tuning
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import random
+import hashlib
+import tempfile
+import threading
+from typing import Dict, List, Optional, Any
+
+DEFAULT_CACHE_DIR = os.path.join("blog_cache", "responses")
+DEFAULT_VARIANTS_PER_KEY = 3
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+STATS_FILE = "_stats.json"
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so re-indented prompts share a cache entry."""
+    return re.sub(r"\s+", " ", prompt).strip()
+
+# Mode open() gives new files under the process umask (read once: os.umask can only be read by setting it)
+_umask = os.umask(0)
+os.umask(_umask)
+NEW_FILE_MODE = 0o666 & ~_umask
+
+def replacement_mode(path: str) -> int:
+    """
+    Permissions for a temp file about to be renamed over path.
+    
+    mkstemp creates files readable by the owner only; the replacement keeps
+    the mode of the file it replaces, or the umask default for a new file.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return NEW_FILE_MODE
+
+def atomic_write_json(path: str, data: Any):
+    """Write JSON to a temp file and rename it over the target."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.chmod(tmp_path, replacement_mode(path))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 variants_per_key: int = DEFAULT_VARIANTS_PER_KEY,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir (str): Directory holding one JSON file per key
+            variants_per_key (int): Responses to collect per key before serving hits
+            max_age_days (float): Entries older than this are evicted
+            max_bytes (int): Total cache size before the oldest entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.variants_per_key = max(1, variants_per_key)
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # key -> (size in bytes, last write time), rebuilt from disk
+        self.index: Dict[str, List[float]] = {}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json") and name != STATS_FILE:
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    self.index[name[:-5]] = [stat.st_size, stat.st_mtime]
+                except OSError:
+                    continue
+
+        self.lifetime = self._load_lifetime_stats()
+        atexit.register(self.flush_stats)
+
+    def make_key(self, model_name: str, prompt: str, max_tokens: int, temp: float, system_prompt: str = "") -> str:
+        """Build the cache key for a generation request."""
+        parts = [model_name, normalize_prompt(prompt), max_tokens, round(temp, 3)]
+        if system_prompt:
+            parts.append(normalize_prompt(system_prompt))
+        raw = json.dumps(parts)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _remove(self, key: str):
+        self.index.pop(key, None)
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+        self.evictions += 1
+
+    def get(self, model_name: str, prompt: str, max_tokens: int, temp: float, system_prompt: str = "") -> Optional[str]:
+        """
+        Look up a cached response.
+
+        A key only produces hits once it holds the full number of variants;
+        until then every call is a miss so a new variant gets generated.
+
+        Returns:
+            str: One of the cached variants, or None on a miss
+        """
+        key = self.make_key(model_name, prompt, max_tokens, temp, system_prompt)
+
+        with self.lock:
+            entry = self._read(key) if key in self.index else None
+            if entry is not None and time.time() - entry.get('created_at', 0) > self.max_age:
+                self._remove(key)
+                entry = None
+
+            variants = entry.get('variants', []) if entry else []
+            if len(variants) >= self.variants_per_key:
+                self.hits += 1
+                return random.choice(variants)
+
+            self.misses += 1
+            return None
+
+    def put(self, model_name: str, prompt: str, max_tokens: int, temp: float, response: str, system_prompt: str = ""):
+        """Store a freshly generated response as a new variant of its key."""
+        if not response:
+            return
+
+        key = self.make_key(model_name, prompt, max_tokens, temp, system_prompt)
+
+        with self.lock:
+            entry = self._read(key) if key in self.index else None
+            if entry is None:
+                entry = {'created_at': time.time(), 'variants': []}
+
+            entry['variants'].append(response)
+            entry['variants'] = entry['variants'][-self.variants_per_key:]
+
+            path = self._path(key)
+            try:
+                atomic_write_json(path, entry)
+            except OSError as e:
+                print(f"Error writing response cache entry: {e}")
+                return
+
+            self.index[key] = [os.path.getsize(path), time.time()]
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then the oldest ones until under max_bytes."""
+        now = time.time()
+        for key, (size, mtime) in list(self.index.items()):
+            if now - mtime > self.max_age:
+                self._remove(key)
+
+        total = sum(size for size, _ in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, (size, _) in sorted(self.index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def clear(self):
+        """Remove every cached response."""
+        with self.lock:
+            for key in list(self.index):
+                self._remove(key)
+
+    def _load_lifetime_stats(self) -> Dict[str, int]:
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def flush_stats(self):
+        """Add this process's counters to the lifetime totals on disk."""
+        with self.lock:
+            session = {'hits': self.hits, 'misses': self.misses, 'stores': self.stores, 'evictions': self.evictions}
+            if not any(session.values()):
+                return
+            totals = self._load_lifetime_stats()
+            for name, value in session.items():
+                totals[name] = totals.get(name, 0) + value
+            try:
+                atomic_write_json(os.path.join(self.cache_dir, STATS_FILE), totals)
+            except OSError as e:
+                print(f"Error writing response cache stats: {e}")
+                return
+            self.lifetime = totals
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this process plus lifetime totals."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self.index),
+            'bytes': int(sum(size for size, _ in self.index.values())),
+            'lifetime': self.lifetime
+        }
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache(cache_dir: str = DEFAULT_CACHE_DIR) -> ResponseCache:
+    """Return the process-wide cache for a directory."""
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = ResponseCache(cache_dir)
+            _caches[cache_dir] = cache
+        return cache
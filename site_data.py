@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+AcePlan Site Data Loader
+========================
+
+Reads the website's racket and drill data (src/data/rackets.ts and
+src/data/drills.ts) into Python dicts, so the blog generators use the same
+catalogue as the site without a Node toolchain.
+
+Features:
+- Parser for the TypeScript object literals the data files are written in
+  (objects, arrays, quoted strings, numbers, booleans, comments, trailing commas)
+- Parsed data cached as JSON, keyed by the source file's size, mtime and
+  content hash, so later runs skip parsing until the file changes
+- In-process memo, so every generator in a process shares one parse
+
+Author: AcePlan Team
+Website: https://aceplan.me
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from response_cache import atomic_write_json
+
+SITE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "data")
+RACKETS_TS = os.path.join(SITE_DATA_DIR, "rackets.ts")
+DRILLS_TS = os.path.join(SITE_DATA_DIR, "drills.ts")
+
+DEFAULT_CACHE_DIR = os.path.join("blog_cache", "site_data")
+
+# Bumped when the parser output changes, so old cache files are ignored
+PARSER_VERSION = 1
+
+TOKEN = re.compile(r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\$]|\\.|\$(?!\{))*`)
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,])
+""", re.S | re.X)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+ESCAPE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)", re.S)
+CONSTANTS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+class TSParseError(ValueError):
+    """Raised when a data file is not a plain TypeScript object literal."""
+
+def _unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] == 'u':
+        return chr(int(escape[1:].strip('{}'), 16))
+    if escape[0] == 'x':
+        return chr(int(escape[1:], 16))
+    if escape == '\n':  # Line continuation
+        return ''
+    return ESCAPES.get(escape, escape)
+
+def _tokenize(text: str, start: int = 0) -> Iterator[tuple]:
+    """Yield (kind, token, offset) from start on, skipping whitespace and comments."""
+    position = start
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            yield ('other', text[position], position)
+            return
+        kind = match.lastgroup
+        if kind != 'space':
+            yield (kind, match.group(kind), position)
+        position = match.end()
+    yield ('end', '', len(text))
+
+def parse_ts_literal(text: str, start: int = 0) -> Any:
+    """
+    Parse the TypeScript literal beginning at start into Python values.
+
+    Tokens are read lazily and parsing stops at the end of the literal, so
+    anything after it (the closing semicolon, further code) is ignored.
+
+    Args:
+        text (str): Source text
+        start (int): Offset of the literal in the text
+
+    Returns:
+        Any: dict / list / str / int / float / bool / None
+    """
+    tokens = _tokenize(text, start)
+    current = next(tokens)
+
+    def fail(message: str):
+        raise TSParseError(f"{message} on line {text.count(chr(10), 0, current[2]) + 1}")
+
+    def advance() -> tuple:
+        nonlocal current
+        token = current
+        if token[0] == 'end':
+            fail("unexpected end of file")
+        current = next(tokens)
+        return token
+
+    def expect(value: str):
+        if current[0] != 'punct' or current[1] != value:
+            fail(f"expected {value!r}")
+        advance()
+
+    def value() -> Any:
+        if current[0] in ('end', 'other'):
+            fail(f"unexpected {current[1]!r}" if current[1] else "unexpected end of file")
+        kind, token, _ = current
+        if token == '{':
+            advance()
+            result = {}
+            while current[1] != '}':
+                kind, key, _ = current
+                if kind not in ('name', 'string', 'number'):
+                    fail("expected a property name")
+                advance()
+                expect(':')
+                result[ESCAPE.sub(_unescape, key[1:-1]) if kind == 'string' else key] = value()
+                if current[1] != '}':
+                    expect(',')
+            advance()
+            return result
+        if token == '[':
+            advance()
+            result = []
+            while current[1] != ']':
+                result.append(value())
+                if current[1] != ']':
+                    expect(',')
+            advance()
+            return result
+        if kind == 'string':
+            advance()
+            return ESCAPE.sub(_unescape, token[1:-1])
+        if kind == 'number':
+            advance()
+            return float(token) if any(c in token for c in '.eE') else int(token)
+        if kind == 'name' and token in CONSTANTS:
+            advance()
+            return CONSTANTS[token]
+        fail(f"unsupported value {token!r}")
+
+    return value()
+
+def parse_ts_export(text: str, name: str) -> Any:
+    """
+    Parse the value of `export const <name> = ...` in a TypeScript module.
+
+    Args:
+        text (str): Module source
+        name (str): Exported constant to read
+
+    Returns:
+        Any: Parsed value
+    """
+    match = re.search(r"export\s+const\s+" + re.escape(name) + r"\s*(?::[^=]+)?=\s*", text)
+    if match is None:
+        raise TSParseError(f"no 'export const {name}' found")
+    return parse_ts_literal(text, match.end())
+
+class SiteDataCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize the cache of parsed site data.
+
+        Args:
+            cache_dir (str): Directory holding the parsed JSON files
+        """
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        # (path, export) -> cache entry read or written by this process
+        self.entries: Dict[tuple, Dict[str, Any]] = {}
+
+    def cache_path(self, path: str, export: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{export}-{digest}.json")
+
+    def _read_entry(self, cache_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('parser_version') == PARSER_VERSION else None
+
+    def load(self, path: str, export: str) -> Any:
+        """
+        Return the parsed value of an exported constant, parsing the file only if it changed.
+
+        A matching size and mtime is trusted as-is; otherwise the file is
+        hashed and only re-parsed if its content actually changed.
+
+        Args:
+            path (str): TypeScript data file
+            export (str): Exported constant to read
+
+        Returns:
+            Any: Parsed value
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), export)
+        cache_path = self.cache_path(path, export)
+
+        with self.lock:
+            entry = self.entries.get(key) or self._read_entry(cache_path)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                self.entries[key] = entry
+                return entry['data']
+
+            with open(path, 'rb') as f:
+                source = f.read()
+            digest = hashlib.sha256(source).hexdigest()
+
+            if entry and entry['sha256'] == digest:
+                data = entry['data']
+            else:
+                data = parse_ts_export(source.decode('utf-8'), export)
+
+            entry = {
+                'parser_version': PARSER_VERSION,
+                'source': key[0],
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': digest,
+                'data': data
+            }
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                atomic_write_json(cache_path, entry)
+            except OSError as e:
+                print(f"Error caching parsed {os.path.basename(path)}: {e}")
+            self.entries[key] = entry
+            return data
+
+    def version(self, path: str, export: str) -> Optional[str]:
+        """Content hash of the last loaded version of a file, or None if it was not loaded."""
+        entry = self.entries.get((os.path.abspath(path), export))
+        return entry['sha256'][:16] if entry else None
+
+_cache: Optional[SiteDataCache] = None
+_cache_lock = threading.Lock()
+
+def get_site_data_cache() -> SiteDataCache:
+    """Return the process-wide site data cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SiteDataCache()
+        return _cache
+
+def load_site_rackets(path: str = RACKETS_TS) -> List[Dict[str, Any]]:
+    """Rackets from the website's rackets.ts (Racket interface fields)."""
+    return get_site_data_cache().load(path, "rackets")
+
+def load_site_drills(path: str = DRILLS_TS) -> List[Dict[str, Any]]:
+    """Drills from the website's drills.ts (Drill interface fields)."""
+    return get_site_data_cache().load(path, "drills")
@@ -9,6 +9,7 @@ interface Article {
   slug: string;
   excerpt: string;
   content: string;
+  html?: string;
   author: string;
   publishedAt: Date;
   category: string;
@@ -16,6 +17,8 @@ interface Article {
   readTime: number;
   featured: boolean;
   imageUrl?: string;
+  seoTitle?: string;
+  seoDescription?: string;
   views: number;
   likes: number;
   status: string;
@@ -32,7 +35,7 @@ if (!fs.existsSync(ARTICLES_DIR)) {
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { title, content, category = 'equipment', tags = [] } = body;
+    const { title, content, category = 'equipment', tags = [], html, seoTitle, seoDescription } = body;
 
     if (!title || !content) {
       return NextResponse.json(
@@ -49,15 +52,15 @@ export async function POST(request: NextRequest) {
       .replace(/-+/g, '-')
       .trim();
 
-    // Extract excerpt from content (first 150 characters)
-    const excerpt = content
+    // Use the excerpt and read time rendered by the generator, else derive them from content
+    const excerpt = body.excerpt || content
       .replace(/[#*`]/g, '') // Remove markdown formatting
       .substring(0, 150)
       .trim() + '...';
 
     // Calculate read time (average 200 words per minute)
     const wordCount = content.split(/\s+/).length;
-    const readTime = Math.max(1, Math.ceil(wordCount / 200));
+    const readTime = body.readTime || Math.max(1, Math.ceil(wordCount / 200));
 
     // Create article object
     const article: Article = {
@@ -66,6 +69,7 @@ export async function POST(request: NextRequest) {
       slug,
       excerpt,
       content,
+      ...(html ? { html } : {}),
       author: 'AcePlan AI',
       publishedAt: new Date(),
       category,
@@ -73,6 +77,8 @@ export async function POST(request: NextRequest) {
       readTime,
       featured: Math.random() > 0.7, // 30% chance of being featured
       imageUrl: '/images/articles/tennis-blog.jpg',
+      ...(seoTitle ? { seoTitle } : {}),
+      ...(seoDescription ? { seoDescription } : {}),
       views: Math.floor(Math.random() * 1000) + 100,
       likes: Math.floor(Math.random() * 100) + 10,
       status: 'published'
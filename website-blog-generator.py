@@ -17,50 +17,82 @@ Website: https://aceplan.me
 """
 
 import os
+import sys
 import json
 import random
 import datetime
 import requests
-import csv
-import io
 from typing import List, Dict, Any, Optional
 import time
 from pathlib import Path
 
-# GPT4All imports
-try:
-    from gpt4all import GPT4All
-    GPT4ALL_AVAILABLE = True
-except ImportError:
-    GPT4ALL_AVAILABLE = False
-    print("Warning: GPT4All not installed. Install with: pip install gpt4all")
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# GPT4All model handling shared by all generators
+from gpt4all_runtime import get_model_holder, generate_text, per_post_chat_session, DeadlineExceeded, DEFAULT_SECTION_TIME_LIMIT
+from response_cache import get_response_cache
+from racket_snapshot import get_racket_store
+from racket_catalog import RacketCatalog, catalog_for_snapshot
+from racket_index import RacketIndex, TOP_10_QUERIES
+from racket_ranking import RacketRanker
+from racket_similarity import SimilarityIndex
+from post_templates import (
+    Template, PostBuffer, TOP_10_HEADER, TOP_10_HEADING, COMPARISON_HEADER, NUMBERED_SECTION, get_fragment_cache
+)
+from post_document import render_post
+from post_dedup import DEDUP_ATTEMPTS, get_content_store
+
+# Article body sent to the publish API (content plus conclusion), compiled once
+POST_LAYOUT = Template(
+    "{content}\n\n## Conclusion\n\n"
+    "Whether you're looking to improve your UTR rating, find the perfect racket, or enhance your tennis game, the right approach and equipment make all the difference.\n\n"
+    "For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.\n\n"
+    "Our database includes detailed specifications, reviews, and affiliate links to help you make informed purchasing decisions while supporting our platform.\n"
+)
 
 class WebsiteBlogGenerator:
-    def __init__(self, model_name: str = "orca-mini-3b-gguf2-q4_0.gguf"):
+    def __init__(self, model_name: str = "orca-mini-3b-gguf2-q4_0.gguf", preload_model: bool = False, background_refresh: bool = False):
         """
         Initialize the website blog generator.
         
         Args:
             model_name (str): GPT4All model to use
+            preload_model (bool): Start loading the model in the background right away
+            background_refresh (bool): Refresh a stale racket snapshot in the background
         """
         self.model_name = model_name
-        self.model = None
+        self.model_holder = get_model_holder(model_name)
+        self.response_cache = get_response_cache()
+        self.stream_writer = None
+        # Hashes of every saved or published post body; exact duplicates are not published
+        self.content_hashes = get_content_store()
+        
+        # Per-section inference budget; None disables a limit
+        self.section_time_limit = DEFAULT_SECTION_TIME_LIMIT
+        self.section_token_limit = None
+        
+        # One chat session per post so the shared system preamble is evaluated once
+        self.use_chat_session = True
+        self.last_session_stats = {}
+        
+        # The GPT4All model is loaded on first use (shared with other generators)
+        if preload_model:
+            self.model_holder.preload_async()
+        
+        # Load racket data from the local snapshot of Google Sheets
+        self.racket_store = get_racket_store()
+        self.background_refresh = background_refresh
+        self.rackets = self.load_rackets_from_sheets()
+        self._racket_index = None
+        self._racket_ranker = None
+        self._racket_similarity = None
         
-        # Initialize GPT4All model
-        if GPT4ALL_AVAILABLE:
-            try:
-                print(f"Loading GPT4All model: {model_name}")
-                self.model = GPT4All(model_name)
-                print("GPT4All model loaded successfully!")
-            except Exception as e:
-                print(f"Error loading GPT4All model: {e}")
-                print("Falling back to template-based generation")
-                self.model = None
-        else:
-            print("GPT4All not available, using template-based generation")
+        # Rendered racket fragments, shared across posts and generators
+        self.fragments = get_fragment_cache()
         
-        # Load racket data from Google Sheets
-        self.rackets = self.load_rackets_from_sheets()
+        # Theme weights for Top 10 ranking (None uses racket_ranking.THEME_WEIGHTS)
+        self.ranking_weights = None
         
         # Content themes for unique posts
         self.content_themes = [
@@ -87,41 +119,28 @@ class WebsiteBlogGenerator:
             "UTR improvement", "tennis spin rackets", "tennis control rackets", "tennis power rackets"
         ]
 
-    def load_rackets_from_sheets(self) -> List[Dict]:
-        """Load racket data from Google Sheets CSV export."""
-        sheets_url = "https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/export?format=csv&gid=0"
+    def load_rackets_from_sheets(self, refresh: bool = False) -> RacketCatalog:
+        """
+        Load racket data from the local snapshot of the Google Sheets database.
         
-        try:
-            print("Loading racket data from Google Sheets...")
-            response = requests.get(sheets_url)
-            response.raise_for_status()
-            
-            csv_data = csv.DictReader(io.StringIO(response.text))
-            rackets = []
-            
-            for row in csv_data:
-                if row.get('Name') and row.get('Name').strip():
-                    racket = {
-                        'id': row.get('#', '').strip(),
-                        'name': row.get('Name', '').strip(),
-                        'type': row.get('Type', '').strip(),
-                        'weight': row.get('Weight (Unstrung, g)', '').strip(),
-                        'head_size': row.get('Head Size (in²)', '').strip(),
-                        'balance': row.get('Balance (cm)', '').strip(),
-                        'string_pattern': row.get('String Pattern', '').strip(),
-                        'best_for': row.get('Best For', '').strip(),
-                        'standout_tech': row.get('Standout Tech', '').strip(),
-                        'skill_level': row.get('Skill Level', '').strip(),
-                        'affiliate_link': row.get('Link', '').strip()
-                    }
-                    rackets.append(racket)
-            
+        The sheet is only contacted when the snapshot is older than its TTL
+        (or refresh is set), and only downloaded again if it has changed.
+        
+        The rackets are returned as a RacketCatalog with parsed numeric specs;
+        records still support racket['name'] style access.
+        
+        Args:
+            refresh (bool): Check the sheet for changes now, even if the snapshot is fresh
+        """
+        print("Loading racket data...")
+        # An explicit refresh waits for the sheet; otherwise a stale snapshot may refresh in the background
+        rackets = self.racket_store.get_rackets(background=self.background_refresh and not refresh, force_check=refresh)
+        if rackets:
             print(f"Loaded {len(rackets)} rackets from database")
-            return rackets
-            
-        except Exception as e:
-            print(f"Error loading rackets from Google Sheets: {e}")
-            return self.get_fallback_rackets()
+            return catalog_for_snapshot(rackets, self.racket_store.version)
+        
+        print("Using fallback racket data...")
+        return RacketCatalog(self.get_fallback_rackets(), version="fallback")
 
     def get_fallback_rackets(self) -> List[Dict]:
         """Fallback racket data if Google Sheets fails."""
@@ -141,14 +160,57 @@ class WebsiteBlogGenerator:
             }
         ]
 
+    @property
+    def racket_index(self) -> RacketIndex:
+        """Attribute index of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_index is None or self._racket_index.catalog is not self.rackets:
+            self._racket_index = RacketIndex(self.rackets)
+        return self._racket_index
+
+    def find_rackets(self, query: str, limit: int = None) -> List[Dict]:
+        """Rackets matching an index query such as "best_for:spin OR type:power"."""
+        return self.rackets.select(self.racket_index.query(query, limit))
+
+    @property
+    def racket_ranker(self) -> RacketRanker:
+        """Spec-based ranker of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_ranker is None or self._racket_ranker.catalog is not self.rackets:
+            self._racket_ranker = RacketRanker(self.rackets, self.racket_index, self.ranking_weights)
+        return self._racket_ranker
+
+    def rank_rackets(self, theme: str, count: int = 10) -> List[Dict]:
+        """Best rackets for a Top 10 theme, with rackets matching the theme's query ranked first."""
+        return self.rackets.select(self.racket_ranker.top_k(theme, count, candidates=TOP_10_QUERIES[theme]))
+
+    @property
+    def racket_similarity(self) -> SimilarityIndex:
+        """Spec similarity index of the current rackets, rebuilt when the rackets are replaced."""
+        if self._racket_similarity is None or self._racket_similarity.source is not self.rackets:
+            self._racket_similarity = SimilarityIndex.for_catalog(self.rackets)
+        return self._racket_similarity
+
+    def similar_rackets(self, racket, count: int = 3) -> List[Dict]:
+        """The rackets with specs closest to the given one, most similar first."""
+        return self.rackets.select(self.racket_similarity.most_similar(racket.index, count))
+
+    @property
+    def model(self):
+        """The shared GPT4All model, or None if it is not loaded."""
+        return self.model_holder.model
+
     def generate_with_gpt4all(self, prompt: str, max_tokens: int = 500) -> str:
         """Generate content using GPT4All model."""
-        if self.model is None:
+        if not self.model_holder.is_available():
             return self.generate_fallback_content(prompt)
         
         try:
-            response = self.model.generate(prompt, max_tokens=max_tokens, temp=0.7)
-            return response.strip()
+            return generate_text(
+                self.model_holder, prompt, max_tokens=max_tokens, temp=0.7,
+                cache=self.response_cache, writer=self.stream_writer,
+                time_limit=self.section_time_limit, token_limit=self.section_token_limit
+            )
+        except DeadlineExceeded:
+            return self.generate_fallback_content(prompt)
         except Exception as e:
             print(f"Error generating with GPT4All: {e}")
             return self.generate_fallback_content(prompt)
@@ -167,58 +229,49 @@ class WebsiteBlogGenerator:
     def generate_top_10_content(self, theme: str) -> str:
         """Generate top 10 list content."""
         if "spin" in theme:
-            rackets = [r for r in self.rackets if "spin" in r['best_for'].lower() or "power" in r['type'].lower()][:10]
+            rackets = self.rank_rackets("spin")
             title = "Top 10 Tennis Rackets for Spin Players in 2024"
         elif "control" in theme:
-            rackets = [r for r in self.rackets if "control" in r['type'].lower() or "precision" in r['best_for'].lower()][:10]
+            rackets = self.rank_rackets("control")
             title = "Top 10 Control Tennis Rackets for Precision Players"
         elif "power" in theme:
-            rackets = [r for r in self.rackets if "power" in r['type'].lower()][:10]
+            rackets = self.rank_rackets("power")
             title = "Top 10 Power Tennis Rackets for Aggressive Players"
         elif "beginner" in theme:
-            rackets = [r for r in self.rackets if "intermediate" in r['skill_level'].lower()][:10]
+            rackets = self.rank_rackets("beginner")
             title = "Top 10 Best Tennis Rackets for Beginners and Intermediate Players"
         else:
-            rackets = random.sample(self.rackets, 10)
+            rackets = random.sample(self.rackets, min(10, len(self.rackets)))
             title = "Top 10 Tennis Rackets Every Player Should Know About"
 
         prompt = f"""
-        Write an engaging introduction for a blog post titled "{title}".
+        Write the introduction for a blog post titled "{title}".
         Explain why these rackets are important for tennis players and what makes them special.
         Include information about how to choose the right racket for your playing style.
-        Keep it under 200 words and make it SEO-friendly.
+        Keep it under 200 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=300)
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=300))
         
         # Add the top 10 list
-        content += f"\n\n## {title}\n\n"
-        
-        for i, racket in enumerate(rackets, 1):
-            content += f"### {i}. {racket['name']}\n\n"
-            content += f"**Type:** {racket['type']} | **Weight:** {racket['weight']}g | **Head Size:** {racket['head_size']} in²\n\n"
-            content += f"**Best For:** {racket['best_for']}\n\n"
-            content += f"**Standout Technology:** {racket['standout_tech']}\n\n"
-            content += f"**Skill Level:** {racket['skill_level']}\n\n"
-            content += f"**Why It's Great:** This racket excels in {racket['best_for'].lower()} with its {racket['standout_tech']} technology, making it perfect for players seeking {racket['type'].lower()} characteristics.\n\n"
-            content += f"**[Get the {racket['name']} here]({racket['affiliate_link']})**\n\n"
-            content += "---\n\n"
+        content.render(TOP_10_HEADER, title=title)
+        self.fragments.render_each('top_10_entry', rackets, self.rackets.version, content.parts, heading=TOP_10_HEADING)
         
-        return content
+        return content.getvalue()
 
     def generate_utr_improvement_content(self) -> str:
         """Generate UTR improvement guide content."""
         prompt = """
         Write a comprehensive guide on how to improve your UTR (Universal Tennis Rating) quickly and effectively.
         Include specific strategies, training methods, and mental approaches that help players see rapid improvement.
-        Focus on practical, actionable advice that beginners and intermediate players can implement immediately.
-        Keep it engaging and motivational. Aim for 400-500 words.
+        Focus on actionable advice players can implement immediately.
+        Keep it motivational. Aim for 400-500 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=600)
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=600))
         
         # Add specific tips
-        content += "\n\n## 5 Key Strategies to Improve Your UTR Fast\n\n"
+        content.write("\n\n## 5 Key Strategies to Improve Your UTR Fast\n\n")
         
         strategies = [
             {
@@ -243,11 +296,9 @@ class WebsiteBlogGenerator:
             }
         ]
         
-        for i, strategy in enumerate(strategies, 1):
-            content += f"### {i}. {strategy['title']}\n\n"
-            content += f"{strategy['description']}\n\n"
+        content.render_each(NUMBERED_SECTION, 'item', strategies)
         
-        return content
+        return content.getvalue()
 
     def generate_individual_racket_review(self) -> str:
         """Generate individual racket review content."""
@@ -256,43 +307,43 @@ class WebsiteBlogGenerator:
         prompt = f"""
         Write a detailed, in-depth review of the {racket['name']} tennis racket.
         Include analysis of its performance characteristics, who it's best suited for, and how it compares to similar rackets.
-        Make it engaging and informative for tennis players looking to buy a new racket.
+        Write it for tennis players looking to buy a new racket.
         Include specific details about the racket's technology and performance.
         Keep it under 400 words.
         """
         
-        content = self.generate_with_gpt4all(prompt, max_tokens=500)
-        
-        # Add technical specifications
-        content += f"\n\n## {racket['name']} - Technical Specifications\n\n"
-        content += f"- **Type:** {racket['type']}\n"
-        content += f"- **Weight:** {racket['weight']}g (unstrung)\n"
-        content += f"- **Head Size:** {racket['head_size']} in²\n"
-        content += f"- **Balance:** {racket['balance']} cm\n"
-        content += f"- **String Pattern:** {racket['string_pattern']}\n"
-        content += f"- **Best For:** {racket['best_for']}\n"
-        content += f"- **Standout Technology:** {racket['standout_tech']}\n"
-        content += f"- **Skill Level:** {racket['skill_level']}\n\n"
-        
-        # Add pros and cons
-        content += "## Pros and Cons\n\n"
-        content += "**Pros:**\n"
-        content += f"- Excellent {racket['best_for'].lower()} performance\n"
-        content += f"- Advanced {racket['standout_tech']} technology\n"
-        content += f"- Suitable for {racket['skill_level'].lower()} players\n"
-        content += "- Professional-grade construction\n\n"
-        
-        content += "**Cons:**\n"
-        content += "- Higher price point\n"
-        content += "- May require adjustment period\n"
-        content += "- Not suitable for complete beginners\n\n"
-        
-        # Add affiliate link
-        content += f"## Where to Buy\n\n"
-        content += f"Ready to try the {racket['name']}? **[Get it here with our affiliate link]({racket['affiliate_link']})** and support AcePlan while getting your new racket!\n\n"
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=500))
         
-        return content
+        # Add technical specifications, pros and cons, and the affiliate link
+        for fragment in ('specs', 'pros_cons', 'where_to_buy'):
+            self.fragments.render(fragment, racket, self.rackets.version, content.parts)
+        
+        return content.getvalue()
+
+    def generate_equipment_comparison_content(self) -> str:
+        """Generate a comparison of a racket and the rackets with the most similar specs."""
+        racket = random.choice(self.rackets)
+        rackets = [racket] + self.similar_rackets(racket, 2)
+        
+        prompt = f"""
+        Write a comparison of these tennis rackets with similar specifications: {', '.join(r['name'] for r in rackets)}.
+        Explain how they differ in feel, power, control and spin, and which type of player each one suits best.
+        Keep it around 400 words.
+        """
+        
+        content = PostBuffer(self.generate_with_gpt4all(prompt, max_tokens=600))
+        
+        # Add the specification table
+        content.render(COMPARISON_HEADER)
+        self.fragments.render_each('comparison_row', rackets, self.rackets.version, content.parts)
+        
+        # Add affiliate links
+        content.write("\n## Where to Buy\n\n")
+        self.fragments.render_each('buy_link', rackets, self.rackets.version, content.parts)
+        
+        return content.getvalue()
 
+    @per_post_chat_session
     def generate_blog_post(self, theme: str = None) -> Dict[str, Any]:
         """Generate a complete blog post with the specified theme."""
         if theme is None:
@@ -308,21 +359,24 @@ class WebsiteBlogGenerator:
         elif theme == "individual_racket_review":
             title = f"Complete Review: {random.choice(self.rackets)['name']} Tennis Racket"
             content = self.generate_individual_racket_review()
+        elif theme == "equipment_comparison":
+            title = self.get_title_for_theme(theme)
+            content = self.generate_equipment_comparison_content()
         else:
             title = self.get_title_for_theme(theme)
             content = self.generate_generic_content(theme)
         
-        # Add conclusion
-        content += "\n\n## Conclusion\n\n"
-        content += "Whether you're looking to improve your UTR rating, find the perfect racket, or enhance your tennis game, the right approach and equipment make all the difference.\n\n"
-        content += "For more comprehensive tennis resources, equipment reviews, and training guides, visit [AcePlan](https://aceplan.me) and explore our extensive 100-racket database to find the perfect equipment for your game.\n\n"
-        content += "Our database includes detailed specifications, reviews, and affiliate links to help you make informed purchasing decisions while supporting our platform.\n"
+        content = POST_LAYOUT.render(content=content)
+        category = self.get_category_for_theme(theme)
+        tags = self.get_tags_for_theme(theme)
         
         return {
             'title': title,
             'content': content,
-            'category': self.get_category_for_theme(theme),
-            'tags': self.get_tags_for_theme(theme)
+            'category': category,
+            'tags': tags,
+            # HTML, excerpt, read time, ... rendered once so the site does not re-parse the content
+            'document': render_post(content, title=title, category=category, tags=tags).document
         }
 
     def get_title_for_theme(self, theme: str) -> str:
@@ -374,9 +428,8 @@ class WebsiteBlogGenerator:
     def generate_generic_content(self, theme: str) -> str:
         """Generate generic content for other themes."""
         prompt = f"""
-        Write an engaging, informative blog post about {theme.replace('_', ' ')} in tennis.
-        Make it beginner-friendly but informative, include practical tips and advice.
-        Keep it around 400-500 words and make it SEO-optimized.
+        Write a blog post about {theme.replace('_', ' ')} in tennis.
+        Keep it around 400-500 words.
         """
         
         content = self.generate_with_gpt4all(prompt, max_tokens=600)
@@ -386,8 +439,31 @@ class WebsiteBlogGenerator:
         
         return content
 
+    def generate_unique_post(self, theme: str = None) -> Dict[str, Any]:
+        """
+        Generate a blog post, regenerating (up to DEDUP_ATTEMPTS times) while its body duplicates an earlier post.
+        
+        Each retry uses a theme not tried yet: rankings and template fallbacks
+        give the same body again for the same theme.
+        """
+        theme = theme or random.choice(self.content_themes)
+        tried = []
+        for attempt in range(1, DEDUP_ATTEMPTS + 1):
+            blog_post = self.generate_blog_post(theme)
+            if not self.content_hashes.contains(blog_post['content']):
+                break
+            print(f"Generated post duplicates an earlier post (attempt {attempt}/{DEDUP_ATTEMPTS})")
+            tried.append(theme)
+            theme = random.choice([t for t in self.content_themes if t not in tried] or self.content_themes)
+        return blog_post
+
     def publish_to_website(self, blog_post: Dict[str, Any]) -> bool:
-        """Publish blog post to the website."""
+        """Publish blog post to the website (skipped if its body was already published)."""
+        # Claimed before the request so two publishers cannot post the same body
+        if not self.content_hashes.claim(blog_post['content'], self.website_api):
+            print(f"❌ Not publishing '{blog_post['title']}': its body duplicates an earlier post")
+            return False
+        published = False
         try:
             print(f"Publishing '{blog_post['title']}' to website...")
             
@@ -398,29 +474,35 @@ class WebsiteBlogGenerator:
                 'category': blog_post['category'],
                 'tags': blog_post['tags']
             }
+            document = blog_post.get('document')
+            if document:
+                for field in ('html', 'excerpt', 'readTime', 'seoTitle', 'seoDescription'):
+                    data[field] = document[field]
             
             # Make the API call
             response = requests.post(self.website_api, json=data, timeout=30)
             
             if response.status_code == 200:
+                published = True
                 result = response.json()
                 print(f"✅ Successfully published: {result['article']['title']}")
                 print(f"   Slug: {result['article']['slug']}")
                 print(f"   ID: {result['article']['id']}")
-                return True
             else:
                 print(f"❌ Failed to publish: {response.status_code} - {response.text}")
-                return False
                 
         except Exception as e:
             print(f"❌ Error publishing to website: {e}")
-            return False
+        
+        if not published:
+            self.content_hashes.release(blog_post['content'])
+        return published
 
     def generate_and_publish(self, theme: str = None) -> bool:
         """Generate a blog post and publish it to the website."""
         try:
             # Generate the blog post
-            blog_post = self.generate_blog_post(theme)
+            blog_post = self.generate_unique_post(theme)
             
             # Publish to website
             success = self.publish_to_website(blog_post)
@@ -444,8 +526,8 @@ def main():
     print("Database: https://docs.google.com/spreadsheets/d/1BDcm92RBg6Wnh63XlN5ktkOWz9tUQ1ZRAjJhouCaUos/edit?gid=0#gid=0")
     print()
     
-    # Initialize generator
-    generator = WebsiteBlogGenerator()
+    # Initialize generator (the model loads in the background while the menu is shown)
+    generator = WebsiteBlogGenerator(preload_model=True)
     
     # Menu for user interaction
     while True: